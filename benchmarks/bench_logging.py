@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Cost of console output for a batch of crew runs: verbose vs quiet mode.
+
+Two workloads, each measured for the time spent in the run's own thread and
+the bytes written:
+
+- ``status``: replays the status lines a run produces (kickoff, per-agent
+  completion with the full task output, result) through ``report``.
+- ``crew``: kicks off a real four-task crewAI crew whose agents use a stub LLM
+  that answers instantly, so the difference between ``verbose=True`` and
+  quiet mode is crewAI's own agent/task console output plus our status lines.
+
+With a free sink printing is cheap; once each write costs something (a
+terminal, a pipe to a log shipper) verbose output stalls the run, while quiet
+mode only pays the enqueue and the writer thread absorbs the latency.
+
+Usage: python benchmarks/bench_logging.py [runs] [output_kb] [sink_latency_ms]
+"""
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from crewai import Agent, Crew, Process, Task
+from crewai.llms.base_llm import BaseLLM
+
+from gangshit.logs import configure_logging, quiet_mode, report, shutdown_logging
+
+AGENTS = ("Researcher", "Data Analyst", "Lead Developer", "Project Overlord")
+
+
+class Sink(io.TextIOBase):
+    """Counts bytes; ``latency`` per write stands in for a slow terminal or log pipe."""
+
+    def __init__(self, latency: float = 0.0):
+        self.bytes = 0
+        self.latency = latency
+
+    def write(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        self.bytes += len(text.encode())
+        return len(text)
+
+
+class StubLLM(BaseLLM):
+    """Answers every call immediately with a fixed final answer."""
+
+    def __init__(self, answer: str):
+        super().__init__(model="stub")
+        self.answer = answer
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        return f"Thought: I have the answer\nFinal Answer: {self.answer}"
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+
+def status_batch(runs: int, output: str) -> None:
+    for run in range(runs):
+        report("crew", "🚀 Starting crew", run=run)
+        for role in AGENTS:
+            report("events", f"Agent '{role}' completed task", agent=role)
+            report("events", f"Output: {output}")
+        report("main", f"📊 Result: {output}")
+
+
+def crew_batch(runs: int, output: str) -> None:
+    verbose = not quiet_mode()  # as Gangshit sets it for its agents and crew
+    llm = StubLLM(output)
+    agents = [Agent(role=role, goal="Report on {topic}", backstory="Benchmark agent", llm=llm, verbose=verbose)
+              for role in AGENTS]
+    tasks = [Task(description=f"{role} step on {{topic}}", expected_output="Markdown report", agent=agent)
+             for role, agent in zip(AGENTS, agents)]
+    crew = Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=verbose)
+    for run in range(runs):
+        report("crew", "🚀 Starting crew", run=run)
+        result = crew.kickoff(inputs={"topic": "NV foreclosures"})
+        report("main", f"📊 Result: {result}")
+
+
+def measure(workload, mode: str, runs: int, output: str, latency: float) -> dict:
+    os.environ["GANGSHIT_LOG_MODE"] = mode
+    sink = Sink(latency)
+    configure_logging(stream=sink, force=True)
+    start = time.perf_counter()
+    with redirect_stdout(sink):
+        workload(runs, output)
+    in_run = time.perf_counter() - start
+    shutdown_logging()  # drain the queue
+    return {"in_run": in_run, "total": time.perf_counter() - start, "bytes": sink.bytes}
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    output_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.0
+    output = ("| EUR/USD | 1.0842 | +0.12% | LSTM backtest sharpe 1.31 |\n" * (output_kb * 1024 // 56 + 1))[:output_kb * 1024]
+
+    print(f"📏 {runs} runs, {output_kb} KB per task output, {latency * 1000:g} ms per write")
+    for name, workload in (("status", status_batch), ("crew", crew_batch)):
+        measure(workload, "quiet", 1, output, 0.0)  # warm-up: imports, prompt templates, first-call caches
+        results = {mode: measure(workload, mode, runs, output, latency) for mode in ("verbose", "quiet")}
+        os.environ.pop("GANGSHIT_LOG_MODE", None)
+        for mode, r in results.items():
+            print(f"  {name:6s} {mode:8s} in-run {r['in_run'] * 1000:9.1f} ms   total {r['total'] * 1000:9.1f} ms   "
+                  f"{r['bytes'] / 1024:10.1f} KB written")
+        verbose, quiet = results["verbose"], results["quiet"]
+        print(f"✅ {name}: verbose/quiet {verbose['in_run'] / max(quiet['in_run'], 1e-9):.1f}x the in-run time, "
+              f"{verbose['bytes'] / max(quiet['bytes'], 1):.1f}x the bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Materialized market-level aggregates (by ZIP, census tract and geohash cell).
+Computed once per ingest and kept current incrementally as records change.
+"""
+
+import csv
+import json
+import os
+import threading
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .geocoder import Geocoder, geocode_records
+from .history import DISTRESS_THRESHOLD, FCNTL_AVAILABLE, PropertyHistory, is_distressed
+from .parquet_store import PYARROW_AVAILABLE, sync_partitions
+
+if FCNTL_AVAILABLE:
+    import fcntl
+
+LEVELS = ("zip", "tract", "geohash")
+GEOHASH_PRECISION = int(os.getenv("GANGSHIT_GEOHASH_PRECISION", "6"))
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+NUMERIC_FIELDS = ("equity_pct", "distress_score", "lat", "lon")
+FLAG_FIELDS = ("delinquent", "distressed")
+
+_cache: Dict[Path, Tuple[Tuple[int, int], "MarketAggregates"]] = {}
+_cache_lock = threading.Lock()
+_ingest_lock = threading.Lock()
+
+
+def geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode a coordinate as a geohash cell of ``precision`` characters."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    cell, bits, bit_count, even = [], 0, 0, True
+    while len(cell) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            cell.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(cell)
+
+
+class _Group:
+    """Running reductions for one market cell."""
+
+    __slots__ = ("count", "distressed", "delinquent", "equity")
+
+    def __init__(self):
+        self.count = 0
+        self.distressed = 0
+        self.delinquent = 0
+        self.equity: List[float] = []  # kept sorted for O(1) medians
+
+    def add(self, state: Dict[str, Any], sign: int, threshold: float) -> None:
+        self.count += sign
+        self.distressed += sign * is_distressed(state, threshold)
+        self.delinquent += sign * bool(state.get("delinquent"))
+        equity = state.get("equity_pct")
+        if equity is None:
+            return
+        if sign > 0:
+            insort(self.equity, float(equity))
+        else:
+            index = bisect_left(self.equity, float(equity))
+            if index < len(self.equity) and self.equity[index] == float(equity):
+                self.equity.pop(index)
+
+    def row(self) -> Dict[str, Any]:
+        n = len(self.equity)
+        median = None
+        if n:
+            median = self.equity[n // 2] if n % 2 else (self.equity[n // 2 - 1] + self.equity[n // 2]) / 2
+        return {
+            "properties": self.count,
+            "distressed": self.distressed,
+            "median_equity_pct": median,
+            "delinquency_rate": self.delinquent / self.count if self.count else None,
+        }
+
+
+class MarketAggregates:
+    """
+    Group-by reductions over property states, keyed by market level.
+
+    Property states use the same fields as ``PropertyHistory`` records:
+    ``zip``, ``tract``, ``lat``/``lon``, ``equity_pct``, ``delinquent`` and
+    ``distress_score`` (or an explicit ``distressed`` flag).
+    """
+
+    def __init__(self, path: Optional[str] = None, threshold: float = DISTRESS_THRESHOLD):
+        """
+        Initialize an empty aggregate layer.
+
+        Args:
+            path: JSON file the aggregates are saved to and loaded from
+            threshold: Distress score threshold
+        """
+        self.path = Path(path or os.getenv("GANGSHIT_AGGREGATES_PATH", "data/aggregates.json"))
+        self.threshold = threshold
+        self._groups: Dict[str, Dict[str, _Group]] = {level: {} for level in LEVELS}
+
+    @staticmethod
+    def keys(state: Dict[str, Any]) -> Dict[str, str]:
+        """Return the market cell of a property state for each level it can be placed in."""
+        keys = {}
+        if state.get("zip"):
+            keys["zip"] = str(state["zip"])
+        if state.get("tract"):
+            keys["tract"] = str(state["tract"])
+        if state.get("lat") is not None and state.get("lon") is not None:
+            keys["geohash"] = geohash(float(state["lat"]), float(state["lon"]))
+        return keys
+
+    # =========================
+    # BUILD & INCREMENTAL UPDATE
+    # =========================
+    def build(self, states: Iterable[Dict[str, Any]]) -> "MarketAggregates":
+        """Recompute every group from scratch."""
+        self._groups = {level: {} for level in LEVELS}
+        for state in states:
+            self.update(None, state)
+        return self
+
+    def update(self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        """Move one property's contribution from its ``old`` state to its ``new`` state."""
+        for state, sign in ((old, -1), (new, 1)):
+            if not state:
+                continue
+            for level, key in self.keys(state).items():
+                group = self._groups[level].setdefault(key, _Group())
+                group.add(state, sign, self.threshold)
+                if group.count <= 0:
+                    del self._groups[level][key]
+
+    def apply_changes(self, before: Dict[str, Dict[str, Any]], after: Dict[str, Dict[str, Any]]) -> None:
+        """Update the groups for every property whose state differs between two ``history.current()`` maps."""
+        for pid in set(before) | set(after):
+            old, new = before.get(pid), after.get(pid)
+            if old != new:
+                self.update(old, new)
+
+    def ingest(self, history: PropertyHistory, records: List[Dict[str, Any]], **snapshot_kwargs) -> Dict[str, int]:
+        """
+        Record a snapshot in ``history`` and update only the groups it touched.
+
+        Returns:
+            The snapshot counts from ``PropertyHistory.record_snapshot``
+        """
+        before = history.current()
+        counts = history.record_snapshot(records, **snapshot_kwargs)
+        self.apply_changes(before, history.current())
+        return counts
+
+    # =========================
+    # QUERIES & PERSISTENCE
+    # =========================
+    def get(self, level: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stats row for one market cell."""
+        group = self._groups.get(level, {}).get(key)
+        return group.row() if group else None
+
+    def rows(self, level: str = "zip", sort_by: str = "distressed", top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return stats rows for a level, highest ``sort_by`` first."""
+        if level not in LEVELS:
+            raise ValueError(f"Unknown level '{level}', expected one of {LEVELS}")
+        rows = [{level: key, **group.row()} for key, group in self._groups[level].items()]
+        rows.sort(key=lambda r: (r.get(sort_by) is None, -(r.get(sort_by) or 0)))
+        return rows[:top] if top else rows
+
+    def to_markdown(self, level: str = "zip", top: int = 10) -> str:
+        """Render the top cells of a level as a compact Markdown table."""
+        rows = self.rows(level, top=top)
+        if not rows:
+            return f"No {level} aggregates available."
+        lines = [f"| {level} | properties | distressed | median equity % | delinquency rate |",
+                 "|---|---|---|---|---|"]
+        for r in rows:
+            equity = "n/a" if r["median_equity_pct"] is None else f"{r['median_equity_pct']:.1f}"
+            rate = "n/a" if r["delinquency_rate"] is None else f"{r['delinquency_rate']:.1%}"
+            lines.append(f"| {r[level]} | {r['properties']} | {r['distressed']} | {equity} | {rate} |")
+        return "\n".join(lines)
+
+    def save(self) -> Path:
+        """Write the aggregates to ``self.path``."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            level: {key: [g.count, g.distressed, g.delinquent, g.equity] for key, g in groups.items()}
+            for level, groups in self._groups.items()
+        }
+        partial = self.path.with_name(self.path.name + ".tmp")
+        with open(partial, "w") as f:
+            json.dump({"threshold": self.threshold, "groups": data}, f, separators=(",", ":"))
+        os.replace(partial, self.path)  # readers never see a half-written file
+        return self.path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "MarketAggregates":
+        """Load saved aggregates, returning an empty layer if none exist yet."""
+        aggregates = cls(path)
+        if not aggregates.path.exists():
+            return aggregates
+        with open(aggregates.path, "r") as f:
+            data = json.load(f)
+        aggregates.threshold = data.get("threshold", aggregates.threshold)
+        for level, groups in data.get("groups", {}).items():
+            for key, (count, distressed, delinquent, equity) in groups.items():
+                group = _Group()
+                group.count, group.distressed, group.delinquent, group.equity = count, distressed, delinquent, equity
+                aggregates._groups.setdefault(level, {})[key] = group
+        return aggregates
+
+    @classmethod
+    def cached(cls, path: Optional[str] = None) -> "MarketAggregates":
+        """Saved aggregates, re-read only when the file has changed since the last call."""
+        aggregates = cls(path)
+        stat = aggregates.path.stat() if aggregates.path.exists() else None
+        version = (stat.st_mtime_ns, stat.st_size) if stat else (0, 0)
+        with _cache_lock:
+            hit = _cache.get(aggregates.path)
+            if hit is None or hit[0] != version:
+                hit = _cache[aggregates.path] = (version, cls.load(path))
+        return hit[1]
+
+
+def market_stats_context(path: Optional[str] = None, level: str = "zip", top: int = 10) -> str:
+    """Compact market table injected into task descriptions as ``{market_stats}``."""
+    return MarketAggregates.cached(path).to_markdown(level=level, top=top)
+
+
+# =========================
+# INGEST
+# =========================
+@contextmanager
+def _exclusive(path: Path):
+    """Hold an exclusive lock on ``path`` across processes (in-process only without fcntl)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _ingest_lock, open(path, "a+b") as handle:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        yield
+
+
+def _coerce_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Type the numeric and flag fields of a CSV row; ids, ZIPs and tracts stay strings."""
+    record = {k: (None if v == "" else v) for k, v in record.items()}
+    for field in NUMERIC_FIELDS:
+        if isinstance(record.get(field), str):
+            record[field] = float(record[field])
+    for field in FLAG_FIELDS:
+        if isinstance(record.get(field), str):
+            record[field] = record[field].strip().lower() in ("1", "true", "yes", "y")
+    return record
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Read property records from a ``.csv``, ``.jsonl`` or ``.json`` (list) file."""
+    path = Path(path)
+    with open(path, "r", newline="") as f:
+        if path.suffix == ".csv":
+            return [_coerce_record(row) for row in csv.DictReader(f)]
+        if path.suffix == ".jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data if isinstance(data, list) else data.get("records", [])
+
+
+def ingest_file(path: str,
+                history: Optional[PropertyHistory] = None,
+                aggregates_path: Optional[str] = None,
+                complete: bool = False,
+                run_id: Optional[str] = None,
+                geocoder: Optional[Geocoder] = None,
+                parquet_root: Optional[str] = None) -> Dict[str, int]:
+    """
+    Record a listings file in the property history and bring the saved aggregates
+    and (with pyarrow) the state/county Parquet partitions up to date.
+
+    Args:
+        path: Records file (see ``load_records``)
+        history: History store (defaults to ``GANGSHIT_HISTORY_DIR``)
+        aggregates_path: Aggregates file (defaults to ``GANGSHIT_AGGREGATES_PATH``)
+        complete: The file lists every property; absent ones are marked removed
+        run_id: Run recorded with the snapshot
+        geocoder: Fills ``lat``/``lon`` from ``address`` on records without coordinates,
+            so they are placed in geohash cells
+        parquet_root: Parquet dataset for ``PropertyQueryTool`` (defaults to ``GANGSHIT_PARQUET_ROOT``)
+
+    Returns:
+        The snapshot counts plus the number of records read
+    """
+    history = history or PropertyHistory()
+    records = load_records(path)
+    if geocoder is not None:
+        records = geocode_records(records, geocoder)
+    target = MarketAggregates(aggregates_path).path
+    # Load, update and save under one lock so concurrent ingests cannot lose each other's updates
+    with _exclusive(target.with_name(target.name + ".lock")):
+        aggregates = MarketAggregates.load(aggregates_path)
+        before = history.current()
+        if not aggregates.path.exists():
+            aggregates.build(before.values())  # first ingest after existing history
+        counts = history.record_snapshot(records, complete=complete, run_id=run_id)
+        after = history.current()
+        aggregates.apply_changes(before, after)
+        aggregates.save()
+        if PYARROW_AVAILABLE:
+            sync_partitions(before, after, root=parquet_root, key=history.key)
+    return {"records": len(records), **counts}
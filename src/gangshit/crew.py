@@ -1,11 +1,21 @@
 from pathlib import Path
+import logging
 import os
 import yaml
 from dotenv import load_dotenv
 
 from crewai import Agent, Crew, Task, Process, LLM
 from crewai.project import CrewBase, agent, task, crew, before_kickoff, after_kickoff
-from crewai_tools import SerperDevTool
+
+from .aggregates import market_stats_context
+from .extraction import structure_report
+from .fanout import REPORT_SECTIONS, run_fanout, split_topic
+from .handoff import HandoffTask, dumps, handoff_model, load_specs, parse_handoff, section_prompt
+from .history import new_run_id, publish_run_reports
+from .logs import quiet_mode, report
+from .manager_policy import ManagementLedger, process_kwargs
+from .profiling import bind_run, start_profiler
+from .tools import FilteredSerperTool, MarketStatsTool, PropertyHistoryTool, PropertyQueryTool
 
 @CrewBase
 class Gangshit:
@@ -18,51 +28,202 @@ class Gangshit:
     def __init__(self):
         """Initialize with environment and configuration loading."""
         load_dotenv(override=True)
+        self.run_id = None
+        self.structured_handoff = os.getenv("GANGSHIT_STRUCTURED_HANDOFF", "1") != "0"
+        # Typed handoffs: downstream tasks get only the upstream fields listed under `needs` in tasks.yaml
+        self.typed_handoff = os.getenv("GANGSHIT_TYPED_HANDOFF", "1") != "0"
+        self.handoff_specs = load_specs(self.tasks_config) if self.typed_handoff else {}
+        # Research fan-out: split research_task into N concurrent sub-queries before kickoff
+        self.research_fanout = int(os.getenv("GANGSHIT_RESEARCH_FANOUT", "0"))
+        self.research_max_iter = int(os.getenv("GANGSHIT_RESEARCH_MAX_ITER", "8"))
+        self.research_brief = None
+        # Tasks that need research_task while it is dropped -> input key carrying their prefetched brief
+        self._brief_keys = {}
+        # Persistent crew memory through the local Ollama embedder (opt-in: GANGSHIT_MEMORY=1)
+        self.memory_enabled = os.getenv("GANGSHIT_MEMORY", "0") == "1"
+        self._memory_kwargs = None
+        self._profiler = None
+        self._ledger = None
+        # GANGSHIT_LOG_MODE=quiet: no crewAI console output, JSON status records instead
+        self.verbose = not quiet_mode()
         
         # Load YAML configurations with error handling
         try:
             with open(self.agents_config, 'r') as f:
                 self._agents_config = yaml.safe_load(f)
         except FileNotFoundError:
-            print(f"⚠️ Warning: {self.agents_config} not found")
+            report("crew", f"⚠️ Warning: {self.agents_config} not found", logging.WARNING)
             self._agents_config = {}
             
         try:
             with open(self.tasks_config, 'r') as f:
                 self._tasks_config = yaml.safe_load(f)
         except FileNotFoundError:
-            print(f"⚠️ Warning: {self.tasks_config} not found")
+            report("crew", f"⚠️ Warning: {self.tasks_config} not found", logging.WARNING)
             self._tasks_config = {}
         
-        # Initialize LLMs with fallback models
+        # Initialize LLMs with fallback models; GANGSHIT_LLM_SEED makes evaluation runs reproducible
+        seed = os.getenv("GANGSHIT_LLM_SEED")
+        seed = int(seed) if seed else None
         self.llama3 = LLM(
             model=os.getenv("OLLAMA_LLAMA3", "llama3.2"),
             base_url="http://localhost:11434", 
-            stream=True
+            stream=True,
+            seed=seed,
         )
         self.gemma3 = LLM(
             model=os.getenv("OLLAMA_GEMMA3", "gemma2:2b"),
             base_url="http://localhost:11434", 
-            stream=True
+            stream=True,
+            seed=seed,
         )
         self.deepseek = LLM(
             model=os.getenv("OLLAMA_DEEPSEEK", "deepseek-coder:1.3b"),
             base_url="http://localhost:11434", 
-            stream=True
+            stream=True,
+            seed=seed,
         )
 
     @before_kickoff
     def before_kickoff_handler(self, inputs):
         """Pre-execution setup and validation."""
-        print("🚀 Starting CrewAI execution with inputs:", inputs.get('topic', 'Unknown'))
+        # Work on a copy: train/test reuse one inputs dict across iterations, and a run_id,
+        # market table or brief written into it would leak into every later run
+        inputs = dict(inputs or {})
+        # Each run writes its reports under results/runs/<run_id>/ instead of overwriting
+        inputs.setdefault("run_id", new_run_id())
+        self.run_id = inputs["run_id"]
+        report("crew", f"🚀 Starting CrewAI execution with inputs: {inputs.get('topic', 'Unknown')}",
+               run_id=self.run_id, topic=inputs.get("topic"))
+        # Bus events emitted by this kickoff (and its fan-out threads) belong to this run
+        bind_run(self.run_id)
+        # GANGSHIT_PROFILE (or --profile) records a Chrome/Perfetto trace of this run
+        self._profiler = start_profiler(str(Path("results") / "runs" / self.run_id / "trace.json"),
+                                        run_id=self.run_id)
+        self._ledger = ManagementLedger(run_id=self.run_id).start()
+        # Precomputed market table for the analyst and overlord task descriptions
+        inputs.setdefault("market_stats", market_stats_context())
+        research = self._fanout_research(inputs) if self.research_fanout > 1 else self.research_brief
+        inputs.setdefault("research_brief", self._research_brief(research) or "")
+        for name, key in self._brief_keys.items():
+            inputs.setdefault(key, self._research_brief(research, name) or "")
         return inputs
 
     @after_kickoff
     def after_kickoff_handler(self, output):
         """Post-execution cleanup and reporting."""
-        print("✅ CrewAI execution completed; output length:", len(str(output)))
+        report("crew", f"✅ CrewAI execution completed; output length: {len(str(output))}", run_id=self.run_id)
+        if self.run_id:
+            published = publish_run_reports(self.run_id)
+            report("crew", f"🗂️ Archived {len(published)} reports for run {self.run_id}", run_id=self.run_id)
+        if self._profiler is not None:
+            report("crew", f"⏱️ Trace written to {self._profiler.stop()}", run_id=self.run_id)
+            self._profiler = None
+        if self._ledger is not None:
+            summary = self._ledger.stop(str(Path("results") / "runs" / (self.run_id or "latest") / "management.json"))
+            totals = summary["totals"]
+            report("crew", f"🧭 Management vs work: {totals.get('management_calls', 0)} vs {totals.get('work_calls', 0)} LLM calls, "
+                           f"{summary['management_share_seconds']:.0%} of LLM time on management",
+                   run_id=self.run_id, **totals)
+            self._ledger = None
+        bind_run(None)
         return output
 
+    def _structure_research_output(self, output):
+        """Hand downstream tasks the typed research handoff (or extracted tables and facts) instead of the prose."""
+        if "research_task" in self.handoff_specs:
+            output.raw = dumps(self._research_handoff(output.raw))
+            return
+        if not self.structured_handoff:
+            return
+        out_dir = Path("results") / "runs" / (self.run_id or "latest") / "data"
+        output.raw = structure_report(output.raw, out_dir)
+
+    def _research_handoff(self, text):
+        """Typed research handoff; with structured handoff on, ``tables`` carries the extracted data digest."""
+        fields = self.handoff_specs["research_task"]["fields"]
+        handoff = parse_handoff(handoff_model("research_task", fields), text)
+        if self.structured_handoff and "tables" in fields and not text.lstrip().startswith("{"):
+            out_dir = Path("results") / "runs" / (self.run_id or "latest") / "data"
+            structured = structure_report(text, out_dir)
+            if structured != text:
+                handoff.tables = structured
+        return handoff
+
+    def _handoff_task(self, name, config, **kwargs):
+        """Build a task whose context is the typed handoff of the upstream fields it needs."""
+        spec = self.handoff_specs.get(name)
+        if not spec:
+            return Task(config=config, **kwargs)
+        config = dict(config)
+        if spec["fields"]:
+            config["expected_output"] = f"{config.get('expected_output', '')}\n{section_prompt(spec['fields'])}".strip()
+        prefetched = self.research_prefetched and "research_task" in spec["needs"]
+        if prefetched:
+            # research_task is not in the crew: the brief arrives through the description instead
+            key = "research_brief" if "{research_brief}" in config.get("description", "") else f"{name}_research_brief"
+            if key != "research_brief":
+                config["description"] = f"{config.get('description', '')}\nResearch brief:\n{{{key}}}"
+            self._brief_keys[name] = key
+        context = [getattr(self, upstream)() for upstream in spec["needs"]
+                   if hasattr(self, upstream) and not (prefetched and upstream == "research_task")]
+        return HandoffTask(
+            config=config,
+            handoff_fields=spec["fields"],
+            handoff_needs=spec["needs"],
+            context=context,
+            **kwargs,
+        )
+
+    @property
+    def research_prefetched(self) -> bool:
+        """True when research runs outside the crew and research_task is dropped."""
+        return self.research_fanout > 1 or self.research_brief is not None
+
+    def _run_research_subquery(self, query, inputs):
+        """Research one fan-out sub-query with a single-task crew and a bounded iteration budget."""
+        researcher = self.researcher().copy()
+        researcher.max_iter = self.research_max_iter
+        researcher.verbose = False
+        subtask = Task(
+            description=(
+                "Research this slice of the topic using trusted, authoritative sources: {subquery}. "
+                "Cite all data as [source](url)."
+            ),
+            expected_output="Markdown with sections: " + ", ".join(REPORT_SECTIONS),
+            agent=researcher,
+        )
+        crew = Crew(agents=[researcher], tasks=[subtask], process=Process.sequential, verbose=False)
+        return crew.kickoff(inputs={**inputs, "subquery": query}).raw
+
+    def _fanout_research(self, inputs):
+        """Run the research fan-out, save the merged report and return the research downstream tasks see."""
+        count = len(split_topic(inputs.get("topic", ""), self.research_fanout, inputs))
+        if count < self.research_fanout:
+            report("crew", f"⚠️ GANGSHIT_RESEARCH_FANOUT={self.research_fanout} but only {count} sub-queries are "
+                           "available; pass more counties or research_subtopics to split further",
+                   logging.WARNING, run_id=self.run_id, requested=self.research_fanout, produced=count)
+        report("crew", f"🔀 Fanning research out into {count} sub-queries", run_id=self.run_id)
+        merged = run_fanout(
+            inputs.get("topic", ""),
+            lambda query: self._run_research_subquery(query, inputs),
+            parts=self.research_fanout,
+            inputs=inputs,
+        )
+        run_dir = Path("results") / "runs" / self.run_id
+        run_dir.mkdir(parents=True, exist_ok=True)
+        (run_dir / "research_report.md").write_text(merged)
+        if self.structured_handoff and "research_task" not in self.handoff_specs:
+            return structure_report(merged, run_dir / "data")
+        return merged
+
+    def _research_brief(self, research, task_name="analyst_task"):
+        """Narrow prefetched research to the handoff fields ``task_name`` needs (typed handoff mode only)."""
+        if research is None or "research_task" not in self.handoff_specs:
+            return research
+        needed = self.handoff_specs.get(task_name, {}).get("needs", {}).get("research_task")
+        return dumps(self._research_handoff(research), needed)
+
     @agent
     def researcher(self) -> Agent:
         """Research agent with web search capabilities."""
@@ -73,8 +234,8 @@ class Gangshit:
                 "backstory": "Expert researcher with web search capabilities"
             }),
             llm=self.gemma3,
-            verbose=True,
-            tools=[SerperDevTool()],
+            verbose=self.verbose,
+            tools=[FilteredSerperTool(), PropertyQueryTool()],
         )
 
     @agent
@@ -87,7 +248,8 @@ class Gangshit:
                 "backstory": "Detail-oriented analyst"
             }),
             llm=self.gemma3,
-            verbose=True,
+            verbose=self.verbose,
+            tools=[MarketStatsTool(), PropertyQueryTool(), PropertyHistoryTool()],
         )
 
     @agent
@@ -100,7 +262,7 @@ class Gangshit:
                 "backstory": "Full-stack developer"
             }),
             llm=self.deepseek,
-            verbose=True,
+            verbose=self.verbose,
         )
 
     @agent
@@ -113,73 +275,94 @@ class Gangshit:
                 "backstory": "Experienced project coordinator"
             }),
             llm=self.llama3,
-            verbose=True,
+            verbose=self.verbose,
+            tools=[MarketStatsTool()],
         )
 
     @task
     def research_task(self) -> Task:
         """Research task configuration."""
-        return Task(
-            config=self._tasks_config.get("research_task", {
+        return self._handoff_task(
+            "research_task",
+            self._tasks_config.get("research_task", {
                 "description": "Research the given topic thoroughly",
                 "expected_output": "Comprehensive research report",
                 "agent": "researcher"
             }),
             agent=self.researcher(),
-            output_file="results/research_report.md",
+            output_file="results/runs/{run_id}/research_report.md",
+            callback=self._structure_research_output,
         )
 
     @task
     def analyst_task(self) -> Task:
         """Analysis task configuration."""
-        return Task(
-            config=self._tasks_config.get("analyst_task", {
-                "description": "Analyze research findings",
+        return self._handoff_task(
+            "analyst_task",
+            self._tasks_config.get("analyst_task", {
+                "description": "Analyze research findings.\n{research_brief}\nMarket stats:\n{market_stats}",
                 "expected_output": "Analysis report with insights",
                 "agent": "analyst"
             }),
             agent=self.analyst(),
-            output_file="results/analyst_report.md",
+            output_file="results/runs/{run_id}/analyst_report.md",
         )
 
     @task
     def coding_task(self) -> Task:
         """Development task configuration."""
-        return Task(
-            config=self._tasks_config.get("coding_task", {
+        return self._handoff_task(
+            "coding_task",
+            self._tasks_config.get("coding_task", {
                 "description": "Implement the solution",
                 "expected_output": "Working codebase",
                 "agent": "coding_agent"
             }),
             agent=self.coding_agent(),
-            output_file="results/coding_report.md",
+            output_file="results/runs/{run_id}/coding_report.md",
         )
 
     @task
     def overlord_task(self) -> Task:
         """Management and coordination task."""
-        return Task(
-            config=self._tasks_config.get("overlord_task", {
-                "description": "Coordinate and validate all outputs",
+        return self._handoff_task(
+            "overlord_task",
+            self._tasks_config.get("overlord_task", {
+                "description": "Coordinate and validate all outputs. Market stats:\n{market_stats}",
                 "expected_output": "Final project report",
                 "agent": "overlord"
             }),
             agent=self.overlord(),
-            output_file="results/overlord_report.md",
+            output_file="results/runs/{run_id}/overlord_report.md",
         )
 
+    def crew_memory(self) -> dict:
+        """Bounded memory kwargs for ``Crew``, built once so warm crews share one store."""
+        if self._memory_kwargs is None:
+            self._memory_kwargs = {}
+            if self.memory_enabled:
+                from .embedder_config import LocalEmbedderConfig
+                self._memory_kwargs = LocalEmbedderConfig(
+                    model_name=os.getenv("OLLAMA_EMBEDDER", "nomic-embed-text:latest")).crew_memory()
+        return self._memory_kwargs
+
     @crew
     def gangshit_crew(self) -> Crew:
-        """Assemble the complete crew with hierarchical process."""
+        """Assemble the complete crew; the manager policy picks the process."""
         # Ensure results directory exists
         Path("results").mkdir(exist_ok=True)
         
+        tasks = self.tasks
+        if self.research_prefetched:
+            tasks = [t for t in tasks if t.name != "research_task"]
+
         return Crew(
             agents=self.agents,
-            tasks=self.tasks,
-            process=Process.hierarchical,
-            verbose=True,
+            tasks=tasks,
+            verbose=self.verbose,
             output_file="results/gangshit_report.md",
-            manager_llm=self.llama3,
             stream=True,
+            # Tasks with fixed agents skip the manager; otherwise it is capped (GANGSHIT_MANAGER_MODE)
+            **process_kwargs(tasks, self.llama3),
+            **self.crew_memory(),
         )
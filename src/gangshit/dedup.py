@@ -0,0 +1,171 @@
+"""
+Near-duplicate filtering for search results and tool outputs.
+MinHash signatures are computed for a batch of snippets at once; items are
+ranked by source tier (the tiers in knowledge/research_instructions.txt), near
+duplicates of a better-ranked item are dropped, and the survivors are
+capped to a token budget before they reach the agent's prompt.
+"""
+
+import os
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+# numpy ships with crewai's dependencies; fall back to pure Python if it is missing
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+NUM_PERM = 64
+SHINGLE_SIZE = 5
+SIMILARITY_THRESHOLD = float(os.getenv("GANGSHIT_DEDUP_THRESHOLD", "0.6"))
+TOKEN_BUDGET = int(os.getenv("GANGSHIT_SEARCH_TOKEN_BUDGET", "1500"))
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Tier 1: official datasets, regulatory filings, academic papers, primary APIs
+TIER1_SUFFIXES = (".gov", ".mil", ".edu", ".us")
+TIER1_DOMAINS = {
+    "census.gov", "hud.gov", "fhfa.gov", "consumerfinance.gov", "federalreserve.gov", "sec.gov",
+    "fred.stlouisfed.org", "courtlistener.com", "pacer.uscourts.gov", "data.gov",
+}
+# Tier 2: reputable news, leading industry sources, secondary APIs
+TIER2_DOMAINS = {
+    "reuters.com", "apnews.com", "bloomberg.com", "wsj.com", "nytimes.com", "cnbc.com", "npr.org",
+    "attomdata.com", "realtytrac.com", "corelogic.com", "blackknightinc.com", "ice.com",
+    "zillow.com", "redfin.com", "realtor.com", "nar.realtor", "housingwire.com", "inman.com",
+}
+
+_rng_a = [(i * 0x9E3779B97F4A7C15 + 1) % _PRIME or 1 for i in range(1, NUM_PERM + 1)]
+_rng_b = [(i * 0xC2B2AE3D27D4EB4F + 7) % _PRIME for i in range(1, NUM_PERM + 1)]
+
+
+def source_tier(url: str) -> int:
+    """Classify a URL as tier 1, 2 or 3."""
+    host = (urlparse(url).hostname or "").lower()
+    host = host[4:] if host.startswith("www.") else host
+    if host.endswith(TIER1_SUFFIXES) or any(host == d or host.endswith("." + d) for d in TIER1_DOMAINS):
+        return 1
+    if any(host == d or host.endswith("." + d) for d in TIER2_DOMAINS):
+        return 2
+    return 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def _shingles(text: str) -> List[int]:
+    text = re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", text.lower())).strip()
+    if len(text) <= SHINGLE_SIZE:
+        return [zlib.crc32(text.encode())]
+    return sorted({zlib.crc32(text[i:i + SHINGLE_SIZE].encode()) for i in range(len(text) - SHINGLE_SIZE + 1)})
+
+
+def _mod_prime(x):
+    """Reduce uint64 values modulo the Mersenne prime 2**61 - 1 (exact, no overflow)."""
+    p = np.uint64(_PRIME)
+    x = (x & p) + (x >> np.uint64(61))
+    return np.where(x >= p, x - p, x)
+
+
+def _universal_hash(a, b, shingles):
+    """
+    ``(a * shingles + b) mod p`` in uint64 for 61-bit ``a``/``b`` and 32-bit shingles.
+
+    ``a`` is split into 29- and 32-bit halves so every partial product fits in
+    64 bits; ``2**61 = 1 (mod p)`` turns the high half's shift into a fold.
+    """
+    low = _mod_prime((a & np.uint64(_MAX_HASH)) * shingles)
+    high = _mod_prime((a >> np.uint64(32)) * shingles)  # < 2**61, times 2**32 below
+    high = _mod_prime((high >> np.uint64(29)) + ((high & np.uint64((1 << 29) - 1)) << np.uint64(32)))
+    return _mod_prime(_mod_prime(low + high) + b)
+
+
+def minhash_signatures(texts: Sequence[str]):
+    """
+    MinHash signatures for a batch of texts, shape ``(len(texts), NUM_PERM)``.
+
+    Each permutation is the universal hash ``(a * x + b) mod (2**61 - 1)``. With
+    numpy, each text's shingles are hashed through all permutations in one
+    vectorized ``(NUM_PERM, shingles)`` operation; the pure-Python fallback
+    computes the same values.
+    """
+    if NUMPY_AVAILABLE:
+        a = np.array(_rng_a, dtype=np.uint64)[:, None]
+        b = np.array(_rng_b, dtype=np.uint64)[:, None]
+        signatures = np.empty((len(texts), NUM_PERM), dtype=np.uint64)
+        for row, text in enumerate(texts):
+            shingles = np.array(_shingles(text), dtype=np.uint64)[None, :]
+            signatures[row] = _universal_hash(a, b, shingles).min(axis=1)
+        return signatures
+    return [
+        [min((ai * s + bi) % _PRIME for s in _shingles(text)) for ai, bi in zip(_rng_a, _rng_b)]
+        for text in texts
+    ]
+
+
+def similarity_matrix(signatures):
+    """Estimated Jaccard similarity between every pair of signatures."""
+    if NUMPY_AVAILABLE:
+        return (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+    return [[sum(x == y for x, y in zip(s, t)) / NUM_PERM for t in signatures] for s in signatures]
+
+
+def filter_items(items: List[Dict[str, Any]],
+                 text_key: str = "snippet",
+                 threshold: float = SIMILARITY_THRESHOLD,
+                 token_budget: Optional[int] = TOKEN_BUDGET) -> List[Dict[str, Any]]:
+    """
+    Drop near-duplicates, rank by source tier and cap the total size.
+
+    Items are ordered by (tier, original position); an item is kept only if it
+    is not similar to an item already kept, so each duplicate cluster is
+    represented by its most authoritative source. Kept items get a ``tier`` key.
+    """
+    if not items:
+        return []
+    texts = [f"{item.get('title', '')} {item.get(text_key, '')}" for item in items]
+    similarity = similarity_matrix(minhash_signatures(texts))
+    tiers = [source_tier(item.get("link", "")) for item in items]
+    order = sorted(range(len(items)), key=lambda i: (tiers[i], i))
+
+    kept: List[int] = []
+    used = 0
+    for i in order:
+        if any(similarity[i][j] >= threshold for j in kept):
+            continue
+        cost = estimate_tokens(texts[i])
+        if token_budget is not None and kept and used + cost > token_budget:
+            break
+        kept.append(i)
+        used += cost
+    return [{**items[i], "tier": tiers[i]} for i in kept]
+
+
+def compact_search_results(results: Dict[str, Any],
+                           threshold: float = SIMILARITY_THRESHOLD,
+                           token_budget: int = TOKEN_BUDGET) -> str:
+    """
+    Turn a Serper result dict into a short, de-duplicated listing for the agent.
+    """
+    lines = []
+    query = results.get("searchParameters", {}).get("q")
+    if query:
+        lines.append(f"Results for: {query}")
+    graph = results.get("knowledgeGraph")
+    if graph:
+        lines.append(f"Knowledge graph: {graph.get('title', '')} - {graph.get('description', '')}".strip(" -"))
+    raw = list(results.get("organic", [])) + list(results.get("news", []))
+    kept = filter_items(raw, threshold=threshold, token_budget=token_budget)
+    for item in kept:
+        date = f" ({item['date']})" if item.get("date") else ""
+        lines.append(f"- [T{item['tier']}] {item.get('title', '')}{date}\n  {item.get('link', '')}\n  {item.get('snippet', '')}")
+    dropped = len(raw) - len(kept)
+    if dropped:
+        lines.append(f"({dropped} near-duplicate or over-budget results omitted)")
+    return "\n".join(lines)
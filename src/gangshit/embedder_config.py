@@ -0,0 +1,164 @@
+"""
+Custom embedder configuration for CrewAI with local models.
+Provides fallback strategies for knowledge management.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .logs import report
+
+# Robust import strategy with fallbacks
+try:
+    from langchain_ollama import OllamaEmbeddings
+    OLLAMA_AVAILABLE = True
+except ImportError:
+    report("memory", "⚠️  langchain-ollama not found. Install with: pip install langchain-ollama", logging.WARNING)
+    try:
+        # Fallback to older langchain-community implementation
+        from langchain_community.embeddings import OllamaEmbeddings
+        OLLAMA_AVAILABLE = True
+        report("memory", "✅ Using langchain-community.embeddings.OllamaEmbeddings as fallback")
+    except ImportError:
+        report("memory", "❌ No Ollama embeddings available. Install langchain-ollama or langchain-community",
+               logging.WARNING)
+        OLLAMA_AVAILABLE = False
+        # Create a mock class for graceful degradation
+        class OllamaEmbeddings:
+            def __init__(self, *args, **kwargs):
+                raise ImportError("Ollama embeddings not available - install langchain-ollama")
+
+from crewai.knowledge.storage.knowledge_storage import KnowledgeStorage
+
+# Probe results per (model, base_url): the live check runs once per process
+_probed: Dict[Tuple[str, str], bool] = {}
+_probe_lock = threading.Lock()
+
+class LocalEmbedderConfig:
+    """
+    Configures local embedding functions for CrewAI knowledge storage.
+    Eliminates dependency on OpenAI embedding services.
+    
+    Installation Requirements:
+    - pip install langchain-ollama
+    - Ollama service running on localhost:11434
+    - Embedding model pulled: ollama pull nomic-embed-text
+    """
+    
+    def __init__(self, 
+                 model_name: str = "nomic-embed-text:latest",
+                 base_url: str = "http://localhost:11434"):
+        """
+        Initialize local embedder configuration.
+        
+        Args:
+            model_name: Ollama embedding model name
+            base_url: Ollama service URL
+        """
+        self.model_name = model_name
+        self.base_url = base_url
+        self._embedder = None
+        
+        if not OLLAMA_AVAILABLE:
+            report("memory", f"🔧 Setup Instructions:\n"
+                             f"   1. pip install langchain-ollama\n"
+                             f"   2. ollama pull {model_name}\n"
+                             f"   3. Ensure Ollama is running on {base_url}", logging.WARNING)
+    
+    def get_embedder(self) -> Optional[OllamaEmbeddings]:
+        """
+        Get or create Ollama embeddings instance.
+        
+        Returns:
+            Configured OllamaEmbeddings instance or None if unavailable
+        """
+        if not OLLAMA_AVAILABLE:
+            return None
+            
+        if self._embedder is None:
+            try:
+                self._embedder = OllamaEmbeddings(
+                    model=self.model_name,
+                    base_url=self.base_url
+                )
+            except Exception as e:
+                report("memory", f"❌ Failed to initialize Ollama embedder: {e}", logging.WARNING)
+                return None
+        return self._embedder
+    
+    def configure_crew_embedder(self) -> Optional[OllamaEmbeddings]:
+        """
+        Configure embedder for CrewAI crew initialization.
+        The live test embedding runs once per process for each model and URL.
+        
+        Returns:
+            Embedder instance or None if local model unavailable
+        """
+        key = (self.model_name, self.base_url)
+        with _probe_lock:
+            if key not in _probed:
+                _probed[key] = self._probe()
+            available = _probed[key]
+        return self.get_embedder() if available else None
+
+    def _probe(self) -> bool:
+        try:
+            # Verify Ollama service availability
+            embedder = self.get_embedder()
+            # Test embedding functionality
+            if embedder is not None and embedder.embed_query("test"):
+                return True
+        except Exception as e:
+            report("memory", f"⚠️  Local embedder unavailable: {e}", logging.WARNING)
+            report("memory", "💡 Falling back to placeholder configuration", logging.WARNING)
+        return False
+
+    def crew_memory(self,
+                    path: Optional[str] = None,
+                    max_items: Optional[int] = None,
+                    ttl_seconds: Optional[float] = None,
+                    short_term_ttl: float = 86400.0) -> Dict[str, Any]:
+        """
+        Build bounded short-term, long-term and entity memory backed by the local embedder.
+
+        Args:
+            path: Memory directory (defaults to ``GANGSHIT_MEMORY_DIR``)
+            max_items: Entries kept per memory before LRU eviction
+            ttl_seconds: Lifetime of entity and long-term entries
+            short_term_ttl: Lifetime of short-term entries
+
+        Returns:
+            Keyword arguments for ``Crew(...)``, or an empty dict (memory off)
+            when the local embedder is unavailable
+        """
+        from crewai.memory import EntityMemory, LongTermMemory, ShortTermMemory
+        from .memory_store import MAX_ITEMS, MEMORY_DIR, TTL_SECONDS, BoundedLTMStorage, BoundedMemoryStorage
+
+        embedder = self.configure_crew_embedder()
+        if embedder is None:
+            return {}
+        root = Path(path or MEMORY_DIR)
+        max_items = max_items or MAX_ITEMS
+        ttl_seconds = ttl_seconds or TTL_SECONDS
+        short_term = BoundedMemoryStorage(str(root / "short_term"), embedder.embed_documents,
+                                          max_items=max_items, ttl_seconds=short_term_ttl)
+        entities = BoundedMemoryStorage(str(root / "entities"), embedder.embed_documents,
+                                        max_items=max_items, ttl_seconds=ttl_seconds)
+        for storage in (short_term, entities):
+            storage.start_compactor()
+        return {
+            "memory": True,
+            "short_term_memory": ShortTermMemory(storage=short_term),
+            "entity_memory": EntityMemory(storage=entities),
+            "long_term_memory": LongTermMemory(storage=BoundedLTMStorage(
+                str(root / "long_term.sqlite"), max_rows=max_items, ttl_seconds=ttl_seconds)),
+        }
+
+# Usage in your crew configuration
+def get_configured_embedder():
+    """Factory function for embedder configuration."""
+    local_config = LocalEmbedderConfig()
+    return local_config.configure_crew_embedder()
\ No newline at end of file
@@ -0,0 +1,230 @@
+"""
+Parallel crew evaluation.
+Runs ``Crew.test``-style iterations concurrently in worker processes with
+per-iteration seeds, reuses cached upstream research when the inputs are
+identical, and aggregates scores and timings into one report.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .logs import report
+
+BASE_SEED = int(os.getenv("GANGSHIT_EVAL_SEED", "42"))
+CACHE_DIR = Path(os.getenv("GANGSHIT_EVAL_CACHE", "data/eval_cache"))
+
+# Two-sided 95% Student t critical values by degrees of freedom
+_T95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+        10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131, 16: 2.120, 17: 2.110,
+        18: 2.101, 19: 2.093, 20: 2.086, 21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060,
+        26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980}
+
+
+def iteration_seed(iteration: int, base_seed: int = BASE_SEED) -> int:
+    """Seed for one iteration; stable across runs so results are reproducible."""
+    return base_seed + iteration
+
+
+def mean_ci(values: List[float]) -> Dict[str, Optional[float]]:
+    """Mean with a two-sided 95% t confidence interval."""
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"n": 0, "mean": None, "ci_low": None, "ci_high": None}
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return {"n": 1, "mean": mean, "ci_low": None, "ci_high": None}
+    df = len(values) - 1
+    # between tabulated df, the nearest lower df gives the (conservative) wider interval
+    t = _T95[max(k for k in _T95 if k <= df)]
+    half = t * statistics.stdev(values) / math.sqrt(len(values))
+    return {"n": len(values), "mean": mean, "ci_low": mean - half, "ci_high": mean + half}
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregate per-iteration results.
+
+    Each result carries ``iteration``, ``seed``, ``scores`` (one per task, in order),
+    ``task_seconds`` and ``wall_seconds``; failed iterations carry ``error``.
+    """
+    ok = sorted((r for r in results if not r.get("error")), key=lambda r: r["iteration"])
+    tasks = max((len(r["scores"]) for r in ok), default=0)
+    return {
+        "iterations": len(results),
+        "failed": [{"iteration": r["iteration"], "error": r["error"]} for r in results if r.get("error")],
+        "overall_score": mean_ci([statistics.fmean(r["scores"]) for r in ok if r["scores"]]),
+        "task_scores": [mean_ci([r["scores"][i] for r in ok if len(r["scores"]) > i]) for i in range(tasks)],
+        "wall_seconds": mean_ci([r["wall_seconds"] for r in ok]),
+        "runs": ok,
+    }
+
+
+def render_report(summary: Dict[str, Any], task_names: Optional[List[str]] = None) -> str:
+    """Markdown report of an evaluation summary."""
+    def fmt(stat):
+        if stat["mean"] is None:
+            return "n/a"
+        if stat["ci_low"] is None:
+            return f"{stat['mean']:.2f}"
+        return f"{stat['mean']:.2f} [{stat['ci_low']:.2f}, {stat['ci_high']:.2f}]"
+
+    lines = [
+        "# Crew Evaluation",
+        "",
+        f"- Iterations: {summary['iterations']} ({len(summary['failed'])} failed)",
+        f"- Overall score (mean, 95% CI): {fmt(summary['overall_score'])}",
+        f"- Wall time per iteration, seconds: {fmt(summary['wall_seconds'])}",
+        "",
+        "| Task | n | Score (mean, 95% CI) |",
+        "|---|---|---|",
+    ]
+    for i, stat in enumerate(summary["task_scores"]):
+        name = task_names[i] if task_names and i < len(task_names) else f"Task {i + 1}"
+        lines.append(f"| {name} | {stat['n']} | {fmt(stat)} |")
+    lines += ["", "| Iteration | Seed | Scores | Wall seconds |", "|---|---|---|---|"]
+    for run in summary["runs"]:
+        scores = ", ".join(f"{s:.1f}" for s in run["scores"])
+        lines.append(f"| {run['iteration']} | {run['seed']} | {scores} | {run['wall_seconds']:.1f} |")
+    for failure in summary["failed"]:
+        lines.append(f"\nIteration {failure['iteration']} failed: {failure['error']}")
+    return "\n".join(lines) + "\n"
+
+
+# =========================
+# UPSTREAM CACHE
+# =========================
+def inputs_key(inputs: Dict[str, Any], upstream: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Content hash of crew inputs, ignoring per-run identifiers.
+
+    Args:
+        inputs: Crew inputs
+        upstream: Model and agent/task config that produced the cached output (see ``research_fingerprint``)
+    """
+    stable = {k: v for k, v in inputs.items() if k != "run_id"}
+    payload = {"inputs": stable, "upstream": upstream or {}}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def research_fingerprint(gangshit: Any, agent: Any, task: Any) -> Dict[str, Any]:
+    """Everything besides the inputs that shapes cached research: model, prompts and handoff format."""
+    return {
+        "model": getattr(agent.llm, "model", str(agent.llm)),
+        "agent": {"role": agent.role, "goal": agent.goal, "backstory": agent.backstory, "max_iter": agent.max_iter},
+        "task": {"description": task.description, "expected_output": task.expected_output},
+        "handoff": gangshit.handoff_specs.get("research_task", {}).get("fields"),
+        "structured": gangshit.structured_handoff,
+    }
+
+
+def cached_research(inputs: Dict[str, Any], cache_dir: Path = CACHE_DIR) -> str:
+    """
+    Return the research handoff for ``inputs``, running research_task once and
+    caching its output on disk for every later iteration or evaluation with identical inputs.
+    """
+    from crewai import Crew, Process
+    from .crew import Gangshit
+
+    gangshit = Gangshit()
+    researcher, research = gangshit.researcher(), gangshit.research_task()
+    key = inputs_key(inputs, research_fingerprint(gangshit, researcher, research))
+    path = cache_dir / f"{key}.md"
+    if path.exists():
+        return path.read_text()
+    gangshit.run_id = f"eval-{key[:12]}"
+    crew = Crew(agents=[researcher], tasks=[research], process=Process.sequential, verbose=False)
+    output = crew.kickoff(inputs={**inputs, "run_id": gangshit.run_id})
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path.write_text(output.raw)
+    return output.raw
+
+
+# =========================
+# WORKERS
+# =========================
+def _test_iteration(iteration: int, seed: int, eval_llm: str, inputs: Dict[str, Any],
+                    research_brief: Optional[str]) -> Dict[str, Any]:
+    """Run and score one test iteration in a fresh process."""
+    random.seed(seed)
+    os.environ["GANGSHIT_LLM_SEED"] = str(seed)
+    started = time.perf_counter()
+    try:
+        from crewai.utilities.evaluators.crew_evaluator_handler import CrewEvaluator
+        from crewai.utilities.llm_utils import create_llm
+        from .crew import Gangshit
+
+        gangshit = Gangshit()
+        gangshit.research_brief = research_brief
+        crew = gangshit.gangshit_crew().copy()
+        evaluator = CrewEvaluator(crew, create_llm(eval_llm))
+        evaluator.set_iteration(1)
+        crew.kickoff(inputs={**inputs, "run_id": f"test-{iteration:03d}-{seed}"})
+        return {
+            "iteration": iteration,
+            "seed": seed,
+            "tasks": [t.name for t in crew.tasks],
+            "scores": list(evaluator.tasks_scores.get(1, [])),
+            "task_seconds": list(evaluator.run_execution_times.get(1, [])),
+            "wall_seconds": time.perf_counter() - started,
+        }
+    except Exception as e:
+        return {"iteration": iteration, "seed": seed, "error": f"{type(e).__name__}: {e}",
+                "wall_seconds": time.perf_counter() - started}
+
+
+def parallel_test(n_iterations: int,
+                  eval_llm: str,
+                  inputs: Dict[str, Any],
+                  workers: int = 2,
+                  reuse_upstream: bool = True,
+                  base_seed: int = BASE_SEED,
+                  results_dir: str = "results") -> Dict[str, Any]:
+    """
+    Evaluate the crew over ``n_iterations`` independent, seeded runs across worker processes.
+
+    Args:
+        n_iterations: Number of iterations
+        eval_llm: Model used to score each task (as for ``Crew.test``)
+        inputs: Crew inputs, identical for every iteration
+        workers: Worker processes
+        reuse_upstream: Run research once and hand the cached output to every iteration
+        base_seed: Iteration ``i`` uses seed ``base_seed + i``
+        results_dir: Where the Markdown and JSON reports are written
+
+    Returns:
+        The aggregated summary (see ``summarize``)
+    """
+    brief = cached_research(inputs) if reuse_upstream else None
+    results = []
+    # spawn keeps each iteration's crew, LLM clients and event bus isolated
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+        futures = [pool.submit(_test_iteration, i, iteration_seed(i, base_seed), eval_llm, inputs, brief)
+                   for i in range(1, n_iterations + 1)]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = result.get("error") or f"scores {result['scores']}"
+            report("eval", f"🧪 Iteration {result['iteration']} done in {result['wall_seconds']:.1f}s: {status}",
+                   logging.WARNING if result.get("error") else logging.INFO,
+                   iteration=result["iteration"], seconds=round(result["wall_seconds"], 1))
+
+    summary = summarize(results)
+    task_names = next((r["tasks"] for r in summary["runs"]), None)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    out = Path(results_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    (out / f"evaluation_{stamp}.md").write_text(render_report(summary, task_names))
+    (out / f"evaluation_{stamp}.json").write_text(json.dumps(summary, indent=2, default=str))
+    report("eval", f"📊 Evaluation report: {out / f'evaluation_{stamp}.md'}")
+    return summary
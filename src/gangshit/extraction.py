@@ -0,0 +1,197 @@
+"""
+Structured extraction of research reports.
+Parses Markdown tables and cited facts into typed rows, writes them to
+CSV/Parquet and builds a compact digest for downstream tasks.
+"""
+
+import csv
+import io
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from .parquet_store import PYARROW_AVAILABLE
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.*?)\s*#*\s*$")
+_SEPARATOR = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+_LINK = re.compile(r"\[([^\]]+)\]\((https?://[^)\s]+)\)")
+_NUMBER = re.compile(r"^[-+]?\$?\d[\d,]*(\.\d+)?%?$")
+_LEADING_ZERO = re.compile(r"^[-+]?\$?0\d")  # ZIP, FIPS and parcel codes, not quantities
+# Identifier columns stay text whatever their values, so their type is stable across reports
+_CODE_COLUMN = re.compile(r"^(?:zip(?:_?code)?|postal_code|fips|tract|census_tract|parcel|apn|id|.+_code|.+_id)$")
+_NULLS = {"", "-", "—", "n/a", "na", "none", "null", "unknown"}
+DIGEST_MAX_ROWS = int(os.getenv("GANGSHIT_DIGEST_MAX_ROWS", "20"))
+
+
+class Table(NamedTuple):
+    title: str
+    columns: List[str]
+    rows: List[Dict[str, Any]]
+
+
+class Fact(NamedTuple):
+    text: str
+    source: str
+    url: str
+
+
+def _split_row(line: str) -> List[str]:
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in re.split(r"(?<!\\)\|", line)]
+
+
+def _column_name(header: str, index: int, seen: Dict[str, int]) -> str:
+    name = re.sub(r"[^0-9a-z]+", "_", _LINK.sub(r"\1", header).lower()).strip("_") or f"column_{index + 1}"
+    seen[name] = seen.get(name, 0) + 1
+    return name if seen[name] == 1 else f"{name}_{seen[name]}"
+
+
+def _coerce(values: List[str], column: Optional[str] = None) -> List[Any]:
+    """
+    Type one column: all-int, all-float or all-bool columns are converted, others stay text.
+    Code-like columns (``zip``, ``fips``, ``tract``, ``parcel``, ``apn``, ``*_code``, ``*_id``) always
+    stay text, and so does any other column with a zero-padded value (e.g. 08901).
+    """
+    cleaned = [None if v.strip().lower() in _NULLS else v.strip() for v in values]
+    present = [v for v in cleaned if v is not None]
+    if column is not None and _CODE_COLUMN.match(column):
+        return cleaned
+    if present and all(_NUMBER.match(v) for v in present) and not any(_LEADING_ZERO.match(v) for v in present):
+        numbers = [None if v is None else v.replace("$", "").replace(",", "").rstrip("%") for v in cleaned]
+        if all("." not in v for v in numbers if v is not None):
+            return [None if v is None else int(v) for v in numbers]
+        return [None if v is None else float(v) for v in numbers]
+    if present and all(v.lower() in ("true", "false", "yes", "no") for v in present):
+        return [None if v is None else v.lower() in ("true", "yes") for v in cleaned]
+    return cleaned
+
+
+def parse_tables(markdown: str) -> List[Table]:
+    """Parse every pipe table in a Markdown document, titled by its nearest heading."""
+    tables: List[Table] = []
+    lines = markdown.splitlines()
+    title = ""
+    i = 0
+    while i < len(lines):
+        heading = _HEADING.match(lines[i])
+        if heading:
+            title = heading.group(1)
+        if "|" in lines[i] and i + 1 < len(lines) and _SEPARATOR.match(lines[i + 1]):
+            seen: Dict[str, int] = {}
+            headers = _split_row(lines[i])
+            columns = [_column_name(h, n, seen) for n, h in enumerate(headers)]
+            raw_rows = []
+            i += 2
+            while i < len(lines) and "|" in lines[i] and lines[i].strip():
+                cells = _split_row(lines[i])
+                cells = (cells + [""] * len(columns))[:len(columns)]
+                raw_rows.append(cells)
+                i += 1
+            typed = [_coerce([row[c] for row in raw_rows], columns[c]) for c in range(len(columns))]
+            rows = [dict(zip(columns, values)) for values in zip(*typed)] if raw_rows else []
+            tables.append(Table(title or f"table_{len(tables) + 1}", columns, rows))
+            continue
+        i += 1
+    return tables
+
+
+def extract_facts(markdown: str) -> List[Fact]:
+    """Collect sentences and bullet points that carry a Markdown citation link."""
+    facts: List[Fact] = []
+    seen = set()
+    for line in markdown.splitlines():
+        if "|" in line or not _LINK.search(line):
+            continue
+        text = re.sub(r"^\s*(?:[-*+]|\d+\.)\s+", "", line).strip()
+        for sentence in re.split(r"(?<=[.!?])\s+(?=[A-Z\[])", text):
+            for source, url in _LINK.findall(sentence):
+                plain = _LINK.sub(r"\1", sentence).strip()
+                if (plain, url) not in seen:
+                    seen.add((plain, url))
+                    facts.append(Fact(plain, source, url))
+    return facts
+
+
+def _slug(title: str, index: int) -> str:
+    return f"{index:02d}_" + (re.sub(r"[^0-9a-z]+", "_", title.lower()).strip("_")[:40] or "table")
+
+
+def write_tables(tables: List[Table], out_dir: Path, fmt: Optional[str] = None) -> Iterator[Path]:
+    """
+    Stream each table to ``out_dir`` as CSV (default) or Parquet.
+
+    Parquet falls back to CSV when pyarrow is missing or a column mixes types.
+    """
+    fmt = (fmt or os.getenv("GANGSHIT_EXTRACT_FORMAT", "csv")).lower()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for index, table in enumerate(tables, 1):
+        stem = out_dir / _slug(table.title, index)
+        if fmt == "parquet" and PYARROW_AVAILABLE:
+            try:
+                pq.write_table(pa.Table.from_pylist(table.rows), stem.with_suffix(".parquet"))
+                yield stem.with_suffix(".parquet")
+                continue
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass
+        with open(stem.with_suffix(".csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=table.columns)
+            writer.writeheader()
+            for row in table.rows:
+                writer.writerow(row)
+        yield stem.with_suffix(".csv")
+
+
+def write_facts(facts: List[Fact], out_dir: Path) -> Path:
+    """Write cited facts to ``facts.csv``."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / "facts.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(Fact._fields)
+        writer.writerows(facts)
+    return path
+
+
+def digest(tables: List[Table], facts: List[Fact], max_rows: int = DIGEST_MAX_ROWS) -> str:
+    """Compact text form of the extracted data, used in place of the full report."""
+    out = io.StringIO()
+    if facts:
+        out.write("Cited facts:\n")
+        out.writelines(f"- {fact.text} <{fact.url}>\n" for fact in facts)
+    writer = csv.writer(out, lineterminator="\n")
+    for table in tables:
+        out.write(f"\nTable: {table.title} ({len(table.rows)} rows)\n")
+        writer.writerow(table.columns)
+        writer.writerows([row[c] for c in table.columns] for row in table.rows[:max_rows])
+        if len(table.rows) > max_rows:
+            out.write(f"... {len(table.rows) - max_rows} more rows in the extracted dataset\n")
+    return out.getvalue().strip()
+
+
+def structure_report(markdown: str, out_dir: Path) -> str:
+    """
+    Extract tables and facts from a report, write them under ``out_dir`` and
+    return the compact digest. Returns the report unchanged if nothing structured is found.
+    """
+    tables, facts = parse_tables(markdown), extract_facts(markdown)
+    if not tables and not facts:
+        return markdown
+    written = list(write_tables(tables, out_dir))
+    write_facts(facts, out_dir)
+    summary = ""
+    for block in markdown.split("\n\n"):
+        text = " ".join(l.strip() for l in block.splitlines() if l.strip() and not _HEADING.match(l))
+        if text and "|" not in text:
+            summary = text
+            break
+    header = f"Summary: {summary[:600]}\n" if summary else ""
+    return f"{header}Structured data ({len(written)} tables, {len(facts)} facts) in {out_dir}\n{digest(tables, facts)}"
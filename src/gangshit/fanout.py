@@ -0,0 +1,201 @@
+"""
+Map-reduce fan-out for the research stage.
+The topic is split into sub-queries (one per county or data source), each
+researched concurrently with its own bounded budget, and the findings are
+merged back into the usual research report shape.
+"""
+
+import contextvars
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_SOURCES = [
+    "county recorder and assessor records",
+    "court dockets and foreclosure filings",
+    "listing, auction and market data",
+    "local news and industry reports",
+]
+REPORT_SECTIONS = [
+    "Executive Summary",
+    "Key Findings",
+    "Stakeholders",
+    "Recommendations",
+    "Data Tables",
+]
+_SECTION_ALIASES = {
+    "summary": "Executive Summary", "executive summary": "Executive Summary", "overview": "Executive Summary",
+    "findings": "Key Findings", "key findings": "Key Findings", "trends": "Key Findings",
+    "stakeholders": "Stakeholders", "stakeholder analysis": "Stakeholders",
+    "recommendations": "Recommendations", "next steps": "Recommendations",
+    "tables": "Data Tables", "data tables": "Data Tables", "statistics": "Data Tables",
+}
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.*?)\s*#*\s*$")
+
+
+def research_slots() -> int:
+    """Concurrent sub-tasks: ``GANGSHIT_RESEARCH_SLOTS``, else Ollama's ``OLLAMA_NUM_PARALLEL``."""
+    return max(1, int(os.getenv("GANGSHIT_RESEARCH_SLOTS") or os.getenv("OLLAMA_NUM_PARALLEL") or "2"))
+
+
+def split_topic(topic: str, parts: int, inputs: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Split a topic into up to ``parts`` sub-queries.
+
+    ``inputs['research_subtopics']`` is used verbatim when given; otherwise one
+    sub-query per entry of ``inputs['counties']``, falling back to one per data source.
+    When ``parts`` exceeds the number of counties, each county is further split by
+    data source. The result is capped at the distinct sub-queries available: the
+    explicit sub-topics, counties x sources, or the ``DEFAULT_SOURCES`` alone.
+    """
+    inputs = inputs or {}
+    if inputs.get("research_subtopics"):
+        return list(inputs["research_subtopics"])[:parts]
+    counties = list(inputs.get("counties") or [])
+    if not counties:
+        return [f"{topic} — focus on {source}" for source in DEFAULT_SOURCES[:parts]]
+    if parts <= len(counties):
+        return [f"{topic} — focus on {county}" for county in counties[:parts]]
+    # Source-major order so every county is covered before any gets a second source
+    queries = [f"{topic} — focus on {county}, {source}" for source in DEFAULT_SOURCES for county in counties]
+    return queries[:parts]
+
+
+# =========================
+# MERGE
+# =========================
+def _sections(report: str) -> Dict[str, List[str]]:
+    """Group a report's lines under canonical section names."""
+    sections: Dict[str, List[str]] = {}
+    current = "Executive Summary"
+    for line in report.splitlines():
+        heading = _HEADING.match(line)
+        if heading:
+            title = re.sub(r"[^a-z ]", "", heading.group(1).lower()).strip()
+            current = _SECTION_ALIASES.get(title, heading.group(1).strip())
+            continue
+        sections.setdefault(current, []).append(line)
+    return sections
+
+
+def _key(line: str) -> str:
+    """Normalization used to spot the same bullet or row reported by several sub-tasks."""
+    return re.sub(r"[\W_]+", " ", re.sub(r"^\s*(?:[-*+]|\d+\.)\s+", "", line).lower()).strip()
+
+
+def _merge_tables(blocks: List[List[str]]) -> List[str]:
+    """Concatenate tables that share a header, dropping duplicate rows."""
+    merged: Dict[str, List[str]] = {}
+    for block in blocks:
+        if len(block) < 2:
+            continue
+        header = block[0].strip()
+        rows = merged.setdefault(header, [block[0], block[1]])
+        seen = {_key(r) for r in rows[2:]}
+        for row in block[2:]:
+            if _key(row) not in seen:
+                seen.add(_key(row))
+                rows.append(row)
+    out: List[str] = []
+    for rows in merged.values():
+        out.extend(rows + [""])
+    return out
+
+
+def _trim(lines: List[str]) -> List[str]:
+    """Drop leading and trailing blank lines."""
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    return lines[start:end]
+
+
+def merge_reports(reports: List[Tuple[str, str]]) -> str:
+    """
+    Merge ``(sub_query, markdown)`` reports into one report with the standard sections.
+
+    Bullets, paragraphs and table rows that appear in several sub-reports are kept once.
+    """
+    order = list(REPORT_SECTIONS)
+    lines: Dict[str, List[str]] = {name: [] for name in order}
+    tables: Dict[str, List[List[str]]] = {name: [] for name in order}
+    seen: Dict[str, set] = {name: set() for name in order}
+
+    for _, report in reports:
+        for section, body in _sections(report).items():
+            if section not in lines:
+                order.append(section)
+                lines[section], tables[section], seen[section] = [], [], set()
+            block: List[str] = []
+            for line in body + [""]:
+                if line.strip().startswith("|"):
+                    block.append(line)
+                    continue
+                if block:
+                    tables[section].append(block)
+                    block = []
+                key = _key(line)
+                if not line.strip():
+                    # Keep one blank line between paragraphs, never a run of them
+                    if lines[section] and lines[section][-1].strip():
+                        lines[section].append("")
+                elif key and key not in seen[section]:
+                    seen[section].add(key)
+                    lines[section].append(line)
+
+    out = ["# Research Report", ""]
+    for section in order:
+        body = _trim(lines[section])
+        merged_tables = _trim(_merge_tables(tables[section]))
+        if body and merged_tables:
+            body.append("")
+        body += merged_tables
+        if not body:
+            continue
+        out += [f"## {section}", *body, ""]
+    out += ["## Sub-queries", *[f"- {query}" for query, _ in reports]]
+    return "\n".join(out).strip() + "\n"
+
+
+# =========================
+# MAP
+# =========================
+def run_fanout(topic: str,
+               run_subtask: Callable[[str], str],
+               parts: int,
+               inputs: Optional[Dict[str, Any]] = None,
+               slots: Optional[int] = None) -> str:
+    """
+    Research sub-queries concurrently and merge the results.
+
+    Args:
+        topic: The research topic
+        run_subtask: Runs one sub-query to a Markdown report (e.g. a one-task crew)
+        parts: Number of sub-queries
+        inputs: Crew inputs, consulted for explicit sub-topics or counties
+        slots: Concurrent sub-tasks (defaults to ``research_slots()``)
+
+    Returns:
+        The merged Markdown report; sub-queries that fail are listed under Notes
+    """
+    queries = split_topic(topic, parts, inputs)
+    results: Dict[str, str] = {}
+    failures: List[str] = []
+    with ThreadPoolExecutor(max_workers=min(slots or research_slots(), len(queries)) or 1) as pool:
+        # Each sub-task runs in a copy of the caller's context so its bus events keep the run binding
+        futures = {pool.submit(contextvars.copy_context().run, run_subtask, query): query for query in queries}
+        for future in as_completed(futures):
+            query = futures[future]
+            try:
+                results[query] = str(future.result())
+            except Exception as e:
+                failures.append(f"- {query}: {type(e).__name__}: {e}")
+    if not results:
+        raise RuntimeError("All research sub-tasks failed:\n" + "\n".join(failures))
+    merged = merge_reports([(q, results[q]) for q in queries if q in results])
+    if failures:
+        merged += "\n## Notes\nSub-queries that failed:\n" + "\n".join(failures) + "\n"
+    return merged
@@ -0,0 +1,351 @@
+"""
+Offline geocoder backed by a local gazetteer.
+Street names are indexed in a prefix trie, house numbers are interpolated
+along street range segments (TIGER-style) and results are cached in SQLite.
+"""
+
+import csv
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+SUFFIXES = {
+    "ALLEY": "ALY", "AVENUE": "AVE", "BOULEVARD": "BLVD", "CIRCLE": "CIR", "COURT": "CT",
+    "DRIVE": "DR", "EXPRESSWAY": "EXPY", "FREEWAY": "FWY", "HIGHWAY": "HWY", "LANE": "LN",
+    "PARKWAY": "PKWY", "PLACE": "PL", "ROAD": "RD", "SQUARE": "SQ", "STREET": "ST",
+    "TERRACE": "TER", "TRAIL": "TRL", "WAY": "WAY",
+}
+DIRECTIONS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+}
+_ADDRESS = re.compile(r"^\s*(\d+)[A-Z]?\s+([^,]+?)\s*(?:,(.*))?$")
+_ZIP = re.compile(r"\b(\d{5})(?:-\d{4})?\s*$")
+MISS_TTL = float(os.getenv("GANGSHIT_GEOCODE_MISS_TTL", str(7 * 86400)))
+
+
+def normalize_street(name: str) -> str:
+    """Uppercase, strip punctuation and abbreviate suffixes/directionals."""
+    words = re.sub(r"[^A-Z0-9 ]", " ", name.upper()).split()
+    return " ".join(SUFFIXES.get(w, DIRECTIONS.get(w, w)) for w in words)
+
+
+def parse_address(address: str) -> Optional[Tuple[int, str, Optional[str]]]:
+    """
+    Split a one-line address into house number, normalized street and ZIP.
+
+    Returns:
+        ``(number, street, zip)`` or None when no house number is present
+    """
+    address = address.upper()
+    zip_match = _ZIP.search(address)
+    if zip_match:
+        address = address[:zip_match.start()].rstrip(" ,")
+    match = _ADDRESS.match(address)
+    if not match:
+        return None
+    number, street, rest = match.groups()
+    street = normalize_street(street)
+    if rest is None:
+        street = _strip_locality(street)
+    return int(number), street, zip_match.group(1) if zip_match else None
+
+
+def _strip_locality(street: str) -> str:
+    """
+    Drop a city/state written after the street without a comma
+    ("MAIN ST LAS VEGAS NV" -> "MAIN ST"): the street ends at its first suffix
+    after the name, plus an optional post-directional.
+    """
+    words = street.split()
+    suffixes, directions = set(SUFFIXES.values()), set(DIRECTIONS.values())
+    for i, word in enumerate(words[1:], start=1):
+        if word in suffixes:
+            end = i + 2 if i + 1 < len(words) and words[i + 1] in directions else i + 1
+            return " ".join(words[:end])
+    return street
+
+
+class Segment(NamedTuple):
+    """One side of a street between two address numbers."""
+    low: int
+    high: int
+    start: Tuple[float, float]
+    end: Tuple[float, float]
+    zip: Optional[str]
+    parity: Optional[int]  # 0 even, 1 odd, None both
+
+
+class GeocodeResult(NamedTuple):
+    lat: float
+    lon: float
+    quality: str  # "point" or "interpolated"
+
+
+class StreetTrie:
+    """Prefix trie over normalized street names."""
+
+    _END = "\0"
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+
+    def insert(self, name: str) -> None:
+        node = self._root
+        for char in name:
+            node = node.setdefault(char, {})
+        node[self._END] = name
+
+    def __contains__(self, name: str) -> bool:
+        node = self._walk(name)
+        return node is not None and self._END in node
+
+    def _walk(self, prefix: str) -> Optional[Dict[str, Any]]:
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Return up to ``limit`` indexed names starting with ``prefix``, shortest first."""
+        start = self._walk(prefix)
+        if start is None:
+            return []
+        found, frontier = [], [start]
+        while frontier and len(found) < limit:
+            next_frontier = []
+            for node in frontier:
+                for char, child in sorted(node.items()):
+                    if char == self._END:
+                        found.append(child)
+                    else:
+                        next_frontier.append(child)
+            frontier = next_frontier
+        return found[:limit]
+
+
+class Gazetteer:
+    """In-memory street ranges and address points."""
+
+    def __init__(self):
+        self.trie = StreetTrie()
+        self._segments: Dict[str, List[Segment]] = {}
+        self._lows: Dict[str, List[int]] = {}
+        self._points: Dict[Tuple[int, str, Optional[str]], Tuple[float, float]] = {}
+        self._digest = hashlib.sha1()
+
+    @property
+    def version(self) -> str:
+        """Content hash of everything indexed so far; changes whenever the gazetteer does."""
+        return self._digest.hexdigest()[:16]
+
+    def add_segment(self, street: str, from_addr: int, to_addr: int,
+                    start: Tuple[float, float], end: Tuple[float, float],
+                    zip_code: Optional[str] = None) -> None:
+        """Index a street range; coordinates run from ``from_addr`` to ``to_addr``."""
+        street = normalize_street(street)
+        if from_addr > to_addr:
+            from_addr, to_addr, start, end = to_addr, from_addr, end, start
+        parity = from_addr % 2 if from_addr % 2 == to_addr % 2 else None
+        self.trie.insert(street)
+        self._segments.setdefault(street, []).append(Segment(from_addr, to_addr, start, end, zip_code, parity))
+        self._lows.pop(street, None)
+        self._digest.update(repr(("segment", street, from_addr, to_addr, start, end, zip_code)).encode())
+
+    def add_point(self, number: int, street: str, lat: float, lon: float, zip_code: Optional[str] = None) -> None:
+        """Index an exact address point."""
+        street = normalize_street(street)
+        self.trie.insert(street)
+        self._points[(number, street, zip_code)] = (lat, lon)
+        self._points.setdefault((number, street, None), (lat, lon))
+        self._digest.update(repr(("point", number, street, lat, lon, zip_code)).encode())
+
+    def load_ranges(self, path: str) -> int:
+        """
+        Load street ranges from CSV with columns
+        ``street, from_addr, to_addr, start_lat, start_lon, end_lat, end_lon[, zip]``.
+        """
+        count = 0
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                self.add_segment(
+                    row["street"], int(row["from_addr"]), int(row["to_addr"]),
+                    (float(row["start_lat"]), float(row["start_lon"])),
+                    (float(row["end_lat"]), float(row["end_lon"])),
+                    row.get("zip") or None,
+                )
+                count += 1
+        return count
+
+    def load_points(self, path: str) -> int:
+        """Load address points from CSV with columns ``number, street, lat, lon[, zip]``."""
+        count = 0
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                self.add_point(int(row["number"]), row["street"], float(row["lat"]),
+                               float(row["lon"]), row.get("zip") or None)
+                count += 1
+        return count
+
+    def _street_segments(self, street: str) -> Tuple[List[Segment], List[int]]:
+        segments = self._segments.get(street, [])
+        if street not in self._lows:
+            segments.sort()
+            self._lows[street] = [s.low for s in segments]
+        return segments, self._lows[street]
+
+    def resolve_street(self, street: str) -> Optional[str]:
+        """Match a street exactly, or by unique prefix (e.g. a missing suffix)."""
+        if street in self.trie:
+            return street
+        candidates = self.trie.complete(street + " ", limit=2) or self.trie.complete(street, limit=2)
+        return candidates[0] if len(candidates) == 1 else None
+
+    def lookup(self, number: int, street: str, zip_code: Optional[str] = None) -> Optional[GeocodeResult]:
+        """Geocode a parsed address."""
+        street = self.resolve_street(street)
+        if street is None:
+            return None
+        point = self._points.get((number, street, zip_code)) or self._points.get((number, street, None))
+        if point:
+            return GeocodeResult(point[0], point[1], "point")
+
+        segments, lows = self._street_segments(street)
+        best = None
+        for segment in reversed(segments[:bisect_right(lows, number)]):
+            if number > segment.high:
+                continue
+            if segment.parity is not None and number % 2 != segment.parity:
+                continue
+            if zip_code and segment.zip and segment.zip != zip_code:
+                best = best or segment
+                continue
+            best = segment
+            break
+        if best is None:
+            return None
+        span = best.high - best.low
+        t = (number - best.low) / span if span else 0.5
+        lat = best.start[0] + t * (best.end[0] - best.start[0])
+        lon = best.start[1] + t * (best.end[1] - best.start[1])
+        return GeocodeResult(lat, lon, "interpolated")
+
+
+class Geocoder:
+    """Gazetteer lookups fronted by a persistent SQLite cache."""
+
+    def __init__(self, gazetteer: Gazetteer, cache_path: Optional[str] = None, miss_ttl: float = MISS_TTL):
+        """
+        Args:
+            gazetteer: Loaded street ranges / address points
+            cache_path: SQLite file for cached results
+            miss_ttl: Seconds a cached miss is trusted (every cached result is looked up
+                again once the gazetteer changes)
+        """
+        self.gazetteer = gazetteer
+        self.miss_ttl = miss_ttl
+        self.cache_path = Path(cache_path or os.getenv("GANGSHIT_GEOCODE_CACHE", "data/geocode_cache.sqlite"))
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.cache_path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS geocode (key TEXT PRIMARY KEY, lat REAL, lon REAL, quality TEXT)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(geocode)")}
+        with self._db:
+            for column, kind in (("version", "TEXT"), ("cached_at", "REAL")):
+                if column not in columns:
+                    self._db.execute(f"ALTER TABLE geocode ADD COLUMN {column} {kind}")
+
+    @staticmethod
+    def cache_key(address: str) -> Optional[str]:
+        parsed = parse_address(address)
+        if parsed is None:
+            return None
+        number, street, zip_code = parsed
+        return f"{number}|{street}|{zip_code or ''}"
+
+    def geocode(self, address: str) -> Optional[GeocodeResult]:
+        """Geocode one address."""
+        return self.geocode_many([address])[0]
+
+    def geocode_many(self, addresses: List[str], chunk_size: int = 500) -> List[Optional[GeocodeResult]]:
+        """
+        Geocode a batch, reading and writing the cache in chunks.
+
+        Cached results are only used while the gazetteer version they were
+        looked up against is current. Misses (addresses the gazetteer cannot
+        place) are cached too so they are not retried on every batch, but only
+        for ``miss_ttl`` seconds.
+        """
+        results: List[Optional[GeocodeResult]] = []
+        version = self.gazetteer.version
+        for start in range(0, len(addresses), chunk_size):
+            chunk = addresses[start:start + chunk_size]
+            keys = [self.cache_key(a) for a in chunk]
+            wanted = sorted({k for k in keys if k})
+            cached: Dict[str, Optional[GeocodeResult]] = {}
+            if wanted:
+                marks = ",".join("?" * len(wanted))
+                fresh_after = time.time() - self.miss_ttl
+                for key, lat, lon, quality, cached_version, cached_at in self._db.execute(
+                        f"SELECT key, lat, lon, quality, version, cached_at FROM geocode WHERE key IN ({marks})",
+                        wanted):
+                    if cached_version != version:
+                        continue
+                    if quality != "miss":
+                        cached[key] = GeocodeResult(lat, lon, quality)
+                    elif (cached_at or 0) >= fresh_after:
+                        cached[key] = None
+
+            fresh = {}
+            for key in wanted:
+                if key in cached:
+                    continue
+                number, street, zip_code = key.split("|")
+                cached[key] = fresh[key] = self.gazetteer.lookup(int(number), street, zip_code or None)
+            if fresh:
+                now = time.time()
+                with self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO geocode (key, lat, lon, quality, version, cached_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [(k, r.lat, r.lon, r.quality, version, now) if r else (k, None, None, "miss", version, now)
+                         for k, r in fresh.items()],
+                    )
+            results.extend(cached.get(k) if k else None for k in keys)
+        return results
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def load_gazetteer(ranges: Optional[str] = None, points: Optional[str] = None) -> Gazetteer:
+    """Build a gazetteer from a street-ranges CSV and/or an address-points CSV."""
+    gazetteer = Gazetteer()
+    if ranges:
+        gazetteer.load_ranges(ranges)
+    if points:
+        gazetteer.load_points(points)
+    return gazetteer
+
+
+def geocode_records(records: Iterable[Dict[str, Any]], geocoder: Geocoder,
+                    address_field: str = "address") -> List[Dict[str, Any]]:
+    """
+    Fill ``lat``/``lon`` on property records that lack coordinates, ready for
+    ``PropertyHistory.record_snapshot`` or ``write_partitioned``.
+    """
+    records = list(records)
+    missing = [r for r in records if (r.get("lat") is None or r.get("lon") is None) and r.get(address_field)]
+    for record, result in zip(missing, geocoder.geocode_many([r[address_field] for r in missing])):
+        if result:
+            record["lat"], record["lon"], record["geocode_quality"] = result
+    return records
@@ -0,0 +1,168 @@
+"""
+Typed task handoffs.
+Each task's ``expected_output.contents`` keys in tasks.yaml become a Pydantic
+model. A task's Markdown output is parsed into that model by section heading,
+serialized as compact JSON, and downstream tasks receive only the fields they
+list under ``needs`` (or every field of their ``input_from`` tasks).
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+import yaml
+from crewai import Task
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, ValidationError, create_model
+
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.*?)\s*#*\s*$")
+_MODELS: Dict[str, Type[BaseModel]] = {}
+
+
+def load_specs(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Handoff specs per task from tasks.yaml.
+
+    Returns:
+        ``{task: {"fields": {name: description}, "needs": {upstream: [fields]}}}``
+    """
+    try:
+        with open(path) as f:
+            config = yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return {}
+    config = config.get("tasks", config)
+    specs: Dict[str, Dict[str, Any]] = {}
+    for name, task in config.items():
+        if not isinstance(task, dict):
+            continue
+        expected = task.get("expected_output")
+        contents = expected.get("contents") or [] if isinstance(expected, dict) else []
+        fields: Dict[str, str] = {}
+        for entry in contents:
+            if isinstance(entry, dict):
+                fields.update({str(k): str(v) for k, v in entry.items()})
+            else:
+                fields[str(entry)] = ""
+        specs[name] = {"fields": fields, "needs": task.get("needs") or {},
+                       "input_from": [t.strip() for t in str(task.get("input_from") or "").split("+") if t.strip()]}
+    for name, spec in specs.items():
+        if not spec["needs"]:
+            spec["needs"] = {up: list(specs.get(up, {}).get("fields", {})) for up in spec.pop("input_from")}
+        else:
+            spec.pop("input_from")
+    return specs
+
+
+def handoff_model(task_name: str, fields: Dict[str, str]) -> Type[BaseModel]:
+    """Pydantic model with one optional string field per ``expected_output.contents`` key."""
+    key = f"{task_name}:{','.join(fields)}"
+    if key not in _MODELS:
+        class_name = "".join(part.title() for part in task_name.split("_")) + "Handoff"
+        _MODELS[key] = create_model(
+            class_name,
+            __config__=ConfigDict(extra="ignore"),
+            **{name: (str, Field("", description=description)) for name, description in fields.items()},
+        )
+    return _MODELS[key]
+
+
+def section_prompt(fields: Dict[str, str]) -> str:
+    """Instruction appended to a task's expected output so its sections map onto the model."""
+    sections = "; ".join(f"## {name.replace('_', ' ').title()}" + (f" ({desc})" if desc else "")
+                         for name, desc in fields.items())
+    return f"Markdown with exactly these sections: {sections}."
+
+
+def _match(heading: str, fields: List[str]) -> Optional[str]:
+    words = set(re.sub(r"[^a-z0-9]+", " ", heading.lower()).split())
+    scored = [(len(words & set(f.split("_"))), -len(f), f) for f in fields]
+    best = max(scored, default=(0, 0, None))
+    return best[2] if best[0] else None
+
+
+def parse_handoff(model: Type[BaseModel], text: str) -> BaseModel:
+    """
+    Build a handoff from a task's output.
+
+    Compact JSON is loaded directly; Markdown is split at headings and each
+    section is assigned to the best-matching field. Unmatched subsections stay
+    with the preceding field, and output without any matching heading goes to
+    the first field so nothing is lost.
+    """
+    text = text or ""
+    if text.lstrip().startswith("{"):
+        try:
+            return model.model_validate_json(text)
+        except ValidationError:
+            pass
+    fields = list(model.model_fields)
+    values: Dict[str, List[str]] = {}
+    current = fields[0] if fields else None
+    seen_section = False
+    for line in text.splitlines():
+        heading = _HEADING.match(line)
+        if heading:
+            matched = _match(heading.group(1), fields)
+            if matched:
+                current, seen_section = matched, True
+                continue
+            if not seen_section:
+                continue  # document title
+        if current:
+            values.setdefault(current, []).append(line)
+    return model(**{name: "\n".join(lines).strip() for name, lines in values.items()})
+
+
+def dumps(handoff: BaseModel, include: Optional[List[str]] = None) -> str:
+    """Compact JSON of the non-empty fields (optionally only ``include``)."""
+    data = handoff.model_dump(include=set(include) if include is not None else None)
+    return json.dumps({k: v for k, v in data.items() if v}, separators=(",", ":"), ensure_ascii=False)
+
+
+class HandoffTask(Task):
+    """Task that hands downstream tasks a typed, filtered view of its upstream outputs."""
+
+    handoff_fields: Dict[str, str] = Field(default_factory=dict, description="Output model fields")
+    handoff_needs: Dict[str, List[str]] = Field(default_factory=dict, description="Upstream task -> fields used")
+    _handoff: Optional[BaseModel] = PrivateAttr(default=None)
+
+    def handoff(self) -> Optional[BaseModel]:
+        """This task's output as its typed handoff (None before it has run)."""
+        if self.output is None or not self.handoff_fields:
+            return None
+        if self._handoff is None:
+            self._handoff = parse_handoff(handoff_model(self.name or "task", self.handoff_fields), self.output.raw)
+        return self._handoff
+
+    def handoff_context(self, default: Optional[str]) -> Optional[str]:
+        """Compact JSON of the declared upstream fields, in place of the whole upstream Markdown."""
+        if not self.handoff_needs or not isinstance(self.context, list):
+            return default
+        parts = []
+        for upstream in self.context:
+            needed = self.handoff_needs.get(upstream.name or "")
+            handoff = upstream.handoff() if isinstance(upstream, HandoffTask) else None
+            if needed is None or handoff is None:
+                continue
+            parts.append(f"{json.dumps(upstream.name)}:{dumps(handoff, needed)}")
+        return "{" + ",".join(parts) + "}" if parts else default
+
+    def _save_handoff(self) -> None:
+        handoff = self.handoff()
+        if handoff is not None and self.output_file:
+            path = Path(self.output_file).with_name(f"{self.name}_handoff.json")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(handoff.model_dump(), indent=2, ensure_ascii=False) + "\n")
+
+    def execute_sync(self, agent=None, context=None, tools=None):
+        self._handoff = None
+        output = super().execute_sync(agent, self.handoff_context(context), tools)
+        self._save_handoff()
+        return output
+
+    def execute_async(self, agent=None, context=None, tools=None):
+        self._handoff = None
+        future = super().execute_async(agent, self.handoff_context(context), tools)
+        future.add_done_callback(lambda _: self._save_handoff())
+        return future
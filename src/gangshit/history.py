@@ -0,0 +1,400 @@
+"""
+Append-only, delta-encoded history of property state and distress scores.
+Supports as-of queries, trend windows and versioned per-run report artifacts.
+"""
+
+import functools
+import json
+import os
+import shutil
+import threading
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Optional dependency: without fcntl (Windows) the history is safe within one process only
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+DISTRESS_THRESHOLD = float(os.getenv("GANGSHIT_DISTRESS_THRESHOLD", "0.7"))
+CHECKPOINT_EVERY = 50
+
+
+def _utc(when: Optional[datetime] = None) -> datetime:
+    """Normalize a datetime to timezone-aware UTC (naive values are taken as UTC)."""
+    when = when or datetime.now(timezone.utc)
+    if when.tzinfo is None:
+        return when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc)
+
+
+def is_distressed(state: Optional[Dict[str, Any]], threshold: float = DISTRESS_THRESHOLD) -> bool:
+    """Return True when a property state carries a distress flag or score over threshold."""
+    if not state:
+        return False
+    if state.get("distressed") is not None:
+        return bool(state["distressed"])
+    score = state.get("distress_score")
+    return score is not None and float(score) >= threshold
+
+
+def _synced(exclusive: bool = False):
+    """Run a ``PropertyHistory`` method under its file lock, after catching up with other writers."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._locked(exclusive):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class PropertyHistory:
+    """
+    Append-only store of property snapshots.
+
+    Each snapshot line in ``snapshots.jsonl`` holds only what changed since the
+    previous state, laid out column-wise::
+
+        {"seq": 3, "ts": "...", "run_id": "...",
+         "ids": ["p1", "p7"],
+         "cols": {"distress_score": [[0, 0.82], [1, 0.4]], "stage": [[1, "auction"]]},
+         "removed": ["p9"]}
+
+    Column entries are ``[row_index_into_ids, value]`` pairs, so unchanged fields
+    cost nothing. A full-state checkpoint is written every ``CHECKPOINT_EVERY``
+    snapshots to keep as-of replay short.
+
+    Several processes may share one history directory: every read and append
+    holds ``snapshots.lock`` (shared or exclusive) and first indexes snapshots
+    other processes appended since it last looked.
+    """
+
+    def __init__(self, root: Optional[str] = None, key: str = "property_id"):
+        """
+        Open (or create) a history directory.
+
+        Args:
+            root: Directory holding the log and checkpoints
+            key: Record field used as the property identifier
+        """
+        self.root = Path(root or os.getenv("GANGSHIT_HISTORY_DIR", "data/history"))
+        self.key = key
+        self.log_path = self.root / "snapshots.jsonl"
+        self.lock_path = self.root / "snapshots.lock"
+        self.checkpoint_dir = self.root / "checkpoints"
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+        self._times: List[datetime] = []
+        self._offsets: List[int] = []
+        self._end = 0  # log bytes indexed so far
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._mutex = threading.RLock()
+        self._depth = 0
+        with self._locked():
+            pass
+
+    # =========================
+    # LOG INDEX
+    # =========================
+    @contextmanager
+    def _locked(self, exclusive: bool = False):
+        """Hold the history lock (re-entrant within a thread) and refresh the index on first entry."""
+        with self._mutex:
+            if self._depth:
+                yield
+                return
+            with open(self.lock_path, "a+b") as handle:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                self._depth += 1
+                try:
+                    self._refresh()
+                    yield
+                finally:
+                    self._depth -= 1
+
+    def _refresh(self) -> None:
+        """Index snapshots appended since the last look and bring the current state up to date."""
+        if not self.log_path.exists() or self.log_path.stat().st_size == self._end:
+            return
+        first = len(self._offsets)
+        with open(self.log_path, "rb") as f:
+            f.seek(self._end)
+            for line in iter(f.readline, b""):
+                if not line.endswith(b"\n"):
+                    break  # partial line from a writer without the lock; pick it up next time
+                if line.strip():
+                    header = json.loads(line)
+                    self._times.append(datetime.fromisoformat(header["ts"]))
+                    self._offsets.append(self._end)
+                self._end += len(line)
+        if first == 0:
+            self._state = self._replay(len(self._offsets))
+        else:
+            for delta in self._read(first, len(self._offsets)):
+                self._apply(self._state, delta)
+
+    def _read(self, start: int, stop: int) -> Iterable[Dict[str, Any]]:
+        """Yield snapshot deltas ``start <= seq < stop`` from the log."""
+        if start >= stop:
+            return
+        with open(self.log_path, "rb") as f:
+            f.seek(self._offsets[start])
+            for _ in range(stop - start):
+                yield json.loads(f.readline())
+
+    def _nearest_checkpoint(self, count: int) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """Return the largest checkpoint covering at most ``count`` snapshots."""
+        best = (count // CHECKPOINT_EVERY) * CHECKPOINT_EVERY
+        while best > 0:
+            path = self.checkpoint_dir / f"{best:08d}.json"
+            if path.exists():
+                with open(path, "r") as f:
+                    return best, json.load(f)
+            best -= CHECKPOINT_EVERY
+        return 0, {}
+
+    def _replay(self, count: int) -> Dict[str, Dict[str, Any]]:
+        """Rebuild the state after the first ``count`` snapshots."""
+        start, state = self._nearest_checkpoint(count)
+        for delta in self._read(start, count):
+            self._apply(state, delta)
+        return state
+
+    @staticmethod
+    def _apply(state: Dict[str, Dict[str, Any]], delta: Dict[str, Any]) -> None:
+        """Apply one columnar delta to a state mapping in place."""
+        ids = delta.get("ids", [])
+        for pid in ids:
+            state.setdefault(pid, {})
+        for field, entries in delta.get("cols", {}).items():
+            for row, value in entries:
+                if value is None:
+                    state[ids[row]].pop(field, None)
+                else:
+                    state[ids[row]][field] = value
+        for pid in delta.get("removed", []):
+            state.pop(pid, None)
+
+    # =========================
+    # WRITES
+    # =========================
+    @_synced(exclusive=True)
+    def record_snapshot(self,
+                        records: Iterable[Dict[str, Any]],
+                        taken_at: Optional[datetime] = None,
+                        run_id: Optional[str] = None,
+                        complete: bool = False) -> Dict[str, int]:
+        """
+        Append a snapshot of property records as a delta against the current state.
+
+        Args:
+            records: Property dicts, each carrying ``self.key``
+            taken_at: Snapshot time (defaults to now, UTC)
+            run_id: Crew run that produced the snapshot
+            complete: When True, properties absent from ``records`` are marked removed
+
+        Returns:
+            Counts of changed and removed properties
+        """
+        taken_at = _utc(taken_at)
+        if self._times and taken_at < self._times[-1]:
+            raise ValueError(f"Snapshot at {taken_at} predates the last snapshot {self._times[-1]}")
+
+        ids: List[str] = []
+        cols: Dict[str, List[list]] = {}
+        seen = set()
+        for record in records:
+            pid = str(record[self.key])
+            seen.add(pid)
+            previous = self._state.get(pid)
+            current = {k: v for k, v in record.items() if k != self.key}
+            row = None
+            for field in set(current) | set(previous or {}):
+                value = current.get(field)
+                if previous is not None and previous.get(field) == value:
+                    continue
+                if previous is None and value is None:
+                    continue
+                if row is None:
+                    row = len(ids)
+                    ids.append(pid)
+                cols.setdefault(field, []).append([row, value])
+            if previous is None and row is None:
+                ids.append(pid)
+
+        removed = sorted(set(self._state) - seen) if complete else []
+        delta = {
+            "seq": len(self._offsets),
+            "ts": taken_at.isoformat(),
+            "run_id": run_id,
+            "ids": ids,
+            "cols": cols,
+            "removed": removed,
+        }
+
+        line = json.dumps(delta, separators=(",", ":")).encode() + b"\n"
+        with open(self.log_path, "ab") as f:
+            offset = f.tell()
+            f.write(line)
+        self._offsets.append(offset)
+        self._end = offset + len(line)
+        self._times.append(taken_at)
+        self._apply(self._state, delta)
+
+        if len(self._offsets) % CHECKPOINT_EVERY == 0:
+            path = self.checkpoint_dir / f"{len(self._offsets):08d}.json"
+            with open(path, "w") as f:
+                json.dump(self._state, f, separators=(",", ":"))
+
+        return {"changed": len(ids), "removed": len(removed)}
+
+    # =========================
+    # QUERIES
+    # =========================
+    @_synced()
+    def current(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of the latest property state."""
+        return {pid: dict(state) for pid, state in self._state.items()}
+
+    @_synced()
+    def state_of(self, property_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of one property's latest state, or None if unknown."""
+        state = self._state.get(property_id)
+        return dict(state) if state is not None else None
+
+    @_synced()
+    def as_of(self, when: datetime) -> Dict[str, Dict[str, Any]]:
+        """Return the property state as it stood at ``when``."""
+        count = bisect_right(self._times, _utc(when))
+        if count == len(self._offsets):
+            return self.current()
+        return self._replay(count)
+
+    @_synced()
+    def became_distressed(self,
+                          since: datetime,
+                          until: Optional[datetime] = None,
+                          threshold: float = DISTRESS_THRESHOLD) -> Dict[str, datetime]:
+        """
+        Find properties that crossed into distress within a time window.
+
+        Args:
+            since: Window start (exclusive)
+            until: Window end (inclusive, defaults to now)
+            threshold: Distress score threshold
+
+        Returns:
+            Mapping of property id to the snapshot time it first became distressed
+        """
+        since, until = _utc(since), _utc(until)
+        start = bisect_right(self._times, since)
+        stop = bisect_right(self._times, until)
+        state = self._replay(start)
+        crossed: Dict[str, datetime] = {}
+        for delta in self._read(start, stop):
+            before = {pid: is_distressed(state.get(pid), threshold) for pid in delta.get("ids", [])}
+            self._apply(state, delta)
+            for pid, was in before.items():
+                if not was and pid not in crossed and is_distressed(state.get(pid), threshold):
+                    crossed[pid] = datetime.fromisoformat(delta["ts"])
+        return crossed
+
+    @_synced()
+    def trend(self,
+              start: datetime,
+              end: Optional[datetime] = None,
+              bucket: timedelta = timedelta(days=1),
+              field: str = "distress_score",
+              threshold: float = DISTRESS_THRESHOLD) -> List[Dict[str, Any]]:
+        """
+        Summarize state at the close of each time bucket in ``[start, end]``.
+
+        When ``start == end`` the result is the single point at that time.
+
+        Returns:
+            One row per bucket with property count, distressed count and mean ``field``
+        """
+        start, end = _utc(start), _utc(end)
+        if bucket <= timedelta(0):
+            raise ValueError("bucket must be a positive timedelta")
+
+        edges = [end] if start == end else []
+        edge = start
+        while edge < end:
+            edge = min(edge + bucket, end)
+            edges.append(edge)
+
+        rows = []
+        count = bisect_right(self._times, start)
+        state = self._replay(count)
+        for edge in edges:
+            stop = bisect_right(self._times, edge)
+            for delta in self._read(count, stop):
+                self._apply(state, delta)
+            count = stop
+            values = [float(s[field]) for s in state.values() if s.get(field) is not None]
+            rows.append({
+                "until": edge,
+                "properties": len(state),
+                "distressed": sum(1 for s in state.values() if is_distressed(s, threshold)),
+                f"mean_{field}": sum(values) / len(values) if values else None,
+            })
+        return rows
+
+    @_synced()
+    def series(self, property_id: str, field: str = "distress_score") -> List[Tuple[datetime, Any]]:
+        """Return the ``(time, value)`` change points of one property field."""
+        points = []
+        for delta in self._read(0, len(self._offsets)):
+            ids = delta.get("ids", [])
+            if property_id in delta.get("removed", []):
+                points.append((datetime.fromisoformat(delta["ts"]), None))
+                continue
+            if property_id not in ids:
+                continue
+            row = ids.index(property_id)
+            for entry_row, value in delta.get("cols", {}).get(field, []):
+                if entry_row == row:
+                    points.append((datetime.fromisoformat(delta["ts"]), value))
+        return points
+
+
+# =========================
+# VERSIONED REPORT ARTIFACTS
+# =========================
+def new_run_id(when: Optional[datetime] = None) -> str:
+    """Return a sortable run identifier, e.g. ``20250101T120000Z-3f9a``."""
+    return f"{_utc(when).strftime('%Y%m%dT%H%M%SZ')}-{os.urandom(2).hex()}"
+
+
+def publish_run_reports(run_id: str, results_dir: str = "results") -> List[Path]:
+    """
+    Copy a run's reports from ``results/runs/<run_id>/`` to ``results/`` as the latest
+    version and record the run in ``results/runs/index.jsonl``.
+
+    Returns:
+        Paths of the published report copies
+    """
+    results = Path(results_dir)
+    run_dir = results / "runs" / run_id
+    if not run_dir.is_dir():
+        return []
+    published = []
+    for report in sorted(run_dir.glob("*.md")):
+        target = results / report.name
+        shutil.copyfile(report, target)
+        published.append(target)
+    with open(results / "runs" / "index.jsonl", "a") as f:
+        f.write(json.dumps({
+            "run_id": run_id,
+            "published_at": _utc().isoformat(),
+            "reports": [p.name for p in published],
+        }) + "\n")
+    return published
@@ -0,0 +1,371 @@
+"""
+Durable crew job queue stored in SQLite (WAL mode).
+Workers lease jobs, keep leases alive with heartbeats, and either complete
+them or fail them into a retry with exponential backoff. Jobs that run out
+of attempts are dead-lettered. Every state change is fenced by the lease
+token, so a worker whose lease expired cannot overwrite the job's new owner.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from .logs import report
+
+DEFAULT_DB = os.getenv("GANGSHIT_QUEUE_DB", "data/jobs.sqlite")
+LEASE_SECONDS = float(os.getenv("GANGSHIT_QUEUE_LEASE", "120"))
+BACKOFF_BASE = float(os.getenv("GANGSHIT_QUEUE_BACKOFF", "30"))
+BACKOFF_MAX = 3600.0
+HEARTBEAT_RETRY = 1.0
+_LEASE_LOST: "contextvars.ContextVar[Optional[threading.Event]]" = contextvars.ContextVar("lease_lost", default=None)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    result TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+"""
+
+
+class Lease(NamedTuple):
+    job_id: int
+    token: str
+    payload: Dict[str, Any]
+    attempt: int
+
+
+class LeaseLost(RuntimeError):
+    """The worker could not renew its lease; another worker may already own the job."""
+
+
+def check_lease() -> None:
+    """
+    Raise ``LeaseLost`` if the job running in this context lost its lease.
+
+    Handlers call this at safe points (e.g. from a crew step callback) so a job
+    whose lease could not be renewed stops instead of running alongside its new owner.
+    """
+    lost = _LEASE_LOST.get()
+    if lost is not None and lost.is_set():
+        raise LeaseLost("lease could not be renewed")
+
+
+class JobQueue:
+    """SQLite-backed work queue safe to share between processes and machines on one filesystem."""
+
+    def __init__(self, path: Optional[str] = None, lease_seconds: float = LEASE_SECONDS,
+                 backoff_base: float = BACKOFF_BASE):
+        """
+        Args:
+            path: SQLite database file
+            lease_seconds: How long a lease lasts without a heartbeat
+            backoff_base: First retry delay in seconds, doubled per attempt
+        """
+        self.path = Path(path or DEFAULT_DB)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.backoff_base = backoff_base
+        self._local = threading.local()
+        with self._db() as db:
+            db.executescript(_SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        """One autocommit connection per thread; transactions are opened explicitly."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA busy_timeout=30000")
+            self._local.db = db
+        return db
+
+    def _transaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run ``fn`` inside ``BEGIN IMMEDIATE`` so concurrent leasers serialize."""
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(db)
+            db.execute("COMMIT")
+            return result
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    # =========================
+    # PRODUCERS
+    # =========================
+    def enqueue(self, payload: Dict[str, Any], key: Optional[str] = None,
+                max_attempts: int = 5, delay: float = 0.0) -> Optional[int]:
+        """
+        Add a job. A repeated ``key`` is ignored, so producers can retry safely.
+
+        Returns:
+            The new job id, or None if a job with ``key`` already exists
+        """
+        now = time.time()
+        cursor = self._db().execute(
+            "INSERT OR IGNORE INTO jobs (key, payload, max_attempts, available_at, created, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, json.dumps(payload), max_attempts, now + delay, now, now),
+        )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    # =========================
+    # WORKERS
+    # =========================
+    def lease(self, owner: str) -> Optional[Lease]:
+        """Claim the oldest ready job, reclaiming expired leases; dead-letter jobs out of attempts."""
+        def claim(db):
+            now = time.time()
+            while True:
+                row = db.execute(
+                    "SELECT id, payload, attempts, max_attempts FROM jobs "
+                    "WHERE (status = 'queued' AND available_at <= ?) "
+                    "   OR (status = 'leased' AND lease_expires < ?) "
+                    "ORDER BY available_at, id LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                job_id, payload, attempts, max_attempts = row
+                if attempts >= max_attempts:
+                    db.execute(
+                        "UPDATE jobs SET status = 'dead', lease_token = NULL, updated = ?, "
+                        "last_error = COALESCE(last_error, 'lease expired') WHERE id = ?",
+                        (now, job_id),
+                    )
+                    continue
+                token = uuid.uuid4().hex
+                db.execute(
+                    "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                    "lease_token = ?, lease_expires = ?, updated = ? WHERE id = ?",
+                    (owner, token, now + self.lease_seconds, now, job_id),
+                )
+                return Lease(job_id, token, json.loads(payload), attempts + 1)
+        return self._transaction(claim)
+
+    def heartbeat(self, lease: Lease) -> bool:
+        """Extend a lease. Returns False if the lease was lost to another worker."""
+        now = time.time()
+        cursor = self._db().execute(
+            "UPDATE jobs SET lease_expires = ?, updated = ? WHERE id = ? AND lease_token = ? AND status = 'leased'",
+            (now + self.lease_seconds, now, lease.job_id, lease.token),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, lease: Lease, result: Any = None) -> bool:
+        """Mark a job done. Returns False (and changes nothing) if the lease is no longer held."""
+        cursor = self._db().execute(
+            "UPDATE jobs SET status = 'done', result = ?, lease_token = NULL, updated = ? "
+            "WHERE id = ? AND lease_token = ? AND status = 'leased'",
+            (None if result is None else str(result), time.time(), lease.job_id, lease.token),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, lease: Lease, error: str) -> Optional[str]:
+        """
+        Record a failed attempt: retry after an exponential backoff with jitter,
+        or dead-letter once ``max_attempts`` is used up.
+
+        Returns:
+            The new status ('queued' or 'dead'), or None if the lease was lost
+        """
+        def record(db):
+            now = time.time()
+            row = db.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_token = ? AND status = 'leased'",
+                (lease.job_id, lease.token),
+            ).fetchone()
+            if row is None:
+                return None
+            attempts, max_attempts = row
+            status = "dead" if attempts >= max_attempts else "queued"
+            delay = min(self.backoff_base * 2 ** (attempts - 1), BACKOFF_MAX) * random.uniform(0.8, 1.2)
+            db.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_token = NULL, "
+                "updated = ? WHERE id = ?",
+                (status, now + delay, error, now, lease.job_id),
+            )
+            return status
+        return self._transaction(record)
+
+    # =========================
+    # ADMIN
+    # =========================
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        db = self._db()
+        db.row_factory = sqlite3.Row
+        try:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            db.row_factory = None
+        return dict(row) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._db().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        ids = [r[0] for r in self._db().execute("SELECT id FROM jobs WHERE status = 'dead' ORDER BY id")]
+        return [self.get(job_id) for job_id in ids]
+
+    def requeue(self, job_id: int, extra_attempts: int = 1) -> bool:
+        """Give a dead-lettered job more attempts and make it ready again."""
+        cursor = self._db().execute(
+            "UPDATE jobs SET status = 'queued', max_attempts = attempts + ?, available_at = ?, updated = ? "
+            "WHERE id = ? AND status = 'dead'",
+            (extra_attempts, time.time(), time.time(), job_id),
+        )
+        return cursor.rowcount == 1
+
+
+def default_owner() -> str:
+    """Worker identity: host and pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_worker(queue: JobQueue,
+               handler: Callable[[Dict[str, Any]], Any],
+               owner: Optional[str] = None,
+               poll_interval: float = 2.0,
+               stop: Optional[threading.Event] = None,
+               exit_when_idle: bool = False) -> int:
+    """
+    Lease and process jobs until ``stop`` is set (or the queue is idle, if requested).
+
+    A heartbeat thread keeps the lease alive while ``handler`` runs, retrying
+    transient SQLite errors with backoff. If the lease cannot be renewed before
+    it expires, ``check_lease()`` starts raising ``LeaseLost`` in the handler and
+    the job is neither completed nor failed, so it is left to the next leaser.
+
+    Returns:
+        Number of jobs completed by this worker
+    """
+    owner = owner or default_owner()
+    stop = stop or threading.Event()
+    completed = 0
+    while not stop.is_set():
+        lease = queue.lease(owner)
+        if lease is None:
+            if exit_when_idle:
+                break
+            stop.wait(poll_interval)
+            continue
+
+        done, lost = threading.Event(), threading.Event()
+
+        def beat(lease=lease):
+            interval = queue.lease_seconds / 3
+            deadline = time.time() + queue.lease_seconds
+            wait, retries = interval, 0
+            while not done.wait(wait):
+                attempted = time.time()
+                try:
+                    held = queue.heartbeat(lease)
+                except sqlite3.OperationalError as e:
+                    # e.g. "database is locked": retry with backoff while the current lease still runs
+                    remaining = deadline - time.time()
+                    if remaining > 0:
+                        retries += 1
+                        wait = min(HEARTBEAT_RETRY * 2 ** (retries - 1), remaining / 2)
+                        report("queue", f"⚠️ Heartbeat for job {lease.job_id} failed ({e}), retrying",
+                               logging.WARNING, job_id=lease.job_id, retries=retries)
+                        continue
+                    held = False
+                if held:
+                    deadline, wait, retries = attempted + queue.lease_seconds, interval, 0
+                    continue
+                lost.set()
+                report("queue", f"⚠️ Lost lease on job {lease.job_id}", logging.WARNING, job_id=lease.job_id)
+                return
+
+        heart = threading.Thread(target=beat, daemon=True)
+        heart.start()
+        token = _LEASE_LOST.set(lost)
+        try:
+            result = handler(lease.payload)
+        except Exception as e:
+            if lost.is_set():
+                report("queue", f"🛑 Job {lease.job_id} stopped after losing its lease", logging.WARNING,
+                       job_id=lease.job_id, attempt=lease.attempt)
+            else:
+                status = queue.fail(lease, f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=5)}")
+                report("queue", f"❌ Job {lease.job_id} attempt {lease.attempt} failed -> {status}", logging.ERROR,
+                       job_id=lease.job_id, attempt=lease.attempt, status=status)
+        else:
+            if lost.is_set():
+                report("queue", f"🛑 Discarding result of job {lease.job_id}: lease was lost", logging.WARNING,
+                       job_id=lease.job_id, attempt=lease.attempt)
+            elif queue.complete(lease, result):
+                completed += 1
+        finally:
+            _LEASE_LOST.reset(token)
+            done.set()
+            heart.join()
+    return completed
+
+
+def _pool_process(handler_factory: Callable[[], Callable[[Dict[str, Any]], Any]], path: str) -> None:
+    import signal
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    queue = JobQueue(path)
+    handler = handler_factory()  # built once per process so the crew stays warm
+    try:
+        completed = run_worker(queue, handler, stop=stop)
+    except KeyboardInterrupt:
+        return
+    report("queue", f"🛑 Worker {default_owner()} stopped after {completed} jobs", completed=completed)
+
+
+def run_worker_pool(handler_factory: Callable[[], Callable[[Dict[str, Any]], Any]],
+                    processes: int = 1,
+                    path: Optional[str] = None) -> None:
+    """
+    Run ``processes`` worker processes against the queue until interrupted.
+
+    Args:
+        handler_factory: Picklable callable, run in each process, returning the job handler
+        processes: Worker processes on this machine (other machines may run their own pools)
+        path: SQLite database file
+    """
+    import multiprocessing
+
+    path = str(path or DEFAULT_DB)
+    JobQueue(path)  # create the schema once before the workers race for it
+    workers = [multiprocessing.Process(target=_pool_process, args=(handler_factory, path), daemon=False)
+               for _ in range(processes)]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+        for process in workers:
+            process.join()
@@ -0,0 +1,209 @@
+"""
+Quiet production logging.
+With ``GANGSHIT_LOG_MODE=quiet`` the crew and agents run with ``verbose=False``
+and status messages become one-line JSON records. Records go through a bounded
+queue to a background writer, so a slow stdout never blocks a run; when the
+queue is full, records are dropped and counted instead. Long payloads are
+truncated, and chatty components can be sampled and given their own levels.
+The default ``verbose`` mode keeps the existing console output.
+
+    GANGSHIT_LOG_MODE=quiet
+    GANGSHIT_LOG_LEVELS=crew=INFO,events=WARNING
+    GANGSHIT_LOG_SAMPLE=events=0.1
+    GANGSHIT_LOG_MAX_CHARS=500
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, TextIO
+
+ROOT = "gangshit"
+QUEUE_SIZE = int(os.getenv("GANGSHIT_LOG_QUEUE", "10000"))
+MAX_CHARS = int(os.getenv("GANGSHIT_LOG_MAX_CHARS", "500"))
+NOISY_LOGGERS = ("LiteLLM", "litellm", "httpx", "httpcore", "urllib3")
+
+_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_handler: Optional["BoundedQueueHandler"] = None
+_pid = os.getpid()
+
+
+def quiet_mode() -> bool:
+    """True when ``GANGSHIT_LOG_MODE`` is ``quiet`` (or ``json``)."""
+    return os.getenv("GANGSHIT_LOG_MODE", "verbose").strip().lower() in ("quiet", "json")
+
+
+def _pairs(spec: str) -> Dict[str, str]:
+    """Parse ``a=1,b=2`` into a dict."""
+    return dict(item.split("=", 1) for item in spec.replace(" ", "").split(",") if "=" in item)
+
+
+def truncate(value: Any, limit: int = MAX_CHARS) -> Any:
+    """Shorten long strings, and long strings nested in lists and dicts."""
+    if isinstance(value, str):
+        return value if len(value) <= limit else f"{value[:limit]}…[+{len(value) - limit} chars]"
+    if isinstance(value, dict):
+        return {k: truncate(v, limit) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [truncate(v, limit) for v in value[:20]]
+        return items + [f"…[+{len(value) - 20} items]"] if len(value) > 20 else items
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    return truncate(str(value), limit)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, component, msg and any ``fields``."""
+
+    def __init__(self, max_chars: int = MAX_CHARS):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "component": record.name[len(ROOT) + 1:] if record.name.startswith(ROOT + ".") else record.name,
+            "msg": truncate(record.getMessage(), self.max_chars),
+        }
+        entry.update(truncate(getattr(record, "fields", None) or {}, self.max_chars))
+        if record.exc_info:
+            entry["exc"] = truncate(self.formatException(record.exc_info), self.max_chars * 4)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SampleFilter(logging.Filter):
+    """Keep a fraction of each component's records below WARNING."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._seen: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        component = record.name[len(ROOT) + 1:].split(".")[0]
+        rate = self.rates.get(component, 1.0)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        count = self._seen.get(component, 0)
+        self._seen[component] = count + 1
+        return count % max(1, round(1 / rate)) == 0
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks: records beyond the queue bound are dropped and counted.
+    Payloads are truncated before they are queued, so the bound also caps memory.
+    """
+
+    def __init__(self, log_queue: "queue.Queue", max_chars: int = MAX_CHARS):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # JSON formatting happens in the writer thread; resolve %-args and cut payloads here
+        record.msg, record.args = truncate(record.getMessage(), self.max_chars), None
+        if getattr(record, "fields", None):
+            record.fields = truncate(record.fields, self.max_chars)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(stream: Optional[TextIO] = None, force: bool = False) -> Optional[BoundedQueueHandler]:
+    """
+    Install the quiet-mode pipeline on the ``gangshit`` logger (no-op in verbose mode).
+
+    Args:
+        stream: Where JSON lines go (default ``GANGSHIT_LOG_FILE`` or stderr)
+        force: Replace an existing configuration, e.g. after changing the env
+
+    Returns:
+        The queue handler (its ``dropped`` counter reports back-pressure), or None
+    """
+    global _listener, _handler, _pid
+    with _lock:
+        if _pid != os.getpid():  # forked worker: the writer thread stayed in the parent
+            _listener = _handler = None
+            _pid = os.getpid()
+        if _handler is not None and not force:
+            return _handler
+        _shutdown()
+        if not quiet_mode():
+            return None
+        if stream is None and os.getenv("GANGSHIT_LOG_FILE"):
+            writer: logging.Handler = logging.FileHandler(os.environ["GANGSHIT_LOG_FILE"])
+        else:
+            writer = logging.StreamHandler(stream or sys.stderr)
+        max_chars = int(os.getenv("GANGSHIT_LOG_MAX_CHARS", str(MAX_CHARS)))
+        writer.setFormatter(JsonFormatter(max_chars))
+
+        log_queue: "queue.Queue" = queue.Queue(maxsize=int(os.getenv("GANGSHIT_LOG_QUEUE", str(QUEUE_SIZE))))
+        _handler = BoundedQueueHandler(log_queue, max_chars)
+        _handler.addFilter(SampleFilter({k: float(v) for k, v in _pairs(os.getenv("GANGSHIT_LOG_SAMPLE", "")).items()}))
+        _listener = QueueListener(log_queue, writer, respect_handler_level=False)
+        _listener.start()
+
+        root = logging.getLogger(ROOT)
+        root.handlers = [_handler]
+        root.propagate = False
+        root.setLevel(os.getenv("GANGSHIT_LOG_LEVEL", "INFO").upper())
+        for component, level in _pairs(os.getenv("GANGSHIT_LOG_LEVELS", "")).items():
+            logging.getLogger(f"{ROOT}.{component}").setLevel(level.upper())
+        for name in NOISY_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+        return _handler
+
+
+def _shutdown() -> None:
+    global _listener, _handler
+    while _listener is not None:
+        try:
+            _listener.stop()  # drains the queue
+            break
+        except queue.Full:  # no room for the stop sentinel yet
+            time.sleep(0.01)
+    if _handler is not None:
+        logging.getLogger(ROOT).removeHandler(_handler)
+    _listener = _handler = None
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and detach the pipeline."""
+    with _lock:
+        _shutdown()
+
+
+atexit.register(shutdown_logging)
+
+
+def report(component: str, message: str, level: int = logging.INFO, **fields: Any) -> None:
+    """
+    Status output for ``component``: printed as before in verbose mode, a
+    structured record in quiet mode.
+    """
+    if not quiet_mode():
+        print(message)
+        return
+    if _handler is None or _pid != os.getpid():
+        configure_logging()
+    message = re.sub(r"^[^\w\[(]+", "", message)  # drop the console emoji
+    logging.getLogger(f"{ROOT}.{component}").log(level, message, extra={"fields": fields} if fields else None)
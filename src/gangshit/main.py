@@ -3,17 +3,37 @@
 Main entry point for the Gangshit CrewAI project.
 This file should be used as the primary entry point for the application.
 """
+import logging
+import os
 import sys
 import warnings
 from datetime import datetime
 from .crew import Gangshit
+from .logs import configure_logging, quiet_mode, report
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+def _profile_flag():
+    """Turn ``--profile[=trace|cprofile|py-spy]`` into GANGSHIT_PROFILE and drop it from argv."""
+    for arg in list(sys.argv[1:]):
+        if arg == "--profile" or arg.startswith("--profile="):
+            os.environ["GANGSHIT_PROFILE"] = arg.partition("=")[2] or "trace"
+            sys.argv.remove(arg)
+
+def _option(name):
+    """Pop ``--name=value`` from argv and return the value (None when absent)."""
+    for arg in list(sys.argv[1:]):
+        if arg.startswith(f"--{name}="):
+            sys.argv.remove(arg)
+            return arg.partition("=")[2]
+    return None
+
 def run():
     """
     Run the crew with comprehensive error handling.
+    Pass --profile (or set GANGSHIT_PROFILE) to write results/runs/<run_id>/trace.json.
     """
+    _profile_flag()
     inputs = {
         'topic': """Build a cross-platform desktop application that trains powerful ML and RL models to predict forex currency pair movements (e.g. EUR/USD, GBP/JPY), visualizes training and backtesting metrics, supports backtesting on historical data, provides explanatory tooltips suitable for both beginners and experts, and enables model export for real-world deployment.""",
         'requirements': [
@@ -28,37 +48,46 @@ def run():
     }
     
     try:
-        print("🚀 Starting Gangshit crew...")
+        configure_logging()
+        report("main", "🚀 Starting Gangshit crew...")
         crew = Gangshit().gangshit_crew()
         result = crew.kickoff(inputs=inputs)
-        print("✅ Crew execution completed!")
-        print(f"📊 Result: {result}")
+        report("main", "✅ Crew execution completed!")
+        report("main", f"📊 Result: {result}")
         return result
     except ImportError as e:
-        print(f"❌ Import Error: {e}")
-        print("💡 Try: pip install -r requirements.txt")
+        report("main", f"❌ Import Error: {e}", logging.ERROR)
+        report("main", "💡 Try: pip install -r requirements.txt", logging.ERROR)
         return None
     except FileNotFoundError as e:
-        print(f"❌ File Not Found: {e}")
-        print("💡 Check configuration files in src/gangshit/config/")
+        report("main", f"❌ File Not Found: {e}", logging.ERROR)
+        report("main", "💡 Check configuration files in src/gangshit/config/", logging.ERROR)
         return None
     except Exception as e:
-        print(f"❌ Unexpected Error: {e}")
-        print(f"🔍 Error Type: {type(e).__name__}")
-        import traceback
-        traceback.print_exc()
+        report("main", f"❌ Unexpected Error: {e}", logging.ERROR, error_type=type(e).__name__)
+        if not quiet_mode():
+            print(f"🔍 Error Type: {type(e).__name__}")
+            import traceback
+            traceback.print_exc()
         return None
 
 def train():
     """
     Train the crew for a given number of iterations.
+    Training asks for human feedback on every iteration, so iterations stay sequential;
+    set GANGSHIT_EVAL_REUSE_UPSTREAM=1 to run research once and reuse it across iterations.
     """
     inputs = {
         "topic": "AI LLMs",
         'current_year': str(datetime.now().year)
     }
     try:
-        Gangshit().gangshit_crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+        gangshit = Gangshit()
+        if os.getenv("GANGSHIT_EVAL_REUSE_UPSTREAM", "0") == "1":
+            # Research output is identical across iterations; run it once and reuse it
+            from .evaluation import cached_research
+            gangshit.research_brief = cached_research(inputs)
+        gangshit.gangshit_crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while training the crew: {e}")
 
@@ -74,16 +103,108 @@ def replay():
 def test():
     """
     Test the crew execution and returns the results.
+    Usage: test <n_iterations> <eval_llm> [workers] [--profile]
+    With more than one worker, iterations run in parallel processes and an
+    aggregated report is written to results/evaluation_<timestamp>.md.
     """
     inputs = {
         "topic": "AI LLMs",
         "current_year": str(datetime.now().year)
     }
+    _profile_flag()
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
     
     try:
+        if workers > 1:
+            from .evaluation import parallel_test
+            return parallel_test(
+                n_iterations=int(sys.argv[1]),
+                eval_llm=sys.argv[2],
+                inputs=inputs,
+                workers=workers,
+                reuse_upstream=os.getenv("GANGSHIT_EVAL_REUSE_UPSTREAM", "1") == "1",
+            )
         Gangshit().gangshit_crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
 
+def serve():
+    """
+    Run the crew as a long-lived service with warm crews and a job queue.
+    Usage: serve [port] [workers] [--profile]
+    """
+    from .service import DEFAULT_WORKERS, run_service
+
+    _profile_flag()
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WORKERS
+    configure_logging()
+    try:
+        run_service(port=port, workers=workers)
+    except KeyboardInterrupt:
+        report("service", "🛑 Service stopped")
+
+def _crew_job_handler():
+    """Build one warm crew per worker process and return the job handler."""
+    from .job_queue import check_lease
+
+    crew = Gangshit().gangshit_crew()
+    crew.step_callback = lambda step: check_lease()  # stop between agent steps once the lease is lost
+
+    def handle(payload):
+        return str(crew.kickoff(inputs=payload["inputs"]))
+    return handle
+
+def enqueue():
+    """
+    Queue a crew run for the workers.
+    Usage: enqueue <topic> [idempotency_key]
+    """
+    from .job_queue import JobQueue
+
+    inputs = {
+        "topic": sys.argv[1],
+        "current_year": str(datetime.now().year)
+    }
+    job_id = JobQueue().enqueue({"inputs": inputs}, key=sys.argv[2] if len(sys.argv) > 2 else None)
+    report("queue", f"📥 Queued job {job_id}" if job_id else "ℹ️ A job with that key is already queued", job_id=job_id)
+    return job_id
+
+def ingest():
+    """
+    Record a listings file in the property history and refresh data/aggregates.json and data/properties.
+    Usage: ingest <records.csv|.jsonl|.json> [--complete] [--ranges=<csv>] [--points=<csv>] [--geocode-cache=<sqlite>]
+    With --ranges and/or --points, records without lat/lon are geocoded from their address first.
+    """
+    from .aggregates import ingest_file
+    from .geocoder import Geocoder, load_gazetteer
+
+    ranges, points, cache = _option("ranges"), _option("points"), _option("geocode-cache")
+    complete = "--complete" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--complete"]
+    configure_logging()
+    geocoder = Geocoder(load_gazetteer(ranges, points), cache_path=cache) if ranges or points else None
+    try:
+        counts = ingest_file(args[0], complete=complete, geocoder=geocoder)
+    finally:
+        if geocoder is not None:
+            geocoder.close()
+    report("ingest", f"📥 Ingested {counts['records']} records: {counts['changed']} changed, "
+                     f"{counts['removed']} removed", **counts)
+    return counts
+
+def worker():
+    """
+    Pull crew runs from the SQLite job queue.
+    Usage: worker [processes] [--profile]
+    """
+    from .job_queue import run_worker_pool
+
+    _profile_flag()
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    configure_logging()
+    report("queue", f"👷 Starting {processes} queue worker process(es)", processes=processes)
+    run_worker_pool(_crew_job_handler, processes=processes)
+
 if __name__ == "__main__":
     run()
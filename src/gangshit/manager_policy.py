@@ -0,0 +1,212 @@
+"""
+Manager policy for the hierarchical process.
+When every task already names its agent, the order and assignee of each step
+are fixed by tasks.yaml and the manager LLM adds nothing but delegation
+round-trips, so the crew runs those tasks directly. Otherwise the manager is
+kept but capped in rounds and tokens per task. A ledger on the event bus
+records how many LLM calls and seconds went to management versus work. Like
+the trace profiler, a ledger started for a run only counts that run's events.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from crewai import Agent, Process
+from crewai.utilities import I18N
+
+from .profiling import DELEGATION_TOOLS, current_run
+
+try:
+    from crewai.events import (
+        BaseEventListener,
+        LLMCallCompletedEvent,
+        LLMCallFailedEvent,
+        LLMCallStartedEvent,
+        ToolUsageStartedEvent,
+    )
+except ImportError:  # crewai < 0.177
+    from crewai.utilities.events import (
+        LLMCallCompletedEvent,
+        LLMCallFailedEvent,
+        LLMCallStartedEvent,
+        ToolUsageStartedEvent,
+    )
+    from crewai.utilities.events.base_event_listener import BaseEventListener
+
+MANAGER_MODES = ("auto", "capped", "full")
+MAX_ROUNDS = int(os.getenv("GANGSHIT_MANAGER_MAX_ROUNDS", "3"))
+MAX_TOKENS = int(os.getenv("GANGSHIT_MANAGER_MAX_TOKENS", "3000"))
+
+
+def manager_mode() -> str:
+    """``GANGSHIT_MANAGER_MODE``: auto (default), capped or full (crewAI's unbounded manager)."""
+    mode = os.getenv("GANGSHIT_MANAGER_MODE", "auto").strip().lower()
+    return mode if mode in MANAGER_MODES else "auto"
+
+
+def steps_determined(tasks: List[Any]) -> bool:
+    """True when every task has an assigned agent, so nothing is left for the manager to decide."""
+    return bool(tasks) and all(getattr(task, "agent", None) is not None for task in tasks)
+
+
+def budgeted_manager(llm: Any, max_rounds: int = MAX_ROUNDS, max_tokens: int = MAX_TOKENS) -> Agent:
+    """
+    crewAI's default manager agent with per-task limits.
+
+    Each task gets at most ``max_rounds`` manager iterations (one LLM call each,
+    delegations included) and ``max_tokens`` completion tokens split across them.
+    """
+    i18n = I18N()
+    capped = copy.copy(llm)
+    capped.max_tokens = max(64, max_tokens // max(1, max_rounds))
+    return Agent(
+        role=i18n.retrieve("hierarchical_manager_agent", "role"),
+        goal=i18n.retrieve("hierarchical_manager_agent", "goal"),
+        backstory=i18n.retrieve("hierarchical_manager_agent", "backstory"),
+        llm=capped,
+        allow_delegation=True,
+        max_iter=max_rounds,
+        verbose=False,
+    )
+
+
+def process_kwargs(tasks: List[Any], manager_llm: Any, mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    ``Crew`` keyword arguments for the process and manager under the policy.
+
+    Args:
+        tasks: The crew's tasks
+        manager_llm: LLM the manager would use
+        mode: ``auto``, ``capped`` or ``full`` (defaults to ``manager_mode()``)
+    """
+    mode = mode or manager_mode()
+    if mode == "full":
+        return {"process": Process.hierarchical, "manager_llm": manager_llm}
+    if mode == "auto" and steps_determined(tasks):
+        return {"process": Process.sequential}
+    return {"process": Process.hierarchical, "manager_agent": budgeted_manager(manager_llm)}
+
+
+# =========================
+# ACCOUNTING
+# =========================
+class ManagementLedger:
+    """LLM calls, seconds and delegations per task, split into management and work."""
+
+    def __init__(self, manager_role: Optional[str] = None, run_id: Optional[str] = None):
+        """
+        Args:
+            manager_role: Role whose LLM calls count as management (crewAI's manager by default)
+            run_id: Only count events bound to this run (see ``profiling.bind_run``); None counts all
+        """
+        self.manager_role = manager_role or I18N().retrieve("hierarchical_manager_agent", "role")
+        self.run_id = run_id
+        self.tasks: Dict[str, Dict[str, float]] = {}
+        self._open: Dict[int, List[tuple]] = {}
+        self._lock = threading.Lock()
+
+    def _row(self, task: Optional[str]) -> Dict[str, float]:
+        return self.tasks.setdefault(task or "unknown", {
+            "management_calls": 0, "management_seconds": 0.0, "management_tokens_est": 0,
+            "work_calls": 0, "work_seconds": 0.0, "delegations": 0})
+
+    def llm_started(self, role: Optional[str], task: Optional[str]) -> None:
+        with self._lock:
+            self._open.setdefault(threading.get_ident(), []).append((role, task, time.perf_counter()))
+
+    def llm_finished(self, response: Any = None) -> None:
+        with self._lock:
+            stack = self._open.get(threading.get_ident())
+            if not stack:
+                return
+            role, task, started = stack.pop()
+            kind = "management" if role == self.manager_role else "work"
+            row = self._row(task)
+            row[f"{kind}_calls"] += 1
+            row[f"{kind}_seconds"] += time.perf_counter() - started
+            if kind == "management" and response is not None:
+                row["management_tokens_est"] += len(str(response)) // 4
+
+    def delegated(self, task: Optional[str]) -> None:
+        with self._lock:
+            self._row(task)["delegations"] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            totals: Dict[str, float] = {}
+            for row in self.tasks.values():
+                for key, value in row.items():
+                    totals[key] = totals.get(key, 0) + value
+            calls = totals.get("management_calls", 0) + totals.get("work_calls", 0)
+            seconds = totals.get("management_seconds", 0.0) + totals.get("work_seconds", 0.0)
+            return {
+                "tasks": {name: dict(row) for name, row in self.tasks.items()},
+                "totals": totals,
+                "management_share_calls": totals.get("management_calls", 0) / calls if calls else 0.0,
+                "management_share_seconds": totals.get("management_seconds", 0.0) / seconds if seconds else 0.0,
+            }
+
+    def start(self) -> "ManagementLedger":
+        _listener()
+        with _ACTIVE_LOCK:
+            _ACTIVE.append(self)
+        return self
+
+    def stop(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """Detach and return the summary, also writing it to ``path`` when given."""
+        with _ACTIVE_LOCK:
+            if self in _ACTIVE:
+                _ACTIVE.remove(self)
+        summary = self.summary()
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(json.dumps(summary, indent=2))
+        return summary
+
+
+_ACTIVE: List[ManagementLedger] = []
+_ACTIVE_LOCK = threading.Lock()
+_LISTENER = None
+
+
+def _each(method: str, *args: Any) -> None:
+    run_id = current_run()
+    with _ACTIVE_LOCK:
+        active = [ledger for ledger in _ACTIVE if ledger.run_id is None or ledger.run_id == run_id]
+    for ledger in active:
+        getattr(ledger, method)(*args)
+
+
+class LedgerListener(BaseEventListener):
+    """Routes LLM and delegation events to every started ``ManagementLedger``."""
+
+    def setup_listeners(self, crewai_event_bus):
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def on_llm_started(source, event):
+            _each("llm_started", event.agent_role, event.task_name)
+
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def on_llm_completed(source, event):
+            _each("llm_finished", event.response)
+
+        @crewai_event_bus.on(LLMCallFailedEvent)
+        def on_llm_failed(source, event):
+            _each("llm_finished")
+
+        @crewai_event_bus.on(ToolUsageStartedEvent)
+        def on_tool_started(source, event):
+            if event.tool_name.lower() in DELEGATION_TOOLS:
+                _each("delegated", event.task_name)
+
+
+def _listener() -> LedgerListener:
+    """Register the bus handlers once per process."""
+    global _LISTENER
+    if _LISTENER is None:
+        _LISTENER = LedgerListener()
+    return _LISTENER
@@ -0,0 +1,292 @@
+"""
+Bounded local storage for crewAI memory.
+Texts and metadata live in SQLite; unit-normalized embeddings live in a
+memory-mapped float32 file so search is one matrix-vector product over the
+live slots. Entries expire after a TTL, the least recently used entries are
+evicted past ``max_items``, and a background thread compacts the vector file
+once enough slots are dead. Slot allocation, vector writes, searches and
+compaction run inside SQLite write transactions, so worker processes can share one directory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from crewai.memory.storage.interface import Storage
+from crewai.memory.storage.ltm_sqlite_storage import LTMSQLiteStorage
+
+from .logs import report
+
+MEMORY_DIR = os.getenv("GANGSHIT_MEMORY_DIR", "data/memory")
+MAX_ITEMS = int(os.getenv("GANGSHIT_MEMORY_MAX_ITEMS", "5000"))
+TTL_SECONDS = float(os.getenv("GANGSHIT_MEMORY_TTL", str(30 * 86400)))
+COMPACT_RATIO = 0.5
+COMPACT_INTERVAL = float(os.getenv("GANGSHIT_MEMORY_COMPACT_INTERVAL", "300"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    slot INTEGER NOT NULL UNIQUE,
+    digest TEXT NOT NULL UNIQUE,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_accessed ON items (accessed);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+class BoundedMemoryStorage(Storage):
+    """crewAI ``Storage`` with size, TTL and LRU bounds over a memory-mapped vector file."""
+
+    def __init__(self,
+                 path: str,
+                 embed: Callable[[List[str]], List[List[float]]],
+                 max_items: int = MAX_ITEMS,
+                 ttl_seconds: Optional[float] = TTL_SECONDS,
+                 compact_ratio: float = COMPACT_RATIO):
+        """
+        Args:
+            path: Directory holding ``index.sqlite`` and ``vectors.f32``
+            embed: Embeds a batch of texts (e.g. ``OllamaEmbeddings.embed_documents``)
+            max_items: Live entries kept; the least recently used are evicted beyond this
+            ttl_seconds: Entries older than this are expired; None keeps them forever
+            compact_ratio: Dead-slot fraction at which the vector file is rewritten
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.embed = embed
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self.compact_ratio = compact_ratio
+        self._vectors_path = self.path / "vectors.f32"
+        self._local = threading.local()
+        self._map: Optional[np.memmap] = None
+        self._map_generation = -1
+        self._map_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        with self._db() as db:
+            db.executescript(_SCHEMA)
+
+    def __deepcopy__(self, memo):
+        # Crew.copy() deep-copies its memories; copies share the store
+        return self
+
+    # =========================
+    # FILES
+    # =========================
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(str(self.path / "index.sqlite"), timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA busy_timeout=30000")
+            self._local.db = db
+        return db
+
+    def _transaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(db)
+            db.execute("COMMIT")
+            return result
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _meta(db: sqlite3.Connection, key: str, default: int = 0) -> int:
+        row = db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else default
+
+    @staticmethod
+    def _set_meta(db: sqlite3.Connection, key: str, value: int) -> None:
+        db.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                   "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, str(value)))
+
+    def _vectors(self, db: sqlite3.Connection, min_rows: int = 0) -> Optional[np.memmap]:
+        """The current vector file mapped with at least ``min_rows`` rows, growing it if needed."""
+        dim = self._meta(db, "dim")
+        if not dim:
+            return None
+        generation = self._meta(db, "generation")
+        row_bytes = dim * 4
+        with self._map_lock:
+            size = self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+            if size < min_rows * row_bytes:
+                size = max(min_rows, 2 * (size // row_bytes), 64) * row_bytes
+                with open(self._vectors_path, "ab") as f:
+                    f.truncate(size)
+            rows = size // row_bytes
+            if self._map is None or self._map_generation != generation or len(self._map) != rows:
+                self._map = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(rows, dim)) if rows else None
+                self._map_generation = generation
+            return self._map
+
+    # =========================
+    # STORAGE INTERFACE
+    # =========================
+    def save(self, value: Any, metadata: Dict[str, Any]) -> None:
+        """Store ``value``; saving the same text again refreshes it instead of adding a copy."""
+        content = str(value)
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        now = time.time()
+        with self._db() as db:
+            if db.execute("UPDATE items SET accessed = ?, created = ?, metadata = ? WHERE digest = ?",
+                          (now, now, json.dumps(metadata or {}, default=str), digest)).rowcount:
+                return
+        vector = np.asarray(self.embed([content])[0], dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+
+        def write(db):
+            if not self._meta(db, "dim"):
+                self._set_meta(db, "dim", len(vector))
+            slot = self._meta(db, "next_slot")
+            vectors = self._vectors(db, min_rows=slot + 1)
+            vectors[slot] = vector
+            vectors.flush()
+            db.execute("INSERT OR IGNORE INTO items (slot, digest, content, metadata, created, accessed) "
+                       "VALUES (?, ?, ?, ?, ?, ?)",
+                       (slot, digest, content, json.dumps(metadata or {}, default=str), now, now))
+            self._set_meta(db, "next_slot", slot + 1)
+            self._evict(db, now)
+        self._transaction(write)
+
+    def search(self, query: str, limit: int = 5, score_threshold: float = 0.6) -> List[Dict[str, Any]]:
+        """
+        Live entries most similar to ``query``, as crewAI's contextual memory expects them.
+
+        Rows and vectors are read in the same write transaction that ``compact()``
+        renumbers slots in, so a search never pairs a row with another row's vector.
+        """
+        if not self._db().execute("SELECT 1 FROM items LIMIT 1").fetchone():
+            return []
+        q = np.asarray(self.embed([query])[0], dtype=np.float32)
+        q /= np.linalg.norm(q) or 1.0
+        now = time.time()
+        cutoff = now - self.ttl_seconds if self.ttl_seconds else 0
+
+        def read(db):
+            rows = db.execute("SELECT id, slot, content, metadata FROM items WHERE created >= ?", (cutoff,)).fetchall()
+            vectors = self._vectors(db) if rows else None
+            rows = [r for r in rows if vectors is not None and r[1] < len(vectors)]
+            if not rows:
+                return []
+            scores = vectors[[r[1] for r in rows]] @ q
+            best = [i for i in np.argsort(-scores)[:limit] if scores[i] >= score_threshold]
+            hits = [{"id": rows[i][0], "content": rows[i][2], "metadata": json.loads(rows[i][3]),
+                     "score": float(scores[i])} for i in best]
+            db.executemany("UPDATE items SET accessed = ? WHERE id = ?", [(now, h["id"]) for h in hits])
+            return hits
+        return self._transaction(read)
+
+    def reset(self) -> None:
+        def clear(db):
+            db.execute("DELETE FROM items")
+            self._set_meta(db, "next_slot", 0)
+            self._set_meta(db, "generation", self._meta(db, "generation") + 1)
+            if self._vectors_path.exists():
+                self._vectors_path.unlink()
+        self._transaction(clear)
+
+    # =========================
+    # BOUNDS
+    # =========================
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then the least recently used beyond ``max_items``."""
+        if self.ttl_seconds:
+            db.execute("DELETE FROM items WHERE created < ?", (now - self.ttl_seconds,))
+        excess = db.execute("SELECT COUNT(*) FROM items").fetchone()[0] - self.max_items
+        if excess > 0:
+            db.execute("DELETE FROM items WHERE id IN (SELECT id FROM items ORDER BY accessed ASC LIMIT ?)",
+                       (excess,))
+
+    def stats(self) -> Dict[str, int]:
+        db = self._db()
+        live = db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        slots = self._meta(db, "next_slot")
+        size = self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+        return {"live": live, "slots": slots, "dead": slots - live, "vector_bytes": size}
+
+    def compact(self, force: bool = False) -> bool:
+        """
+        Expire and evict, then rewrite the vector file without dead slots.
+
+        Returns:
+            True if the file was rewritten
+        """
+        def rewrite(db):
+            self._evict(db, time.time())
+            rows = db.execute("SELECT id, slot FROM items ORDER BY slot").fetchall()
+            slots = self._meta(db, "next_slot")
+            if not slots or (not force and (slots - len(rows)) / slots < self.compact_ratio):
+                return False
+            vectors = self._vectors(db)
+            tmp = self._vectors_path.with_suffix(".tmp")
+            if rows:
+                packed = np.memmap(tmp, dtype=np.float32, mode="w+", shape=(len(rows), vectors.shape[1]))
+                packed[:] = vectors[[slot for _, slot in rows]]
+                packed.flush()
+                del packed
+            else:
+                tmp.write_bytes(b"")
+            # negative slots first so the UNIQUE constraint holds while renumbering
+            db.executemany("UPDATE items SET slot = ? WHERE id = ?", [(-1 - i, r[0]) for i, r in enumerate(rows)])
+            db.execute("UPDATE items SET slot = -1 - slot")
+            with self._map_lock:
+                self._map = None
+                os.replace(tmp, self._vectors_path)
+            self._set_meta(db, "next_slot", len(rows))
+            self._set_meta(db, "generation", self._meta(db, "generation") + 1)
+            return True
+        return self._transaction(rewrite)
+
+    def start_compactor(self, interval: float = COMPACT_INTERVAL) -> threading.Thread:
+        """Compact in a daemon thread every ``interval`` seconds until ``stop()``."""
+        if self._compactor is None or not self._compactor.is_alive():
+            def loop():
+                while not self._stop.wait(interval):
+                    try:
+                        self.compact()
+                    except Exception as e:
+                        report("memory", f"⚠️  Memory compaction failed: {e}", logging.WARNING, path=str(self.path))
+            self._stop.clear()
+            self._compactor = threading.Thread(target=loop, name=f"memory-compactor-{self.path.name}", daemon=True)
+            self._compactor.start()
+        return self._compactor
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+class BoundedLTMStorage(LTMSQLiteStorage):
+    """crewAI's long-term memory table, pruned by age and row count on every save."""
+
+    def __init__(self, db_path: str, max_rows: int = MAX_ITEMS, ttl_seconds: Optional[float] = TTL_SECONDS):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(db_path=db_path)
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def save(self, task_description: str, metadata: Dict[str, Any], datetime: str, score) -> None:
+        super().save(task_description, metadata, datetime, score)
+        with sqlite3.connect(self.db_path) as conn:
+            if self.ttl_seconds:
+                conn.execute("DELETE FROM long_term_memories WHERE CAST(datetime AS REAL) < ?",
+                             (time.time() - self.ttl_seconds,))
+            conn.execute("DELETE FROM long_term_memories WHERE id NOT IN "
+                         "(SELECT id FROM long_term_memories ORDER BY id DESC LIMIT ?)", (self.max_rows,))
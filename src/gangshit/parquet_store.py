@@ -0,0 +1,223 @@
+"""
+Property records stored as Parquet, hive-partitioned by state and county.
+Queries push filters down to pyarrow so partitions, columns and row groups
+that cannot match are never read.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from urllib.parse import quote
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Optional dependency, same strategy as the Ollama embedder
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+PARTITION_KEYS = ("state", "county")
+OPERATORS = ("=", "!=", ">", ">=", "<", "<=", "in", "not in")
+ROW_GROUP_SIZE = 64_000
+
+
+def default_root() -> Path:
+    """Dataset root, overridable with ``GANGSHIT_PARQUET_ROOT``."""
+    return Path(os.getenv("GANGSHIT_PARQUET_ROOT", "data/properties"))
+
+
+def _require_pyarrow() -> None:
+    if not PYARROW_AVAILABLE:
+        raise ImportError("Parquet support needs pyarrow - install with: pip install 'gangshit[parquet]'")
+
+
+def _partitioning():
+    """
+    Hive partitioning with string-typed keys.
+
+    Without an explicit schema pyarrow infers ``county=003`` as the integer 3,
+    so string filters on FIPS-style codes never match.
+    """
+    return ds.partitioning(pa.schema([(key, pa.string()) for key in PARTITION_KEYS]), flavor="hive")
+
+
+def write_partitioned(records: Iterable[Dict[str, Any]],
+                      root: Optional[str] = None,
+                      sort_by: Sequence[str] = ("zip",)) -> Path:
+    """
+    Write property records as a state/county partitioned Parquet dataset.
+
+    Rows are sorted within each partition so row-group min/max statistics
+    stay selective for the sort columns.
+
+    Args:
+        records: Property dicts that carry ``state`` and ``county``
+        root: Dataset directory (replaced partitions are overwritten)
+        sort_by: Columns to cluster rows by before writing
+
+    Returns:
+        The dataset root
+    """
+    _require_pyarrow()
+    root = Path(root) if root else default_root()
+    records = list(records)
+    names = list(dict.fromkeys(name for record in records for name in record))  # union, first-seen order
+    table = pa.Table.from_pylist([{name: record.get(name) for name in names} for record in records])
+    for key in PARTITION_KEYS:
+        if key in table.column_names and table.schema.field(key).type != pa.string():
+            table = table.set_column(table.column_names.index(key), key, table[key].cast(pa.string()))
+    sort_keys = [(name, "ascending") for name in (*PARTITION_KEYS, *sort_by) if name in table.column_names]
+    if sort_keys:
+        table = table.sort_by(sort_keys)
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=_partitioning(),
+        existing_data_behavior="delete_matching",
+        max_rows_per_group=ROW_GROUP_SIZE,
+        min_rows_per_group=min(ROW_GROUP_SIZE, max(table.num_rows, 1)),
+    )
+    return root
+
+
+def sync_partitions(before: Dict[str, Dict[str, Any]],
+                    after: Dict[str, Dict[str, Any]],
+                    root: Optional[str] = None,
+                    key: str = "property_id") -> int:
+    """
+    Rewrite the state/county partitions holding properties that changed between two states.
+
+    ``before`` and ``after`` map property ids to states (``PropertyHistory.current()``).
+    Partitions left without properties are deleted.
+
+    Returns:
+        Number of partitions rewritten or deleted
+    """
+    _require_pyarrow()
+    root = Path(root) if root else default_root()
+
+    def partition(state: Optional[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+        if not state or state.get("state") is None or state.get("county") is None:
+            return None
+        return str(state["state"]), str(state["county"])
+
+    touched = set()
+    for pid in set(before) | set(after):
+        if before.get(pid) != after.get(pid):
+            touched.update(p for p in (partition(before.get(pid)), partition(after.get(pid))) if p)
+    rows = [{key: pid, **state} for pid, state in after.items() if partition(state) in touched]
+    for state, county in touched - {partition(row) for row in rows}:
+        shutil.rmtree(root / f"state={quote(state)}" / f"county={quote(county)}", ignore_errors=True)
+    if rows:
+        write_partitioned(rows, root=str(root))
+    return len(touched)
+
+
+def _typed(column: str, value: Any, schema) -> Any:
+    """Cast a filter value (or list of values) to the column's Arrow type."""
+    if schema is None or column not in schema.names:
+        return value
+    kind = schema.field(column).type
+    values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+    try:
+        typed = [None if v is None else pa.scalar(v).cast(kind).as_py() for v in values]
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+        raise ValueError(f"Filter value {value!r} does not match column '{column}' of type {kind}") from e
+    return typed if isinstance(value, (list, tuple, set)) else typed[0]
+
+
+def build_filter(filters: Sequence[Tuple[str, str, Any]], schema=None):
+    """
+    Combine ``(column, operator, value)`` triples into one pyarrow expression.
+
+    With a dataset ``schema``, values are cast to their column's type first
+    (so ``"40"`` compares numerically against ``equity_pct``).
+
+    Raises:
+        ValueError: On an unsupported operator, unknown column or a value of the wrong type
+    """
+    _require_pyarrow()
+    expression = None
+    for column, op, value in filters:
+        if schema is not None and column not in schema.names:
+            raise ValueError(f"Unknown filter column '{column}'")
+        value = _typed(column, value, schema)
+        field = ds.field(column)
+        if op == "=":
+            term = field == value
+        elif op == "!=":
+            term = field != value
+        elif op == ">":
+            term = field > value
+        elif op == ">=":
+            term = field >= value
+        elif op == "<":
+            term = field < value
+        elif op == "<=":
+            term = field <= value
+        elif op in ("in", "not in"):
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            term = field.isin(list(values))
+            if op == "not in":
+                term = ~term
+        else:
+            raise ValueError(f"Unsupported operator '{op}', expected one of {OPERATORS}")
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def query_page(filters: Sequence[Tuple[str, str, Any]] = (),
+               columns: Optional[List[str]] = None,
+               page: int = 1,
+               page_size: int = 25,
+               root: Optional[str] = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Return one page of matching rows without materializing the full result.
+
+    Batches are streamed from the scanner and the scan stops as soon as the
+    requested page (plus one look-ahead row) has been collected.
+
+    Returns:
+        The page rows and whether more rows follow
+    """
+    _require_pyarrow()
+    root = Path(root) if root else default_root()
+    if not root.exists():
+        return [], False
+    dataset = ds.dataset(root, format="parquet", partitioning=_partitioning())
+    if columns:
+        unknown = [c for c in columns if c not in dataset.schema.names]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    scanner = dataset.scanner(columns=columns or None, filter=build_filter(filters, dataset.schema))
+
+    skip = (max(page, 1) - 1) * page_size
+    wanted = page_size + 1
+    rows: List[Dict[str, Any]] = []
+    for batch in scanner.to_batches():
+        if skip >= batch.num_rows:
+            skip -= batch.num_rows
+            continue
+        rows.extend(batch.slice(skip, wanted - len(rows)).to_pylist())
+        skip = 0
+        if len(rows) >= wanted:
+            break
+    return rows[:page_size], len(rows) > page_size
+
+
+def to_markdown(rows: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> str:
+    """Render rows as a Markdown table."""
+    if not rows:
+        return "No matching properties."
+    columns = columns or list(rows[0])
+
+    def cell(value: Any) -> str:
+        return "" if value is None else str(value).replace("|", "\\|").replace("\n", " ")
+
+    lines = ["| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    lines.extend("| " + " | ".join(cell(row.get(c)) for c in columns) + " |" for row in rows)
+    return "\n".join(lines)
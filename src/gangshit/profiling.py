@@ -0,0 +1,363 @@
+"""
+Run profiling as a Chrome Trace Event / Perfetto timeline.
+Listens on the crewAI event bus (like ``MyCustomListener``) and records nested
+spans for each crew, task, agent execution, LLM call and tool call, per thread.
+Streamed LLM calls are split at the first chunk into ``prefill`` (including any
+model load on the Ollama side) and ``generate``; manager delegation tools are
+tagged ``delegation``. Open the JSON in https://ui.perfetto.dev or chrome://tracing.
+Optionally attaches cProfile or py-spy for Python CPU hot spots.
+
+The bus is process-wide, so a profiler started for a run only takes events
+emitted while that run is bound (``bind_run``) in the emitting context.
+Concurrent service kickoffs therefore get separate traces.
+"""
+
+import cProfile
+import contextvars
+import json
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .logs import report
+
+try:
+    from crewai.events import (
+        AgentExecutionCompletedEvent,
+        AgentExecutionErrorEvent,
+        AgentExecutionStartedEvent,
+        BaseEventListener,
+        CrewKickoffCompletedEvent,
+        CrewKickoffFailedEvent,
+        CrewKickoffStartedEvent,
+        LLMCallCompletedEvent,
+        LLMCallFailedEvent,
+        LLMCallStartedEvent,
+        LLMStreamChunkEvent,
+        MemoryQueryCompletedEvent,
+        MemoryQueryFailedEvent,
+        MemoryQueryStartedEvent,
+        TaskCompletedEvent,
+        TaskFailedEvent,
+        TaskStartedEvent,
+        ToolUsageErrorEvent,
+        ToolUsageFinishedEvent,
+        ToolUsageStartedEvent,
+    )
+except ImportError:  # crewai < 0.177
+    from crewai.utilities.events import (
+        AgentExecutionCompletedEvent,
+        AgentExecutionErrorEvent,
+        AgentExecutionStartedEvent,
+        CrewKickoffCompletedEvent,
+        CrewKickoffFailedEvent,
+        CrewKickoffStartedEvent,
+        LLMCallCompletedEvent,
+        LLMCallFailedEvent,
+        LLMCallStartedEvent,
+        LLMStreamChunkEvent,
+        MemoryQueryCompletedEvent,
+        MemoryQueryFailedEvent,
+        MemoryQueryStartedEvent,
+        TaskCompletedEvent,
+        TaskFailedEvent,
+        TaskStartedEvent,
+        ToolUsageErrorEvent,
+        ToolUsageFinishedEvent,
+        ToolUsageStartedEvent,
+    )
+    from crewai.utilities.events.base_event_listener import BaseEventListener
+
+PROFILE_MODES = ("trace", "cprofile", "py-spy")
+DELEGATION_TOOLS = ("delegate work to coworker", "ask question to coworker")
+
+_RUN: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("gangshit_run", default=None)
+
+
+def bind_run(run_id: Optional[str]) -> None:
+    """Attribute bus events emitted from the current context (and copies of it) to ``run_id``."""
+    _RUN.set(run_id)
+
+
+def current_run() -> Optional[str]:
+    """Run bound to the current context, if any."""
+    return _RUN.get()
+
+
+def profile_mode() -> str:
+    """``GANGSHIT_PROFILE``: empty/0 (off), 1/trace, cprofile or py-spy."""
+    mode = os.getenv("GANGSHIT_PROFILE", "").strip().lower()
+    if mode in ("", "0", "false", "off"):
+        return ""
+    return mode if mode in PROFILE_MODES else "trace"
+
+
+class TraceProfiler:
+    """Collects spans while started and writes them as Chrome trace JSON."""
+
+    def __init__(self, path: str, sampler: Optional[str] = None, run_id: Optional[str] = None):
+        """
+        Args:
+            path: Trace JSON to write; sampler output goes next to it
+            sampler: None, ``"cprofile"`` (kickoff thread) or ``"py-spy"`` (whole process)
+            run_id: Only record events of this run; None records every event on the bus
+        """
+        self.path = Path(path)
+        self.sampler = sampler
+        self.run_id = run_id
+        self.events: List[Dict[str, Any]] = []
+        self._open: Dict[tuple, List[Dict[str, Any]]] = {}
+        self._threads: Dict[int, str] = {}
+        self._models_seen: set = set()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._pyspy: Optional[subprocess.Popen] = None
+
+    # =========================
+    # SPANS
+    # =========================
+    def _now(self) -> float:
+        return (time.perf_counter_ns() - self._origin) / 1000
+
+    def _tid(self) -> int:
+        thread = threading.current_thread()
+        self._threads.setdefault(thread.ident, thread.name)
+        return thread.ident
+
+    def begin(self, kind: str, name: str, **args: Any) -> None:
+        with self._lock:
+            span = {"name": name, "cat": kind, "ts": self._now(), "args": args}
+            self._open.setdefault((self._tid(), kind), []).append(span)
+
+    def end(self, kind: str, **args: Any) -> Optional[Dict[str, Any]]:
+        """Close the innermost open ``kind`` span on this thread."""
+        with self._lock:
+            tid = self._tid()
+            stack = self._open.get((tid, kind))
+            if not stack:
+                return None
+            span = stack.pop()
+            span["args"].update({k: v for k, v in args.items() if v is not None})
+            event = {"name": span["name"], "cat": kind, "ph": "X",
+                     "ts": span["ts"], "dur": self._now() - span["ts"],
+                     "pid": os.getpid(), "tid": tid, "args": span["args"]}
+            self.events.append(event)
+            first = span.get("first_token")
+            if first is not None:
+                for name, ts, dur in (("prefill", span["ts"], first - span["ts"]),
+                                      ("generate", first, event["ts"] + event["dur"] - first)):
+                    self.events.append({"name": name, "cat": "llm", "ph": "X", "ts": ts, "dur": dur,
+                                        "pid": event["pid"], "tid": tid, "args": {}})
+            return event
+
+    def mark_first_token(self) -> None:
+        with self._lock:
+            stack = self._open.get((self._tid(), "llm"))
+            if stack:
+                span = stack[-1]
+                span.setdefault("first_token", self._now())
+                span["args"]["chunks"] = span["args"].get("chunks", 0) + 1
+
+    def first_call(self, model: str) -> bool:
+        """True the first time ``model`` is called in this profile (likely includes model load)."""
+        with self._lock:
+            if model in self._models_seen:
+                return False
+            self._models_seen.add(model)
+            return True
+
+    # =========================
+    # LIFECYCLE
+    # =========================
+    def start(self) -> "TraceProfiler":
+        _listener()
+        with _ACTIVE_LOCK:
+            _ACTIVE.append(self)
+        if self.sampler == "cprofile":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.sampler == "py-spy":
+            if shutil.which("py-spy"):
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._pyspy = subprocess.Popen(
+                    ["py-spy", "record", "--pid", str(os.getpid()), "--format", "speedscope",
+                     "--output", str(self.path.with_suffix(".speedscope.json"))],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                report("profile", "⚠️  py-spy not found on PATH; recording the trace only", logging.WARNING)
+        return self
+
+    def stop(self) -> Path:
+        """Detach, stop any sampler and write the trace."""
+        with _ACTIVE_LOCK:
+            if self in _ACTIVE:
+                _ACTIVE.remove(self)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._cprofile.dump_stats(str(self.path.with_suffix(".pstats")))
+            self._cprofile = None
+        if self._pyspy is not None:
+            self._pyspy.send_signal(signal.SIGINT)
+            try:
+                self._pyspy.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self._pyspy.kill()
+            self._pyspy = None
+        return self.write()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count and total seconds per span category (nested spans are counted in each)."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for event in self.events:
+            if event["ph"] == "X":
+                name = event["name"] if event["name"] in ("prefill", "generate") else event["cat"]
+                row = totals.setdefault(name, {"count": 0, "seconds": 0.0})
+                row["count"] += 1
+                row["seconds"] += event["dur"] / 1e6
+        return totals
+
+    def to_chrome(self) -> Dict[str, Any]:
+        with self._lock:
+            meta = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                    for tid, name in self._threads.items()]
+            events = sorted(self.events, key=lambda e: (e["ts"], -e.get("dur", 0)))
+        return {"traceEvents": meta + events, "displayTimeUnit": "ms",
+                "otherData": {"summary": self.summary()}}
+
+    def write(self) -> Path:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.to_chrome(), default=str))
+        return self.path
+
+
+# =========================
+# EVENT BUS
+# =========================
+_ACTIVE: List[TraceProfiler] = []
+_ACTIVE_LOCK = threading.Lock()
+_LISTENER = None
+
+
+def _active() -> List[TraceProfiler]:
+    """Started profilers that own events emitted from the current context."""
+    run_id = current_run()
+    with _ACTIVE_LOCK:
+        return [p for p in _ACTIVE if p.run_id is None or p.run_id == run_id]
+
+
+def _each(method: str, *args: Any, **kwargs: Any) -> None:
+    for profiler in _active():
+        getattr(profiler, method)(*args, **kwargs)
+
+
+class TraceListener(BaseEventListener):
+    """Routes crewAI events to every started ``TraceProfiler``."""
+
+    def setup_listeners(self, crewai_event_bus):
+        @crewai_event_bus.on(CrewKickoffStartedEvent)
+        def on_crew_started(source, event):
+            _each("begin", "crew", f"crew {event.crew_name}")
+
+        @crewai_event_bus.on(CrewKickoffCompletedEvent)
+        def on_crew_completed(source, event):
+            _each("end", "crew", total_tokens=getattr(event, "total_tokens", None))
+
+        @crewai_event_bus.on(CrewKickoffFailedEvent)
+        def on_crew_failed(source, event):
+            _each("end", "crew", error=event.error)
+            _each("write")
+
+        @crewai_event_bus.on(TaskStartedEvent)
+        def on_task_started(source, event):
+            task = event.task or source
+            _each("begin", "task", getattr(task, "name", None) or "task")
+
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def on_task_completed(source, event):
+            _each("end", "task")
+
+        @crewai_event_bus.on(TaskFailedEvent)
+        def on_task_failed(source, event):
+            _each("end", "task", error=event.error)
+
+        @crewai_event_bus.on(AgentExecutionStartedEvent)
+        def on_agent_started(source, event):
+            _each("begin", "agent", event.agent.role, task=getattr(event.task, "name", None))
+
+        @crewai_event_bus.on(AgentExecutionCompletedEvent)
+        def on_agent_completed(source, event):
+            _each("end", "agent")
+
+        @crewai_event_bus.on(AgentExecutionErrorEvent)
+        def on_agent_error(source, event):
+            _each("end", "agent", error=event.error)
+
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def on_llm_started(source, event):
+            model = event.model or getattr(source, "model", None) or "llm"
+            for profiler in _active():
+                profiler.begin("llm", model, agent=event.agent_role, task=event.task_name,
+                               first_call=profiler.first_call(model))
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def on_llm_chunk(source, event):
+            _each("mark_first_token")
+
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def on_llm_completed(source, event):
+            _each("end", "llm")
+
+        @crewai_event_bus.on(LLMCallFailedEvent)
+        def on_llm_failed(source, event):
+            _each("end", "llm", error=event.error)
+
+        @crewai_event_bus.on(ToolUsageStartedEvent)
+        def on_tool_started(source, event):
+            kind = "delegation" if event.tool_name.lower() in DELEGATION_TOOLS else "tool"
+            _each("begin", kind, event.tool_name, agent=event.agent_role)
+
+        @crewai_event_bus.on(ToolUsageFinishedEvent)
+        def on_tool_finished(source, event):
+            kind = "delegation" if event.tool_name.lower() in DELEGATION_TOOLS else "tool"
+            _each("end", kind, from_cache=event.from_cache)
+
+        @crewai_event_bus.on(ToolUsageErrorEvent)
+        def on_tool_error(source, event):
+            kind = "delegation" if event.tool_name.lower() in DELEGATION_TOOLS else "tool"
+            _each("end", kind, error=str(event.error))
+
+        @crewai_event_bus.on(MemoryQueryStartedEvent)
+        def on_memory_started(source, event):
+            _each("begin", "memory", f"memory {event.source_type}")
+
+        @crewai_event_bus.on(MemoryQueryCompletedEvent)
+        def on_memory_completed(source, event):
+            _each("end", "memory")
+
+        @crewai_event_bus.on(MemoryQueryFailedEvent)
+        def on_memory_failed(source, event):
+            _each("end", "memory", error=event.error)
+
+
+def _listener() -> TraceListener:
+    """Register the bus handlers once per process."""
+    global _LISTENER
+    if _LISTENER is None:
+        _LISTENER = TraceListener()
+    return _LISTENER
+
+
+def start_profiler(path: str, mode: Optional[str] = None, run_id: Optional[str] = None) -> Optional[TraceProfiler]:
+    """Start a profiler for ``mode`` (defaults to ``profile_mode()``); None when profiling is off."""
+    mode = profile_mode() if mode is None else mode
+    if not mode:
+        return None
+    return TraceProfiler(path, sampler=None if mode == "trace" else mode, run_id=run_id).start()
@@ -0,0 +1,254 @@
+"""
+Long-running crew service.
+Keeps warm crews (parsed configs, LLM clients, tools) in memory and runs
+kickoff jobs from a bounded queue behind a small asyncio HTTP API:
+
+    POST /jobs               {"inputs": {...}}  -> 202 {"job_id": ...}
+    GET  /jobs/<id>          job status and result
+    GET  /jobs/<id>/events   NDJSON stream of progress events
+    GET  /health             queue and worker stats
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .logs import report
+
+DEFAULT_WORKERS = int(os.getenv("GANGSHIT_SERVE_WORKERS", "2"))
+DEFAULT_QUEUE_SIZE = int(os.getenv("GANGSHIT_SERVE_QUEUE", "32"))
+DEFAULT_KEEP_JOBS = int(os.getenv("GANGSHIT_SERVE_KEEP", "1000"))
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class Job:
+    """One kickoff request and its progress events."""
+
+    def __init__(self, inputs: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.inputs = inputs
+        self.status = "queued"
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def publish(self, event: str, **data) -> None:
+        """Record an event and wake any streaming readers (event loop thread only)."""
+        self.events.append({"event": event, "time": time.time(), **data})
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "queued_seconds": round((self.started or time.time()) - self.created, 3),
+            "run_seconds": round((self.finished or time.time()) - self.started, 3) if self.started else None,
+        }
+
+
+class CrewService:
+    """Bounded job queue served by a pool of warm crews."""
+
+    def __init__(self,
+                 crew_factory: Optional[Callable[[], Any]] = None,
+                 workers: int = DEFAULT_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 keep_jobs: int = DEFAULT_KEEP_JOBS):
+        """
+        Args:
+            crew_factory: Builds one warm ``Gangshit`` instance (defaults to ``Gangshit``)
+            workers: Concurrent kickoffs, one warm crew each
+            queue_size: Jobs that may wait before submissions are rejected
+            keep_jobs: Finished jobs kept for result lookup
+        """
+        if crew_factory is None:
+            from .crew import Gangshit
+            crew_factory = Gangshit
+        self.crew_factory = crew_factory
+        self.workers = workers
+        self.keep_jobs = keep_jobs
+        self.queue: "asyncio.Queue[Job]" = asyncio.Queue(maxsize=queue_size)
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._crews: List[Any] = []
+        self._tasks: List[asyncio.Task] = []
+
+    # =========================
+    # WORKERS
+    # =========================
+    async def start(self) -> None:
+        """Build the warm crews and start the worker tasks."""
+        for _ in range(self.workers):
+            instance = await asyncio.to_thread(self.crew_factory)
+            crew = await asyncio.to_thread(instance.gangshit_crew)
+            self._crews.append(crew)
+        self._tasks = [asyncio.create_task(self._worker(crew)) for crew in self._crews]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def submit(self, inputs: Dict[str, Any]) -> Job:
+        """
+        Queue a kickoff job.
+
+        Raises:
+            asyncio.QueueFull: When the queue is at capacity
+        """
+        job = Job({"current_year": str(datetime.now().year), **inputs})
+        self.queue.put_nowait(job)
+        self.jobs[job.id] = job
+        job.publish("queued", position=self.queue.qsize())
+        while len(self.jobs) > self.keep_jobs:
+            oldest = next(iter(self.jobs.values()))
+            if not oldest.done:
+                break
+            self.jobs.popitem(last=False)
+        return job
+
+    async def _worker(self, crew: Any) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            job.status, job.started = "running", time.time()
+            job.publish("started")
+
+            def on_task(output, job=job):
+                name = getattr(output, "name", None) or getattr(output, "agent", "task")
+                loop.call_soon_threadsafe(functools.partial(job.publish, "task_completed", task=name))
+
+            crew.task_callback = on_task
+            try:
+                result = await asyncio.to_thread(crew.kickoff, inputs=dict(job.inputs))
+                job.result, job.status = str(result), "completed"
+            except Exception as e:
+                job.error, job.status = f"{type(e).__name__}: {e}", "failed"
+            finally:
+                crew.task_callback = None
+                job.finished = time.time()
+                job.publish(job.status)
+                self.queue.task_done()
+
+    # =========================
+    # HTTP
+    # =========================
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000) -> asyncio.AbstractServer:
+        """Start the workers and the HTTP listener."""
+        await self.start()
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length") or 0))
+            await self._route(method.upper(), target.split("?", 1)[0].rstrip("/"), body, writer)
+        except (ValueError, asyncio.IncompleteReadError):
+            await self._send(writer, 400, {"error": "malformed request"})
+        except ConnectionError:
+            pass
+        except Exception as e:
+            report("service", f"❌ Request failed: {type(e).__name__}: {e}", logging.ERROR)
+            await self._send(writer, 500, {"error": "internal error"})
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        parts = [p for p in path.split("/") if p]
+        if parts == ["health"]:
+            return await self._send(writer, 200, {
+                "workers": self.workers, "queued": self.queue.qsize(), "capacity": self.queue.maxsize,
+                "running": sum(1 for j in self.jobs.values() if j.status == "running"),
+            })
+        if parts == ["jobs"]:
+            if method != "POST":
+                return await self._send(writer, 405, {"error": "use POST"})
+            try:
+                payload = json.loads(body or b"{}")
+                if not isinstance(payload, dict):
+                    raise ValueError("body must be a JSON object")
+                inputs = payload.get("inputs", {})
+                if not isinstance(inputs, dict):
+                    raise ValueError("inputs must be an object")
+            except ValueError as e:
+                return await self._send(writer, 400, {"error": str(e)})
+            try:
+                job = self.submit(inputs)
+            except asyncio.QueueFull:
+                return await self._send(writer, 503, {"error": "queue full, retry later"})
+            return await self._send(writer, 202, {"job_id": job.id, "status": job.status})
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return await self._send(writer, 404, {"error": "unknown job"})
+            if len(parts) == 2:
+                return await self._send(writer, 200, job.to_dict())
+            if parts[2] == "events":
+                return await self._stream(job, writer)
+        await self._send(writer, 404, {"error": "not found"})
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    @staticmethod
+    async def _stream(job: Job, writer: asyncio.StreamWriter) -> None:
+        """Write events as NDJSON until the job finishes."""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nConnection: close\r\n\r\n")
+        sent = 0
+        while True:
+            changed = job._changed
+            for event in job.events[sent:]:
+                writer.write(json.dumps(event).encode() + b"\n")
+            sent = len(job.events)
+            await writer.drain()
+            if job.done:
+                return
+            await changed.wait()
+
+
+async def _serve_forever(host: str, port: int, workers: int, queue_size: int) -> None:
+    service = CrewService(workers=workers, queue_size=queue_size)
+    server = await service.serve(host, port)
+    report("service", f"🛰️ Gangshit service on http://{host}:{port} ({workers} warm crews, queue {queue_size})")
+    async with server:
+        await server.serve_forever()
+
+
+def run_service(host: Optional[str] = None, port: Optional[int] = None,
+                workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+    """Blocking entry point used by ``gangshit.main:serve``."""
+    host = host or os.getenv("GANGSHIT_SERVE_HOST", "127.0.0.1")
+    port = port or int(os.getenv("GANGSHIT_SERVE_PORT", "8000"))
+    asyncio.run(_serve_forever(host, port, workers, queue_size))
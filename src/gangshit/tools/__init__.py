@@ -1,3 +1,7 @@
 from .custom_tool import MyCustomListener
+from .filtered_search_tool import FilteredSerperTool
+from .market_stats_tool import MarketStatsTool
+from .property_history_tool import PropertyHistoryTool
+from .property_query_tool import PropertyQueryTool
 
-__all__ = ['MyCustomListener']
\ No newline at end of file
+__all__ = ['MyCustomListener', 'FilteredSerperTool', 'MarketStatsTool', 'PropertyHistoryTool', 'PropertyQueryTool']
\ No newline at end of file
@@ -8,6 +8,8 @@ from crewai.utilities.events import (
 )
 from crewai.utilities.events.base_event_listener import BaseEventListener
 
+from ..logs import report
+
 class MyCustomListener(BaseEventListener):
     def __init__(self):
         super().__init__()
@@ -15,17 +17,17 @@ class MyCustomListener(BaseEventListener):
     def setup_listeners(self, crewai_event_bus):
         @crewai_event_bus.on(CrewKickoffStartedEvent)
         def on_crew_started(source, event):
-            print(f"Crew '{event.crew_name}' has started execution!")
+            report("events", f"Crew '{event.crew_name}' has started execution!", crew=event.crew_name)
 
         @crewai_event_bus.on(CrewKickoffCompletedEvent)
         def on_crew_completed(source, event):
-            print(f"Crew '{event.crew_name}' has completed execution!")
-            print(f"Output: {event.output}")
+            report("events", f"Crew '{event.crew_name}' has completed execution!", crew=event.crew_name)
+            report("events", f"Output: {event.output}")
 
         @crewai_event_bus.on(AgentExecutionCompletedEvent)
         def on_agent_execution_completed(source, event):
-            print(f"Agent '{event.agent.role}' completed task")
-            print(f"Output: {event.output}")
+            report("events", f"Agent '{event.agent.role}' completed task", agent=event.agent.role)
+            report("events", f"Output: {event.output}")
 
 
 class MyCustomToolInput(BaseModel):
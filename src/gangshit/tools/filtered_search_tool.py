@@ -0,0 +1,22 @@
+from typing import Any, Optional
+
+from crewai_tools import SerperDevTool
+
+from ..dedup import SIMILARITY_THRESHOLD, TOKEN_BUDGET, compact_search_results
+
+
+class FilteredSerperTool(SerperDevTool):
+    """SerperDevTool whose results are de-duplicated, tier-ranked and token-capped."""
+    description: str = (
+        "Search the internet. Returns de-duplicated results ranked by source tier "
+        "(T1 official/regulatory, T2 reputable news and industry data, T3 other)."
+    )
+    similarity_threshold: float = SIMILARITY_THRESHOLD
+    token_budget: Optional[int] = TOKEN_BUDGET
+
+    def _run(self, **kwargs: Any) -> Any:
+        results = super()._run(**kwargs)
+        if not isinstance(results, dict):
+            return results
+        return compact_search_results(results, threshold=self.similarity_threshold,
+                                      token_budget=self.token_budget)
@@ -0,0 +1,34 @@
+from crewai.tools import BaseTool
+from typing import Optional, Type
+from pydantic import BaseModel, Field
+
+from ..aggregates import LEVELS, MarketAggregates
+
+
+class MarketStatsToolInput(BaseModel):
+    """Input schema for MarketStatsTool."""
+    level: str = Field("zip", description=f"Market level to report on, one of {', '.join(LEVELS)}.")
+    key: Optional[str] = Field(None, description="A single ZIP, tract or geohash cell to look up. Omit for a ranked table.")
+    top: int = Field(10, ge=1, le=100, description="Number of cells to return when no key is given.")
+
+
+class MarketStatsTool(BaseTool):
+    name: str = "Market statistics"
+    description: str = (
+        "Returns precomputed market-level property stats (property count, distressed count, "
+        "median equity %, delinquency rate) by ZIP, census tract or geohash cell. "
+        "Use this instead of estimating market figures yourself."
+    )
+    args_schema: Type[BaseModel] = MarketStatsToolInput
+    aggregates_path: Optional[str] = None
+
+    def _run(self, level: str = "zip", key: Optional[str] = None, top: int = 10) -> str:
+        aggregates = MarketAggregates.cached(self.aggregates_path)
+        if level not in LEVELS:
+            return f"Unknown level '{level}'. Use one of: {', '.join(LEVELS)}."
+        if key is None:
+            return aggregates.to_markdown(level=level, top=top)
+        row = aggregates.get(level, key)
+        if row is None:
+            return f"No aggregates for {level} '{key}'."
+        return ", ".join(f"{name}={value}" for name, value in {level: key, **row}.items())
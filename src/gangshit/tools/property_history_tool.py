@@ -0,0 +1,54 @@
+from crewai.tools import BaseTool
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Type
+from pydantic import BaseModel, Field
+
+from ..history import DISTRESS_THRESHOLD, PropertyHistory
+
+QUERIES = ("became_distressed", "trend")
+
+
+class PropertyHistoryToolInput(BaseModel):
+    """Input schema for PropertyHistoryTool."""
+    query: str = Field("became_distressed", description=f"What to look up, one of: {', '.join(QUERIES)}.")
+    days: int = Field(30, ge=1, le=3650, description="Look-back window in days, ending now.")
+    bucket_days: int = Field(7, ge=1, le=365, description="Trend bucket size in days (trend only).")
+    limit: int = Field(50, ge=1, le=500, description="Maximum properties to list (became_distressed only).")
+
+
+class PropertyHistoryTool(BaseTool):
+    name: str = "Property distress history"
+    description: str = (
+        "Answers questions over the recorded property history: which properties became distressed "
+        "in the last N days (query=became_distressed), or how the distressed count and mean distress "
+        "score moved over the last N days in buckets (query=trend)."
+    )
+    args_schema: Type[BaseModel] = PropertyHistoryToolInput
+    history_root: Optional[str] = None
+
+    def _run(self, query: str = "became_distressed", days: int = 30, bucket_days: int = 7, limit: int = 50) -> str:
+        if query not in QUERIES:
+            return f"Unknown query '{query}'. Use one of: {', '.join(QUERIES)}."
+        history = PropertyHistory(root=self.history_root)
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(days=days)
+
+        if query == "trend":
+            rows = history.trend(since, now, bucket=timedelta(days=bucket_days), threshold=DISTRESS_THRESHOLD)
+            lines = ["| until | properties | distressed | mean distress score |", "|---|---|---|---|"]
+            for row in rows:
+                mean = row["mean_distress_score"]
+                lines.append(f"| {row['until']:%Y-%m-%d} | {row['properties']} | {row['distressed']} | "
+                             f"{'' if mean is None else f'{mean:.2f}'} |")
+            return "\n".join(lines)
+
+        crossed = history.became_distressed(since, now)
+        if not crossed:
+            return f"No properties became distressed in the last {days} days."
+        current = history.current()
+        lines = [f"{len(crossed)} properties became distressed in the last {days} days.", "",
+                 "| property_id | became distressed | zip | distress_score |", "|---|---|---|---|"]
+        for pid, when in sorted(crossed.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            state = current.get(pid, {})
+            lines.append(f"| {pid} | {when:%Y-%m-%d} | {state.get('zip', '')} | {state.get('distress_score', '')} |")
+        return "\n".join(lines)
@@ -0,0 +1,65 @@
+from crewai.tools import BaseTool
+from typing import Any, List, Optional, Type, Union
+from pydantic import BaseModel, Field
+
+from ..parquet_store import OPERATORS, PYARROW_AVAILABLE, query_page, to_markdown
+
+
+class PropertyFilter(BaseModel):
+    """A single column condition."""
+    column: str = Field(..., description="Column name, e.g. foreclosure_stage, equity_pct, zip.")
+    op: str = Field("=", description=f"Comparison operator, one of: {', '.join(OPERATORS)}.")
+    value: Union[str, int, float, bool, List[Union[str, int, float]]] = Field(
+        ..., description="Value to compare against (a list for 'in' / 'not in')."
+    )
+
+
+class PropertyQueryToolInput(BaseModel):
+    """Input schema for PropertyQueryTool."""
+    state: Optional[str] = Field(None, description="Two-letter state code, e.g. NV. Strongly recommended.")
+    county: Optional[str] = Field(None, description="County name as stored in the dataset, e.g. Clark.")
+    filters: List[PropertyFilter] = Field(default_factory=list, description="Conditions that must all hold.")
+    columns: Optional[List[str]] = Field(None, description="Columns to return. Omit for all columns.")
+    page: int = Field(1, ge=1, description="1-based result page.")
+    page_size: int = Field(25, ge=1, le=200, description="Rows per page.")
+
+
+class PropertyQueryTool(BaseTool):
+    name: str = "Property records query"
+    description: str = (
+        "Runs structured filters over the local property dataset (Parquet, partitioned by state and county) "
+        "and returns one page of matching rows as a Markdown table. Example: state=NV, county=Clark, "
+        "filters=[{column: foreclosure_stage, op: '=', value: auction}, {column: equity_pct, op: '>', value: 40}]."
+    )
+    args_schema: Type[BaseModel] = PropertyQueryToolInput
+    dataset_root: Optional[str] = None
+
+    def _run(self,
+             state: Optional[str] = None,
+             county: Optional[str] = None,
+             filters: Optional[List[Any]] = None,
+             columns: Optional[List[str]] = None,
+             page: int = 1,
+             page_size: int = 25) -> str:
+        if not PYARROW_AVAILABLE:
+            return "Property query unavailable: pyarrow is not installed."
+
+        conditions = []
+        if state:
+            conditions.append(("state", "=", state))
+        if county:
+            conditions.append(("county", "=", county))
+        for item in filters or []:
+            item = item if isinstance(item, PropertyFilter) else PropertyFilter(**item)
+            conditions.append((item.column, item.op, item.value))
+
+        try:
+            rows, more = query_page(conditions, columns=columns, page=page,
+                                    page_size=page_size, root=self.dataset_root)
+        except (ValueError, TypeError) as e:
+            return f"Invalid query: {e}"
+        except Exception as e:
+            return f"Query failed: {type(e).__name__}: {e}"
+
+        footer = f"\n\nPage {page}" + (f" - more results: request page {page + 1}." if more else " - last page.")
+        return to_markdown(rows, columns) + (footer if rows else "")
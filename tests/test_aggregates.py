@@ -0,0 +1,99 @@
+"""Test materialized market aggregates."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.aggregates import MarketAggregates, geohash
+from gangshit.history import PropertyHistory
+
+RECORDS = [
+    {"property_id": "p1", "zip": "89101", "equity_pct": 10.0, "delinquent": True, "distress_score": 0.9},
+    {"property_id": "p2", "zip": "89101", "equity_pct": 50.0, "delinquent": False, "distress_score": 0.1},
+    {"property_id": "p3", "zip": "89102", "equity_pct": 30.0, "delinquent": True, "distress_score": 0.8},
+]
+
+
+def test_geohash_known_cell():
+    """Test geohash encoding against a well-known value."""
+    assert geohash(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+
+
+def test_build_group_by(tmp_path):
+    """Test one-shot group-by reductions."""
+    aggregates = MarketAggregates(path=str(tmp_path / "agg.json")).build(RECORDS)
+    assert aggregates.get("zip", "89101") == {
+        "properties": 2, "distressed": 1, "median_equity_pct": 30.0, "delinquency_rate": 0.5,
+    }
+    assert aggregates.rows("zip")[0]["zip"] in {"89101", "89102"}
+
+
+def test_incremental_ingest_matches_rebuild(tmp_path):
+    """Test that incremental updates agree with a full rebuild and survive save/load."""
+    history = PropertyHistory(root=str(tmp_path / "history"))
+    aggregates = MarketAggregates(path=str(tmp_path / "agg.json"))
+    aggregates.ingest(history, RECORDS)
+    aggregates.ingest(history, [{**RECORDS[1], "zip": "89102", "distress_score": 0.95}])
+
+    rebuilt = MarketAggregates(path=str(tmp_path / "other.json")).build(history.current().values())
+    assert aggregates.rows("zip") == rebuilt.rows("zip")
+
+    aggregates.save()
+    loaded = MarketAggregates.load(str(tmp_path / "agg.json"))
+    assert loaded.get("zip", "89102")["distressed"] == 2
+    assert "| 89102 |" in loaded.to_markdown("zip")
+
+
+def test_ingest_file_feeds_market_stats(tmp_path):
+    """Test that ingesting a CSV writes the aggregates the task context and tool read."""
+    from gangshit.aggregates import ingest_file, market_stats_context
+    from gangshit.tools import MarketStatsTool
+
+    listings = tmp_path / "listings.csv"
+    listings.write_text("property_id,zip,equity_pct,delinquent,distress_score\n"
+                        "p1,08901,10,true,0.9\n"
+                        "p2,08901,50,false,0.1\n")
+    path = str(tmp_path / "agg.json")
+    history = PropertyHistory(root=str(tmp_path / "history"))
+    assert ingest_file(str(listings), history=history, aggregates_path=path,
+                       parquet_root=str(tmp_path / "properties"))["records"] == 2
+
+    assert "| 08901 | 2 | 1 | 30.0 | 50.0% |" in market_stats_context(path)
+    assert "distressed=1" in MarketStatsTool(aggregates_path=path)._run(key="08901")
+    assert MarketAggregates.cached(path) is MarketAggregates.cached(path)
+
+
+def test_concurrent_ingests_keep_every_update(tmp_path, monkeypatch):
+    """Test that parallel ingests (separate history handles, as in separate processes) lose no updates."""
+    import threading
+    import time
+    from gangshit.aggregates import ingest_file
+
+    path = str(tmp_path / "agg.json")
+    monkeypatch.setattr(PropertyHistory, "state_of", lambda *args: pytest.fail("per-record lookups"))
+    load = MarketAggregates.load.__func__
+
+    def slow_load(cls, *args):
+        loaded = load(cls, *args)
+        time.sleep(0.05)  # widen the load -> save window
+        return loaded
+
+    monkeypatch.setattr(MarketAggregates, "load", classmethod(slow_load))
+
+    def ingest(n):
+        listings = tmp_path / f"listings{n}.csv"
+        listings.write_text("property_id,zip,distress_score\n" +
+                            "".join(f"p{n}-{i},89101,0.9\n" for i in range(5)))
+        ingest_file(str(listings), history=PropertyHistory(root=str(tmp_path / "history")),
+                    aggregates_path=path, parquet_root=str(tmp_path / "properties"))
+
+    threads = [threading.Thread(target=ingest, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert MarketAggregates.load(path).get("zip", "89101")["properties"] == 20
@@ -55,6 +55,27 @@ def test_task_creation():
     assert overlord_task is not None
     print("✅ Task creation test passed")
 
+def test_kickoff_handler_leaves_caller_inputs_alone(monkeypatch, tmp_path):
+    """Test that runs sharing one inputs dict (as train/test do) each get their own run_id and brief."""
+    from gangshit.crew import Gangshit
+
+    monkeypatch.chdir(tmp_path)
+    gangshit = Gangshit()
+    briefs = iter(f"brief {n}" for n in range(1, 4))
+    monkeypatch.setattr(gangshit, "_research_brief", lambda research, task_name="analyst_task": next(briefs))
+    inputs = {"topic": "NV"}
+    seen = []
+    for _ in range(2):
+        prepared = gangshit.before_kickoff_handler(inputs)
+        seen.append((prepared["run_id"], prepared["research_brief"]))
+        gangshit.after_kickoff_handler("done")
+
+    assert inputs == {"topic": "NV"}
+    assert seen[0][0] != seen[1][0]
+    assert [brief for _, brief in seen] == ["brief 1", "brief 2"]
+    assert gangshit.before_kickoff_handler({"topic": "NV", "run_id": "mine"})["run_id"] == "mine"
+    gangshit.after_kickoff_handler("done")
+
 if __name__ == "__main__":
     test_crew_configuration()
     test_agent_creation()
@@ -0,0 +1,70 @@
+"""Test near-duplicate filtering of search results."""
+
+import sys
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.dedup import compact_search_results, filter_items, similarity_matrix, minhash_signatures, source_tier
+
+NOTICE = "Notice of trustee sale: 123 Main St, Las Vegas NV 89101. Auction on March 3 at the Clark County courthouse."
+
+
+def test_source_tier():
+    """Test tier classification by domain."""
+    assert source_tier("https://www.census.gov/data") == 1
+    assert source_tier("https://www.huduser.gov/x") == 1
+    assert source_tier("https://www.attomdata.com/news") == 2
+    assert source_tier("https://random-blog.net/post") == 3
+
+
+def test_similarity_separates_duplicates():
+    """Test that syndicated text scores high and unrelated text low."""
+    texts = [NOTICE, NOTICE.replace("March 3", "March 3rd"), "Median home prices in Reno fell 2% last quarter."]
+    sim = similarity_matrix(minhash_signatures(texts))
+    assert sim[0][1] > 0.7
+    assert sim[0][2] < 0.2
+
+
+def test_numpy_and_python_signatures_agree(monkeypatch):
+    """Test that both MinHash backends compute identical signatures."""
+    import gangshit.dedup as dedup
+
+    texts = [NOTICE, "Median home prices in Reno fell 2% last quarter.", "tiny"]
+    vectorized = minhash_signatures(texts).tolist()
+    monkeypatch.setattr(dedup, "NUMPY_AVAILABLE", False)
+    assert minhash_signatures(texts) == vectorized
+
+
+def test_filter_keeps_best_tier_of_each_cluster():
+    """Test that the most authoritative copy of a duplicate survives."""
+    items = [
+        {"title": "Trustee sale", "link": "https://listings-blog.net/a", "snippet": NOTICE},
+        {"title": "Trustee sale", "link": "https://www.realtytrac.com/b", "snippet": NOTICE + " "},
+        {"title": "Reno prices", "link": "https://other.net/c", "snippet": "Median home prices in Reno fell 2%."},
+    ]
+    kept = filter_items(items, token_budget=None)
+    assert [item["link"] for item in kept] == ["https://www.realtytrac.com/b", "https://other.net/c"]
+    assert kept[0]["tier"] == 2
+
+
+def test_token_budget_caps_results():
+    """Test that results stop once the token budget is spent, keeping at least one."""
+    items = [{"title": f"Item {i}", "link": f"https://x{i}.net", "snippet": f"unique topic {i} " * 20} for i in range(5)]
+    assert len(filter_items(items, token_budget=1)) == 1
+    assert len(filter_items(items, token_budget=200)) < 5
+
+
+def test_compact_search_results():
+    """Test the agent-facing listing built from a Serper response."""
+    text = compact_search_results({
+        "searchParameters": {"q": "NV foreclosures"},
+        "organic": [
+            {"title": "Trustee sale", "link": "https://a.net", "snippet": NOTICE},
+            {"title": "Trustee sale", "link": "https://b.net", "snippet": NOTICE},
+        ],
+    }, token_budget=1000)
+    assert text.startswith("Results for: NV foreclosures")
+    assert text.count("Trustee sale") == 1
+    assert "1 near-duplicate" in text
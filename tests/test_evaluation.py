@@ -0,0 +1,64 @@
+"""Test aggregation for parallel crew evaluation."""
+
+import json
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.evaluation import inputs_key, iteration_seed, mean_ci, render_report, summarize
+
+
+def test_mean_ci():
+    """Test the t-based confidence interval."""
+    stat = mean_ci([8.0, 9.0, 10.0])
+    assert stat["mean"] == pytest.approx(9.0)
+    assert stat["ci_low"] == pytest.approx(9.0 - 4.303 * 1.0 / 3 ** 0.5)
+    wide = mean_ci([float(v) for v in range(36)])  # df 35 falls back to the df 30 value
+    assert wide["ci_high"] - wide["mean"] == pytest.approx(2.042 * statistics.stdev(range(36)) / 36 ** 0.5)
+    assert mean_ci([7.0])["ci_low"] is None
+    assert mean_ci([])["mean"] is None
+
+
+def test_summarize_and_report():
+    """Test per-task aggregation, failed iterations and the Markdown report."""
+    results = [
+        {"iteration": 2, "seed": iteration_seed(2), "scores": [8.0, 6.0], "task_seconds": [1, 2], "wall_seconds": 30.0},
+        {"iteration": 1, "seed": iteration_seed(1), "scores": [9.0, 7.0], "task_seconds": [1, 2], "wall_seconds": 20.0},
+        {"iteration": 3, "seed": iteration_seed(3), "error": "ConnectionError: ollama down", "wall_seconds": 1.0},
+    ]
+    summary = summarize(results)
+    assert [r["iteration"] for r in summary["runs"]] == [1, 2]
+    assert summary["task_scores"][0]["mean"] == pytest.approx(8.5)
+    assert summary["overall_score"]["mean"] == pytest.approx(7.5)
+    assert summary["failed"] == [{"iteration": 3, "error": "ConnectionError: ollama down"}]
+
+    report = render_report(summary, ["analyst_task", "coding_task"])
+    assert "| analyst_task | 2 |" in report and "ollama down" in report
+
+
+def test_inputs_key_ignores_run_id():
+    """Test that cached upstream output is shared across runs with identical inputs."""
+    assert inputs_key({"topic": "NV", "run_id": "a"}) == inputs_key({"topic": "NV", "run_id": "b"})
+    assert inputs_key({"topic": "NV"}) != inputs_key({"topic": "AZ"})
+    assert inputs_key({"topic": "NV"}, {"model": "llama3.2"}) != inputs_key({"topic": "NV"}, {"model": "gemma2:2b"})
+
+
+def test_research_fingerprint_and_filtered_brief():
+    """Test that cached research is keyed by model and prompts, and the brief is filtered by needs."""
+    from gangshit.crew import Gangshit
+    from gangshit.evaluation import research_fingerprint
+
+    gangshit = Gangshit()
+    fingerprint = research_fingerprint(gangshit, gangshit.researcher(), gangshit.research_task())
+    assert fingerprint["model"] == gangshit.gemma3.model and fingerprint["task"]["description"]
+
+    if "research_task" in gangshit.handoff_specs:
+        fields = list(gangshit.handoff_specs["research_task"]["fields"])
+        needed = gangshit.handoff_specs["analyst_task"]["needs"]["research_task"]
+        brief = json.loads(gangshit._research_brief(json.dumps({name: f"{name} text" for name in fields})))
+        assert set(brief) == set(needed)
@@ -0,0 +1,66 @@
+"""Test structured extraction of research reports."""
+
+import csv
+import sys
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.extraction import extract_facts, parse_tables, structure_report
+
+REPORT = """# Research Report
+
+## Executive Summary
+Foreclosure filings rose in Clark County this quarter.
+
+## Findings
+- Filings rose 12% year over year [ATTOM](https://www.attomdata.com/news). Auctions are up too [RealtyTrac](https://www.realtytrac.com).
+- Inventory is flat.
+
+## Tables
+| ZIP | Filings | Median Equity | Judicial? | Notes |
+|-----|--------:|---------------|-----------|-------|
+| 89101 | 1,204 | 31.5% | no | pipe \\| inside |
+| 89102 | 87 | n/a | yes | |
+"""
+
+
+def test_parse_tables_types_columns():
+    """Test that table cells are typed per column."""
+    [table] = parse_tables(REPORT)
+    assert table.title == "Tables"
+    assert table.columns == ["zip", "filings", "median_equity", "judicial", "notes"]
+    assert table.rows[0] == {"zip": "89101", "filings": 1204, "median_equity": 31.5,
+                             "judicial": False, "notes": "pipe | inside"}
+    assert table.rows[1]["median_equity"] is None and table.rows[1]["judicial"] is True
+
+
+def test_zero_padded_codes_stay_text():
+    """Test that code columns are text regardless of values and zero-padded values stay text."""
+    [table] = parse_tables("| ZIP | FIPS | Parcel ID | Filings | Share |\n|---|---|---|---|---|\n"
+                           "| 08901 | 34023 | 123 | 012 | 0.5 |\n| 89101 | 32003 | 456 | 7 | 0.25 |\n")
+    assert [row["zip"] for row in table.rows] == ["08901", "89101"]
+    assert table.rows[0]["fips"] == "34023" and table.rows[0]["parcel_id"] == "123"
+    assert table.rows[0]["share"] == 0.5 and table.rows[0]["filings"] == "012"
+    [other] = parse_tables("| Tract | County Code |\n|---|---|\n| 1234 | 3 |\n")
+    assert other.rows == [{"tract": "1234", "county_code": "3"}]
+
+
+def test_extract_facts_per_sentence():
+    """Test that each cited sentence becomes one fact."""
+    facts = extract_facts(REPORT)
+    assert [f.source for f in facts] == ["ATTOM", "RealtyTrac"]
+    assert facts[0].text == "Filings rose 12% year over year ATTOM."
+
+
+def test_structure_report_writes_data_and_digest(tmp_path):
+    """Test the post-task stage end to end."""
+    out_dir = tmp_path / "data"
+    compact = structure_report(REPORT, out_dir)
+    assert compact.startswith("Summary: Foreclosure filings rose")
+    assert "zip,filings,median_equity,judicial,notes" in compact
+    with open(out_dir / "01_tables.csv", newline="") as f:
+        assert list(csv.DictReader(f))[0]["filings"] == "1204"
+    assert (out_dir / "facts.csv").exists()
+    assert structure_report("plain prose only", out_dir) == "plain prose only"
@@ -0,0 +1,166 @@
+"""Test the research fan-out mode."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.fanout import merge_reports, run_fanout, split_topic
+
+CLARK = """## Executive Summary
+Clark County filings are rising.
+
+## Findings
+- Filings up 12% [ATTOM](https://attom.com/a)
+- Auctions doubled
+
+## Tables
+| County | Filings |
+|---|---|
+| Clark | 1204 |
+"""
+WASHOE = """## Summary
+Washoe is stable.
+
+## Key Findings
+- filings up 12% [ATTOM](https://attom.com/a)
+
+## Data Tables
+| County | Filings |
+|---|---|
+| Clark | 1204 |
+| Washoe | 87 |
+"""
+
+
+def test_split_topic():
+    """Test sub-query selection from counties, explicit sub-topics and defaults."""
+    assert split_topic("NV", 2, {"counties": ["Clark", "Washoe", "Nye"]}) == [
+        "NV — focus on Clark", "NV — focus on Washoe"]
+    assert split_topic("NV", 5, {"research_subtopics": ["a", "b"]}) == ["a", "b"]
+    assert len(split_topic("NV", 3)) == 3
+    assert len(split_topic("NV", 8)) == 4  # capped at the default sources
+
+
+def test_split_topic_crosses_counties_with_sources():
+    """Test that asking for more sub-queries than counties splits each county by source."""
+    queries = split_topic("NV", 5, {"counties": ["Clark", "Washoe"]})
+    assert len(queries) == 5 and len(set(queries)) == 5
+    assert queries[0].endswith("Clark, county recorder and assessor records")
+    assert queries[1].endswith("Washoe, county recorder and assessor records")
+    assert len(split_topic("NV", 20, {"counties": ["Clark", "Washoe"]})) == 8
+
+
+def test_merge_dedupes_into_report_shape():
+    """Test that merged sections keep the standard order and drop duplicates."""
+    merged = merge_reports([("clark", CLARK), ("washoe", WASHOE)])
+    headings = [l for l in merged.splitlines() if l.startswith("## ")]
+    assert headings == ["## Executive Summary", "## Key Findings", "## Data Tables", "## Sub-queries"]
+    assert merged.count("Filings up 12%") + merged.count("filings up 12%") == 1
+    assert merged.count("| Clark | 1204 |") == 1 and "| Washoe | 87 |" in merged
+
+
+def test_merge_keeps_paragraph_breaks():
+    """Test that paragraphs stay separated by a single blank line."""
+    report = "## Summary\nFirst paragraph.\n\n\nSecond paragraph.\n"
+    merged = merge_reports([("a", report), ("b", "## Summary\nThird paragraph.\n")])
+    assert "First paragraph.\n\nSecond paragraph.\n\nThird paragraph.\n" in merged
+
+
+def test_run_fanout_is_concurrent_and_tolerates_failures():
+    """Test that sub-tasks overlap in time and a failing one is reported, not fatal."""
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def subtask(query):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        if "Washoe" in query:
+            raise RuntimeError("rate limited")
+        return CLARK
+
+    merged = run_fanout("NV", subtask, parts=3, inputs={"counties": ["Clark", "Washoe", "Nye"]}, slots=3)
+    assert peak[0] == 3
+    assert "## Notes" in merged and "rate limited" in merged
+
+    with pytest.raises(RuntimeError):
+        run_fanout("NV", lambda q: 1 / 0, parts=2, slots=2)
+
+
+def test_crew_drops_research_task_in_fanout_mode(monkeypatch):
+    """Test that fan-out mode assembles the crew without research_task."""
+    monkeypatch.setenv("GANGSHIT_RESEARCH_FANOUT", "3")
+    from gangshit.crew import Gangshit
+
+    crew = Gangshit().gangshit_crew()
+    assert [t.name for t in crew.tasks] == ["analyst_task", "coding_task", "overlord_task"]
+
+
+def test_fanout_research_merges_stubbed_subqueries(monkeypatch, tmp_path):
+    """Test the crew's fan-out step end to end with stubbed sub-query crews."""
+    monkeypatch.setenv("GANGSHIT_RESEARCH_FANOUT", "2")
+    monkeypatch.chdir(tmp_path)
+    from gangshit.crew import Gangshit
+
+    gangshit = Gangshit()
+    gangshit.run_id = "fanout-test"
+    queries = []
+    monkeypatch.setattr(gangshit, "_run_research_subquery",
+                        lambda query, inputs: queries.append(query) or (CLARK if "Clark" in query else WASHOE))
+    brief = gangshit._fanout_research({"topic": "NV", "counties": ["Clark", "Washoe"]})
+
+    assert len(queries) == 2
+    saved = (tmp_path / "results" / "runs" / "fanout-test" / "research_report.md").read_text()
+    assert "| Washoe | 87 |" in saved and "## Sub-queries" in saved
+    assert brief
+
+
+def test_prefetched_brief_reaches_every_task_that_needs_research(monkeypatch, tmp_path):
+    """Test that tasks needing the dropped research_task (e.g. the overlord) get their own filtered brief."""
+    import json
+    from gangshit.crew import Gangshit
+
+    monkeypatch.chdir(tmp_path)
+    gangshit = Gangshit()
+    if "research_task" not in gangshit.handoff_specs:
+        pytest.skip("typed handoff disabled")
+    fields = list(gangshit.handoff_specs["research_task"]["fields"])
+    gangshit.research_brief = json.dumps({name: f"{name} text" for name in fields})
+    crew = gangshit.gangshit_crew()
+
+    overlord = next(t for t in crew.tasks if t.name == "overlord_task")
+    assert "{overlord_task_research_brief}" in overlord.description
+    assert "research_task" not in [t.name for t in overlord.context]
+
+    inputs = gangshit.before_kickoff_handler({"topic": "NV"})
+    gangshit.after_kickoff_handler("done")
+    needed = gangshit.handoff_specs["overlord_task"]["needs"]["research_task"]
+    assert set(json.loads(inputs["overlord_task_research_brief"])) == set(needed)
+    assert set(json.loads(inputs["research_brief"])) == set(gangshit.handoff_specs["analyst_task"]["needs"]["research_task"])
+    overlord.interpolate_inputs_and_add_conversation_history(inputs)
+    assert "executive_summary text" in overlord.description
+
+
+def test_fanout_warns_when_fewer_subqueries_than_requested(monkeypatch, tmp_path):
+    """Test that a fan-out capped by the available sub-queries is reported as a warning."""
+    import logging
+    import gangshit.crew as crew_module
+
+    monkeypatch.setenv("GANGSHIT_RESEARCH_FANOUT", "6")
+    monkeypatch.chdir(tmp_path)
+    reports = []
+    monkeypatch.setattr(crew_module, "report", lambda component, message, level=logging.INFO, **fields:
+                        reports.append((level, fields)))
+    gangshit = crew_module.Gangshit()
+    gangshit.run_id = "capped"
+    monkeypatch.setattr(gangshit, "_run_research_subquery", lambda query, inputs: CLARK)
+    gangshit._fanout_research({"topic": "NV"})
+    assert (logging.WARNING, {"run_id": "capped", "requested": 6, "produced": 4}) in reports
@@ -0,0 +1,116 @@
+"""Test the offline geocoder."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.geocoder import Gazetteer, Geocoder, geocode_records, normalize_street, parse_address
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    ranges = tmp_path / "ranges.csv"
+    ranges.write_text(
+        "street,from_addr,to_addr,start_lat,start_lon,end_lat,end_lon,zip\n"
+        "Main Street,100,198,36.0,-115.0,36.0,-115.1,89101\n"
+        "Main Street,101,199,36.001,-115.0,36.001,-115.1,89101\n"
+        "North Maple Avenue,1,99,36.1,-115.2,36.2,-115.2,89102\n"
+    )
+    points = tmp_path / "points.csv"
+    points.write_text("number,street,lat,lon,zip\n150,Main St,35.5,-114.5,89101\n")
+    gazetteer = Gazetteer()
+    assert gazetteer.load_ranges(str(ranges)) == 3
+    assert gazetteer.load_points(str(points)) == 1
+    return gazetteer
+
+
+def test_normalize_and_parse():
+    """Test street normalization and address parsing."""
+    assert normalize_street("north Maple avenue.") == "N MAPLE AVE"
+    assert parse_address("124 Main Street, Las Vegas, NV 89101") == (124, "MAIN ST", "89101")
+    assert parse_address("PO Box 12") is None
+    assert parse_address("124 Main St Las Vegas NV 89101") == (124, "MAIN ST", "89101")
+    assert parse_address("124 Park Ave W Reno NV") == (124, "PARK AVE W", None)
+    assert parse_address("124 Oak Ct") == (124, "OAK CT", None)
+
+
+def test_interpolation_and_parity(gazetteer):
+    """Test interpolation along the matching side of the street."""
+    even = gazetteer.lookup(149 - 1, "MAIN ST", "89101")
+    odd = gazetteer.lookup(149, "MAIN ST", "89101")
+    assert even.quality == odd.quality == "interpolated"
+    assert even.lat == pytest.approx(36.0) and odd.lat == pytest.approx(36.001)
+    assert odd.lon == pytest.approx(-115.0 - 0.1 * 48 / 98)
+
+
+def test_points_and_prefix_match(gazetteer):
+    """Test exact address points and suffix-less street matches."""
+    assert gazetteer.lookup(150, "MAIN ST").quality == "point"
+    assert gazetteer.lookup(51, "N MAPLE", None).lat == pytest.approx(36.1 + 0.1 * 50 / 98)
+    assert gazetteer.lookup(500, "MAIN ST") is None
+
+
+def test_cache_and_records(gazetteer, tmp_path):
+    """Test batch geocoding through the persistent cache."""
+    cache = str(tmp_path / "cache.sqlite")
+    geocoder = Geocoder(gazetteer, cache_path=cache)
+    first = geocoder.geocode_many(["124 Main St 89101", "9 Nowhere Rd", "no number"])
+    assert first[0].quality == "interpolated" and first[1] is None and first[2] is None
+    geocoder.close()
+
+    cached = Geocoder(gazetteer, cache_path=cache)
+    lookup = gazetteer.lookup
+    gazetteer.lookup = lambda *args: pytest.fail("cache hit expected")
+    assert cached.geocode("124 Main St 89101") == first[0]
+    gazetteer.lookup = lookup
+
+    records = geocode_records([{"property_id": "p1", "address": "124 Main St 89101"},
+                               {"property_id": "p2", "lat": 1.0, "lon": 2.0}], cached)
+    assert records[0]["lat"] == first[0].lat and records[1]["lat"] == 1.0
+
+
+def test_cached_misses_retry_after_gazetteer_update(gazetteer, tmp_path, monkeypatch):
+    """Test that a miss is looked up again once the gazetteer changes or the miss expires."""
+    cache = str(tmp_path / "cache.sqlite")
+    assert Geocoder(gazetteer, cache_path=cache).geocode("5 Elm St 89101") is None
+
+    version = gazetteer.version
+    gazetteer.add_segment("Elm Street", 1, 99, (36.3, -115.3), (36.4, -115.3), "89101")
+    assert gazetteer.version != version
+    assert Geocoder(gazetteer, cache_path=cache).geocode("5 Elm St 89101").quality == "interpolated"
+
+    calls = []
+    lookup = gazetteer.lookup
+    monkeypatch.setattr(gazetteer, "lookup", lambda *args: calls.append(args) or lookup(*args))
+    for miss_ttl, expected in ((3600, 1), (0, 3)):
+        geocoder = Geocoder(gazetteer, cache_path=cache, miss_ttl=miss_ttl)
+        geocoder.geocode("7 Birch St")
+        geocoder.geocode("7 Birch St")
+        assert len(calls) == expected
+
+
+def test_cached_hits_expire_with_the_gazetteer(gazetteer, tmp_path):
+    """Test that a cached hit is not served once the gazetteer it came from changes."""
+    cache = str(tmp_path / "cache.sqlite")
+    first = Geocoder(gazetteer, cache_path=cache).geocode("124 Main St 89101")
+    assert first is not None
+    assert Geocoder(Gazetteer(), cache_path=cache).geocode("124 Main St 89101") is None
+
+
+def test_ingest_geocodes_records_into_geohash_cells(gazetteer, tmp_path):
+    """Test that ingest fills coordinates before the history and aggregates see the records."""
+    from gangshit.aggregates import MarketAggregates, ingest_file
+    from gangshit.history import PropertyHistory
+
+    listings = tmp_path / "listings.csv"
+    listings.write_text("property_id,address,zip,distress_score\np1,124 Main St 89101,89101,0.9\n")
+    history = PropertyHistory(root=str(tmp_path / "history"))
+    path = str(tmp_path / "agg.json")
+    ingest_file(str(listings), history=history, aggregates_path=path, parquet_root=str(tmp_path / "properties"),
+                geocoder=Geocoder(gazetteer, cache_path=str(tmp_path / "cache.sqlite")))
+    assert history.state_of("p1")["geocode_quality"] == "interpolated"
+    assert MarketAggregates.load(path).rows("geohash")[0]["properties"] == 1
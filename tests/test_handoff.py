@@ -0,0 +1,74 @@
+"""Test typed task handoffs."""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crewai.tasks.task_output import TaskOutput
+
+from gangshit.handoff import HandoffTask, dumps, handoff_model, load_specs, parse_handoff
+
+TASKS_YAML = Path(__file__).parent.parent / "src" / "gangshit" / "config" / "tasks.yaml"
+RESEARCH = """# Nevada Foreclosures
+
+## Executive Summary
+Filings are rising in Clark County.
+
+## Key Findings
+- Filings up 12% [ATTOM](https://attom.com/a)
+
+### Regional detail
+Washoe is flat.
+
+## Data Tables
+| County | Filings |
+|---|---|
+| Clark | 1204 |
+"""
+
+
+def test_load_specs_from_tasks_yaml():
+    """Test fields from expected_output.contents and declared needs."""
+    specs = load_specs(str(TASKS_YAML))
+    assert list(specs["research_task"]["fields"]) == [
+        "executive_summary", "findings", "stakeholders", "recommendations", "tables"]
+    assert specs["overlord_task"]["needs"]["research_task"] == ["executive_summary", "recommendations"]
+    for name, spec in specs.items():
+        for upstream, fields in spec["needs"].items():
+            assert set(fields) <= set(specs[upstream]["fields"]), (name, upstream)
+
+
+def test_parse_markdown_and_json():
+    """Test heading matching, unmatched subsections and the JSON round trip."""
+    model = handoff_model("research_task", load_specs(str(TASKS_YAML))["research_task"]["fields"])
+    handoff = parse_handoff(model, RESEARCH)
+    assert handoff.executive_summary == "Filings are rising in Clark County."
+    assert "Filings up 12%" in handoff.findings and "Washoe is flat." in handoff.findings
+    assert handoff.tables.startswith("| County |") and handoff.stakeholders == ""
+    assert parse_handoff(model, dumps(handoff)) == handoff
+    assert json.loads(dumps(handoff, ["tables"])) == {"tables": handoff.tables}
+
+    assert parse_handoff(model, "no headings at all").executive_summary == "no headings at all"
+
+
+def test_downstream_context_has_only_needed_fields(tmp_path):
+    """Test that a downstream task sees just the declared upstream fields."""
+    fields = {"executive_summary": "", "findings": "", "tables": ""}
+    research = HandoffTask(description="research", expected_output="report", name="research_task",
+                           handoff_fields=fields)
+    research.output = TaskOutput(description="research", raw=RESEARCH, agent="Researcher")
+    analyst = HandoffTask(description="analyze", expected_output="spec", name="analyst_task",
+                          context=[research], handoff_needs={"research_task": ["executive_summary"]})
+
+    context = json.loads(analyst.handoff_context("FULL MARKDOWN"))
+    assert context == {"research_task": {"executive_summary": "Filings are rising in Clark County."}}
+
+    research.output_file = str(tmp_path / "research_report.md")
+    research._save_handoff()
+    assert json.loads((tmp_path / "research_task_handoff.json").read_text())["tables"].startswith("| County |")
+
+    # without declared needs the default crewAI context is kept
+    assert HandoffTask(description="x", expected_output="y", context=[research]).handoff_context("D") == "D"
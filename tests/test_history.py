@@ -0,0 +1,111 @@
+"""Test delta-encoded property history and versioned reports."""
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.history import PropertyHistory, publish_run_reports
+from gangshit.tools import PropertyHistoryTool
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _history(tmp_path):
+    history = PropertyHistory(root=str(tmp_path / "history"))
+    history.record_snapshot([
+        {"property_id": "p1", "zip": "89101", "distress_score": 0.2},
+        {"property_id": "p2", "zip": "89101", "distress_score": 0.9},
+    ], taken_at=T0)
+    history.record_snapshot([
+        {"property_id": "p1", "zip": "89101", "distress_score": 0.8},
+        {"property_id": "p2", "zip": "89101", "distress_score": 0.9},
+    ], taken_at=T0 + timedelta(days=10))
+    return history
+
+
+def test_snapshots_store_only_changes(tmp_path):
+    """Test that unchanged fields are not written again."""
+    history = _history(tmp_path)
+    lines = history.log_path.read_text().splitlines()
+    delta = json.loads(lines[1])
+    assert delta["ids"] == ["p1"]
+    assert delta["cols"] == {"distress_score": [[0, 0.8]]}
+
+
+def test_as_of_and_reload(tmp_path):
+    """Test as-of queries, including after reopening the log."""
+    _history(tmp_path)
+    history = PropertyHistory(root=str(tmp_path / "history"))
+    assert history.as_of(T0 + timedelta(days=1))["p1"]["distress_score"] == 0.2
+    assert history.current()["p1"]["distress_score"] == 0.8
+    assert history.as_of(T0 - timedelta(days=1)) == {}
+
+
+def test_became_distressed_window(tmp_path):
+    """Test detection of properties that crossed into distress."""
+    history = _history(tmp_path)
+    crossed = history.became_distressed(since=T0 + timedelta(days=1), until=T0 + timedelta(days=30))
+    assert list(crossed) == ["p1"]
+    assert history.became_distressed(since=T0 + timedelta(days=11), until=T0 + timedelta(days=30)) == {}
+
+
+def test_trend_and_removal(tmp_path):
+    """Test bucketed trends and removal of properties missing from a complete snapshot."""
+    history = _history(tmp_path)
+    history.record_snapshot([{"property_id": "p2", "zip": "89101", "distress_score": 0.9}],
+                            taken_at=T0 + timedelta(days=20), complete=True)
+    rows = history.trend(T0, T0 + timedelta(days=21), bucket=timedelta(days=7))
+    assert [row["distressed"] for row in rows] == [1, 2, 1]
+    assert history.series("p1") == [(T0, 0.2), (T0 + timedelta(days=10), 0.8),
+                                     (T0 + timedelta(days=20), None)]
+
+
+def test_trend_single_point(tmp_path):
+    """Test that a trend over an empty window returns the state at that instant."""
+    history = _history(tmp_path)
+    rows = history.trend(T0 + timedelta(days=10), T0 + timedelta(days=10))
+    assert [(row["until"], row["distressed"]) for row in rows] == [(T0 + timedelta(days=10), 2)]
+
+
+def test_handles_share_one_log(tmp_path):
+    """Test that two handles (as in two processes) see each other's appends."""
+    first = _history(tmp_path)
+    second = PropertyHistory(root=str(tmp_path / "history"))
+    second.record_snapshot([{"property_id": "p3", "distress_score": 0.95}], taken_at=T0 + timedelta(days=15))
+    assert first.state_of("p3") == {"distress_score": 0.95}
+    first.record_snapshot([{"property_id": "p3", "distress_score": 0.1}], taken_at=T0 + timedelta(days=16))
+    seqs = [json.loads(line)["seq"] for line in first.log_path.read_text().splitlines()]
+    assert seqs == [0, 1, 2, 3]
+    assert second.current()["p3"]["distress_score"] == 0.1
+    assert list(second.became_distressed(since=T0 + timedelta(days=11), until=T0 + timedelta(days=30))) == ["p3"]
+
+
+def test_history_tool_lists_recently_distressed(tmp_path):
+    """Test the agent tool over a history with a recent distress crossing."""
+    now = datetime.now(timezone.utc)
+    history = PropertyHistory(root=str(tmp_path / "history"))
+    history.record_snapshot([{"property_id": "p1", "zip": "89101", "distress_score": 0.2}],
+                            taken_at=now - timedelta(days=40))
+    history.record_snapshot([{"property_id": "p1", "zip": "89101", "distress_score": 0.8}],
+                            taken_at=now - timedelta(days=5))
+    tool = PropertyHistoryTool(history_root=str(tmp_path / "history"))
+    output = tool._run(query="became_distressed", days=30)
+    assert output.startswith("1 properties became distressed") and "| p1 |" in output and "| 89101 | 0.8 |" in output
+    assert tool._run(days=3).startswith("No properties")
+    assert tool._run(query="trend", days=14, bucket_days=7).count("\n") == 3
+    assert tool._run(query="nope").startswith("Unknown query")
+
+
+def test_publish_run_reports(tmp_path):
+    """Test that a run's reports are versioned and published as latest."""
+    run_dir = tmp_path / "results" / "runs" / "run-1"
+    run_dir.mkdir(parents=True)
+    (run_dir / "research_report.md").write_text("# Report")
+    published = publish_run_reports("run-1", results_dir=str(tmp_path / "results"))
+    assert [p.name for p in published] == ["research_report.md"]
+    assert (tmp_path / "results" / "research_report.md").read_text() == "# Report"
+    assert "run-1" in (tmp_path / "results" / "runs" / "index.jsonl").read_text()
@@ -0,0 +1,133 @@
+"""Test the SQLite-backed durable job queue."""
+
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.job_queue import JobQueue, LeaseLost, check_lease, run_worker
+
+
+def test_lease_complete_and_idempotent_enqueue(tmp_path):
+    """Test the happy path and duplicate submissions."""
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    job_id = queue.enqueue({"inputs": {"topic": "NV"}}, key="nv-1")
+    assert queue.enqueue({"inputs": {"topic": "NV"}}, key="nv-1") is None
+
+    lease = queue.lease("w1")
+    assert lease.job_id == job_id and lease.payload == {"inputs": {"topic": "NV"}} and lease.attempt == 1
+    assert queue.lease("w2") is None
+    assert queue.heartbeat(lease)
+    assert queue.complete(lease, "report")
+    assert queue.get(job_id)["status"] == "done"
+    assert queue.stats() == {"done": 1}
+
+
+def test_expired_lease_is_reclaimed_and_fenced(tmp_path):
+    """Test crash recovery: a stale worker cannot complete a reclaimed job."""
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), lease_seconds=0.05)
+    queue.enqueue({"n": 1})
+    stale = queue.lease("crashed")
+    time.sleep(0.1)
+    fresh = queue.lease("w2")
+    assert fresh.job_id == stale.job_id and fresh.attempt == 2
+    assert not queue.heartbeat(stale)
+    assert not queue.complete(stale, "late")
+    assert queue.complete(fresh, "ok")
+    assert queue.get(fresh.job_id)["result"] == "ok"
+
+
+def test_retries_with_backoff_then_dead_letter(tmp_path):
+    """Test retry scheduling, dead-lettering and requeue."""
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), backoff_base=0.0)
+    job_id = queue.enqueue({"n": 1}, max_attempts=2)
+    assert queue.fail(queue.lease("w"), "boom") == "queued"
+    assert queue.fail(queue.lease("w"), "boom again") == "dead"
+    assert queue.lease("w") is None
+    assert [job["id"] for job in queue.dead_letters()] == [job_id]
+
+    assert queue.requeue(job_id)
+    assert queue.lease("w").attempt == 3
+
+    slow = JobQueue(str(tmp_path / "slow.sqlite"), backoff_base=60)
+    slow.enqueue({"n": 2})
+    slow.fail(slow.lease("w"), "boom")
+    assert slow.lease("w") is None  # still backing off
+
+
+def test_run_worker_processes_queue(tmp_path):
+    """Test the worker loop with a handler that fails once."""
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), backoff_base=0.0)
+    for n in range(3):
+        queue.enqueue({"n": n})
+    calls = []
+
+    def handler(payload):
+        calls.append(payload["n"])
+        if calls.count(payload["n"]) == 1 and payload["n"] == 1:
+            raise RuntimeError("transient")
+        return payload["n"] * 10
+
+    assert run_worker(queue, handler, owner="t", exit_when_idle=True) == 3
+    assert sorted(calls) == [0, 1, 1, 2]
+    assert queue.stats() == {"done": 3}
+
+
+def test_heartbeat_retries_when_database_is_locked(tmp_path):
+    """Test that a transiently locked database does not cost the worker its lease."""
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), lease_seconds=1.5)
+    queue.enqueue({"n": 1})
+    renew, failures = queue.heartbeat, [2]
+
+    def flaky_heartbeat(lease):
+        if failures[0]:
+            failures[0] -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return renew(lease)
+
+    queue.heartbeat = flaky_heartbeat
+
+    def handler(payload):
+        deadline = time.time() + 2.0
+        while time.time() < deadline:
+            check_lease()
+            time.sleep(0.05)
+        return "ok"
+
+    assert run_worker(queue, handler, owner="t", exit_when_idle=True) == 1
+    assert failures == [0] and queue.stats() == {"done": 1}
+
+
+def test_lost_lease_stops_handler_and_leaves_job_for_retry(tmp_path):
+    """Test that a worker that cannot renew its lease stops and does not complete the job."""
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), lease_seconds=0.3)
+    job_id = queue.enqueue({"n": 1})
+    renew = queue.heartbeat
+
+    def broken_first_attempt(lease):
+        if lease.attempt == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return renew(lease)
+
+    queue.heartbeat = broken_first_attempt
+    attempts, stopped = [], []
+
+    def handler(payload):
+        attempts.append(queue.get(job_id)["attempts"])
+        if len(attempts) > 1:
+            return "second"
+        try:
+            while True:
+                check_lease()
+                time.sleep(0.02)
+        except LeaseLost:
+            stopped.append(True)
+            raise
+
+    assert run_worker(queue, handler, owner="t", exit_when_idle=True) == 1
+    assert attempts == [1, 2] and stopped == [True]
+    job = queue.get(job_id)
+    assert job["status"] == "done" and job["result"] == "second" and job["last_error"] is None
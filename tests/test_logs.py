@@ -0,0 +1,85 @@
+"""Test quiet-mode structured logging."""
+
+import io
+import json
+import logging
+import queue
+import sys
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.logs import (
+    BoundedQueueHandler,
+    SampleFilter,
+    configure_logging,
+    quiet_mode,
+    report,
+    shutdown_logging,
+    truncate,
+)
+
+
+def _records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_truncate_nested_payloads():
+    """Test long strings and lists are shortened, small values kept."""
+    assert truncate("x" * 10, 4) == "xxxx…[+6 chars]"
+    assert truncate({"a": ["y" * 8], "n": 3, "none": None}, 5) == {"a": ["yyyyy…[+3 chars]"], "n": 3, "none": None}
+    assert truncate(list(range(25)))[-1] == "…[+5 items]"
+
+
+def test_sample_filter_keeps_warnings():
+    """Test sampling drops a share of INFO records but never warnings."""
+    sampler = SampleFilter({"events": 0.25})
+    info = [logging.LogRecord("gangshit.events", logging.INFO, "", 0, "m", None, None) for _ in range(8)]
+    warning = logging.LogRecord("gangshit.events", logging.WARNING, "", 0, "m", None, None)
+    other = logging.LogRecord("gangshit.crew", logging.INFO, "", 0, "m", None, None)
+    assert sum(sampler.filter(r) for r in info) == 2
+    assert sampler.filter(warning) and sampler.filter(other)
+
+
+def test_bounded_queue_drops_instead_of_blocking():
+    """Test a full queue counts dropped records and queued payloads are already truncated."""
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, max_chars=10)
+    for _ in range(5):
+        record = logging.LogRecord("gangshit.crew", logging.INFO, "", 0, "Output: " + "x" * 10_000, None, None)
+        record.fields = {"output": "y" * 10_000}
+        handler.handle(record)
+    assert handler.dropped == 3
+    queued = log_queue.get_nowait()
+    assert len(queued.msg) < 40 and len(queued.fields["output"]) < 40
+
+
+def test_verbose_mode_prints(monkeypatch, capsys):
+    """Test the default mode keeps console output unchanged."""
+    monkeypatch.delenv("GANGSHIT_LOG_MODE", raising=False)
+    assert not quiet_mode()
+    assert configure_logging(force=True) is None
+    report("crew", "🚀 Starting crew", run=1)
+    assert capsys.readouterr().out == "🚀 Starting crew\n"
+
+
+def test_quiet_mode_json_lines(monkeypatch, capsys):
+    """Test quiet mode writes truncated JSON with component levels applied."""
+    monkeypatch.setenv("GANGSHIT_LOG_MODE", "quiet")
+    monkeypatch.setenv("GANGSHIT_LOG_MAX_CHARS", "20")
+    monkeypatch.setenv("GANGSHIT_LOG_LEVELS", "events=WARNING")
+    stream = io.StringIO()
+    try:
+        configure_logging(stream=stream, force=True)
+        report("queue", "✅ Job finished", job_id="abc", output="z" * 100)
+        report("events", "Agent done")
+        report("events", "⚠️  Slow agent", logging.WARNING)
+    finally:
+        shutdown_logging()
+        logging.getLogger("gangshit.events").setLevel(logging.NOTSET)
+    assert capsys.readouterr().out == ""
+    first, second = _records(stream)
+    assert first["component"] == "queue" and first["msg"] == "Job finished"
+    assert first["job_id"] == "abc" and first["output"].startswith("z" * 20 + "…")
+    assert second["level"] == "WARNING" and second["msg"] == "Slow agent"
@@ -0,0 +1,76 @@
+"""Test the hierarchical manager policy and management accounting."""
+
+import contextvars
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crewai import LLM, Process
+from crewai.events import LLMCallCompletedEvent, LLMCallStartedEvent, ToolUsageStartedEvent, crewai_event_bus
+from crewai.events.types.llm_events import LLMCallType
+
+from gangshit.manager_policy import ManagementLedger, budgeted_manager, process_kwargs
+from gangshit.profiling import bind_run
+
+
+class _Task:
+    def __init__(self, agent):
+        self.agent = agent
+
+
+def test_process_selection():
+    """Test direct execution, the capped manager and crewAI's default manager."""
+    llm = LLM(model="llama3.2", base_url="http://localhost:11434")
+    assigned = [_Task("researcher"), _Task("analyst")]
+    assert process_kwargs(assigned, llm, mode="auto") == {"process": Process.sequential}
+
+    capped = process_kwargs(assigned + [_Task(None)], llm, mode="auto")
+    assert capped["process"] == Process.hierarchical
+    manager = capped["manager_agent"]
+    assert manager.allow_delegation and manager.max_iter == 3 and manager.llm.max_tokens == 1000
+    assert llm.max_tokens is None  # the shared LLM is not modified
+
+    assert process_kwargs(assigned, llm, mode="full") == {"process": Process.hierarchical, "manager_llm": llm}
+    assert budgeted_manager(llm, max_rounds=2, max_tokens=100).llm.max_tokens == 64
+
+
+def test_ledger_splits_management_and_work(tmp_path):
+    """Test call counts, delegations and the written summary."""
+    ledger = ManagementLedger().start()
+    for role in ("Crew Manager", "Researcher", "Crew Manager"):
+        crewai_event_bus.emit(None, LLMCallStartedEvent(model="m", messages=[], agent_role=role,
+                                                        task_name="research_task"))
+        crewai_event_bus.emit(None, LLMCallCompletedEvent(response="x" * 40, call_type=LLMCallType.LLM_CALL))
+    crewai_event_bus.emit(None, ToolUsageStartedEvent(tool_name="Delegate work to coworker", tool_args={},
+                                                      task_name="research_task"))
+    summary = ledger.stop(str(tmp_path / "management.json"))
+
+    row = summary["tasks"]["research_task"]
+    assert row["management_calls"] == 2 and row["work_calls"] == 1 and row["delegations"] == 1
+    assert row["management_tokens_est"] == 20
+    assert round(summary["management_share_calls"], 2) == 0.67
+    assert (tmp_path / "management.json").exists()
+
+
+def test_ledgers_of_concurrent_runs_stay_separate():
+    """Test that a run's ledger ignores LLM calls made under another run."""
+    ledgers = {run: ManagementLedger(run_id=run).start() for run in ("run-a", "run-b")}
+
+    def kickoff(run_id, calls):
+        bind_run(run_id)
+        for _ in range(calls):
+            crewai_event_bus.emit(None, LLMCallStartedEvent(model="m", messages=[], agent_role="Researcher",
+                                                            task_name="research_task"))
+            crewai_event_bus.emit(None, LLMCallCompletedEvent(response="x", call_type=LLMCallType.LLM_CALL))
+
+    workers = [threading.Thread(target=contextvars.copy_context().run, args=(kickoff, run, calls))
+               for run, calls in (("run-a", 1), ("run-b", 3))]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert ledgers["run-a"].stop()["totals"]["work_calls"] == 1
+    assert ledgers["run-b"].stop()["totals"]["work_calls"] == 3
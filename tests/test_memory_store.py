@@ -0,0 +1,124 @@
+"""Test the bounded crew memory store."""
+
+import copy
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.memory_store import BoundedLTMStorage, BoundedMemoryStorage
+
+
+def embed(texts):
+    """Deterministic bag-of-words embedding."""
+    out = []
+    for text in texts:
+        vector = np.zeros(32)
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode()) % 32] += 1
+        out.append(vector.tolist())
+    return out
+
+
+def test_save_search_and_dedupe(tmp_path):
+    """Test similarity search, crewAI's result shape and repeated saves."""
+    store = BoundedMemoryStorage(str(tmp_path), embed)
+    store.save("Clark County foreclosure filings rose 12%", {"agent": "researcher"})
+    store.save("Washoe County median price is stable", {})
+    store.save("Clark County foreclosure filings rose 12%", {"agent": "analyst"})
+    assert store.stats()["live"] == 2
+
+    hits = store.search("Clark County foreclosure filings", limit=1, score_threshold=0.3)
+    assert hits[0]["content"].startswith("Clark") and hits[0]["metadata"] == {"agent": "analyst"}
+    assert store.search("completely unrelated words", score_threshold=0.9) == []
+
+    # a second handle (another process or a copied crew) sees the same data
+    assert BoundedMemoryStorage(str(tmp_path), embed).search("Washoe median", limit=1, score_threshold=0.3)
+    assert copy.deepcopy(store) is store
+
+
+def test_lru_and_ttl_eviction(tmp_path):
+    """Test that the least recently used and the expired entries go first."""
+    store = BoundedMemoryStorage(str(tmp_path), embed, max_items=2)
+    store.save("alpha fact", {})
+    store.save("beta fact", {})
+    store.search("alpha", limit=1, score_threshold=0.1)  # touch alpha
+    store.save("gamma fact", {})
+    contents = {h["content"] for h in store.search("fact", limit=5, score_threshold=0.0)}
+    assert contents == {"alpha fact", "gamma fact"}
+
+    expiring = BoundedMemoryStorage(str(tmp_path / "ttl"), embed, ttl_seconds=0.05)
+    expiring.save("old fact", {})
+    time.sleep(0.1)
+    assert expiring.search("old fact", score_threshold=0.0) == []
+
+
+def test_compaction_rewrites_vector_file(tmp_path):
+    """Test that compaction reclaims dead slots and keeps search results."""
+    store = BoundedMemoryStorage(str(tmp_path), embed, max_items=3)
+    for i in range(100):
+        store.save(f"county {i} filings", {})
+    assert store.stats()["dead"] == 97
+    assert store.compact()
+    stats = store.stats()
+    assert stats["slots"] == 3 and stats["dead"] == 0 and stats["vector_bytes"] == 3 * 32 * 4
+    assert store.search("county 99 filings", limit=1, score_threshold=0.5)[0]["content"] == "county 99 filings"
+    store.save("county 100 filings", {})
+    assert store.stats()["live"] == 3
+
+    store.reset()
+    assert store.search("county", score_threshold=0.0) == []
+
+
+def test_search_during_compaction(tmp_path):
+    """Test that a compaction started mid-search cannot renumber the rows being scored."""
+    store = BoundedMemoryStorage(str(tmp_path), embed, max_items=3)
+    for i in range(10):
+        store.save(f"county {i} filings", {})
+    vectors, compactor = store._vectors, []
+
+    def compact_mid_search(db, min_rows=0):
+        if not compactor:
+            compactor.append(threading.Thread(target=store.compact, kwargs={"force": True}))
+            compactor[0].start()
+            time.sleep(0.2)
+        return vectors(db, min_rows)
+
+    store._vectors = compact_mid_search
+    hits = store.search("county 9 filings", limit=1, score_threshold=0.9)
+    compactor[0].join()
+    assert [h["content"] for h in hits] == ["county 9 filings"]
+    assert store.stats()["slots"] == 3
+
+
+def test_long_term_storage_is_bounded(tmp_path):
+    """Test row-count pruning of the long-term memory table."""
+    ltm = BoundedLTMStorage(str(tmp_path / "ltm.sqlite"), max_rows=2)
+    for i in range(4):
+        ltm.save("research_task", {"quality": i}, str(time.time()), i)
+    assert [r["metadata"]["quality"] for r in ltm.load("research_task", 10)] == [3, 2]
+
+
+def test_embedder_probe_runs_once(monkeypatch):
+    """Test that the live embedder check is cached per model and URL."""
+    from gangshit import embedder_config
+    from gangshit.embedder_config import LocalEmbedderConfig
+
+    calls = []
+
+    class FakeEmbedder:
+        def embed_query(self, text):
+            calls.append(text)
+            return [1.0]
+
+    monkeypatch.setattr(embedder_config, "_probed", {})
+    monkeypatch.setattr(LocalEmbedderConfig, "get_embedder", lambda self: FakeEmbedder())
+    for _ in range(3):
+        assert LocalEmbedderConfig(model_name="probe-test").configure_crew_embedder() is not None
+    assert calls == ["test"]
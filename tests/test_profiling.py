@@ -0,0 +1,104 @@
+"""Test the Chrome trace profiler."""
+
+import contextvars
+import json
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crewai.events import (
+    CrewKickoffCompletedEvent,
+    CrewKickoffStartedEvent,
+    LLMCallCompletedEvent,
+    LLMCallStartedEvent,
+    LLMStreamChunkEvent,
+    ToolUsageFinishedEvent,
+    ToolUsageStartedEvent,
+    crewai_event_bus,
+)
+from crewai.events.types.llm_events import LLMCallType
+
+from gangshit.profiling import TraceProfiler, bind_run, profile_mode, start_profiler
+
+
+def _llm_call(model="llama3.2"):
+    crewai_event_bus.emit(None, LLMCallStartedEvent(model=model, messages=[]))
+    for chunk in ("a", "b"):
+        crewai_event_bus.emit(None, LLMStreamChunkEvent(chunk=chunk))
+    crewai_event_bus.emit(None, LLMCallCompletedEvent(response="ab", call_type=LLMCallType.LLM_CALL, model=model))
+
+
+def test_event_bus_spans_nest_and_write(tmp_path):
+    """Test crew, delegation and LLM spans recorded from bus events."""
+    profiler = TraceProfiler(str(tmp_path / "trace.json")).start()
+    crewai_event_bus.emit(None, CrewKickoffStartedEvent(crew_name="crew", inputs={}))
+    crewai_event_bus.emit(None, ToolUsageStartedEvent(tool_name="Delegate work to coworker", tool_args={}))
+    _llm_call()
+    now = datetime.now()
+    crewai_event_bus.emit(None, ToolUsageFinishedEvent(tool_name="Delegate work to coworker", tool_args={},
+                                                       started_at=now, finished_at=now, output="ok"))
+    crewai_event_bus.emit(None, CrewKickoffCompletedEvent(crew_name="crew", output="done", total_tokens=5))
+    path = profiler.stop()
+
+    trace = json.loads(path.read_text())
+    spans = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+    assert set(spans) == {"crew crew", "Delegate work to coworker", "llama3.2", "prefill", "generate"}
+    assert spans["Delegate work to coworker"]["cat"] == "delegation"
+    assert spans["llama3.2"]["args"]["chunks"] == 2 and spans["llama3.2"]["args"]["first_call"] is True
+    crew, llm = spans["crew crew"], spans["llama3.2"]
+    assert crew["ts"] <= llm["ts"] and llm["ts"] + llm["dur"] <= crew["ts"] + crew["dur"]
+    assert spans["prefill"]["dur"] + spans["generate"]["dur"] == llm["dur"]
+    assert trace["otherData"]["summary"]["llm"]["count"] == 1
+
+
+def test_threads_and_detach(tmp_path):
+    """Test per-thread spans and that a stopped profiler records nothing more."""
+    profiler = TraceProfiler(str(tmp_path / "trace.json")).start()
+    worker = threading.Thread(target=_llm_call, name="research-1")
+    worker.start()
+    worker.join()
+    _llm_call()
+    profiler.stop()
+    _llm_call()
+    llm = [e for e in profiler.events if e["cat"] == "llm" and e["name"] == "llama3.2"]
+    assert len(llm) == 2 and len({e["tid"] for e in llm}) == 2
+    names = [e["args"]["name"] for e in profiler.to_chrome()["traceEvents"] if e["ph"] == "M"]
+    assert "research-1" in names
+
+
+def test_profile_mode_and_cprofile(tmp_path, monkeypatch):
+    """Test env parsing and the cProfile sampler output."""
+    monkeypatch.delenv("GANGSHIT_PROFILE", raising=False)
+    assert profile_mode() == "" and start_profiler(str(tmp_path / "t.json")) is None
+    monkeypatch.setenv("GANGSHIT_PROFILE", "1")
+    assert profile_mode() == "trace"
+    profiler = start_profiler(str(tmp_path / "t.json"), mode="cprofile")
+    sum(range(1000))
+    profiler.stop()
+    assert (tmp_path / "t.pstats").exists() and (tmp_path / "t.json").exists()
+
+
+def test_concurrent_runs_get_separate_traces(tmp_path):
+    """Test that run-scoped profilers only record events emitted under their own run."""
+    first = start_profiler(str(tmp_path / "a.json"), mode="trace", run_id="run-a")
+    second = start_profiler(str(tmp_path / "b.json"), mode="trace", run_id="run-b")
+
+    def kickoff(run_id, model):
+        bind_run(run_id)
+        _llm_call(model)
+
+    workers = [threading.Thread(target=contextvars.copy_context().run, args=(kickoff, run, model))
+               for run, model in (("run-a", "llama3.2"), ("run-b", "gemma2"))]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    _llm_call("unbound")
+    first.stop()
+    second.stop()
+    assert {e["name"] for e in first.events if e["cat"] == "llm"} == {"llama3.2", "prefill", "generate"}
+    assert {e["name"] for e in second.events if e["cat"] == "llm"} == {"gemma2", "prefill", "generate"}
@@ -0,0 +1,97 @@
+"""Test the Parquet property query tool."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("pyarrow")
+
+from gangshit.parquet_store import query_page, write_partitioned
+from gangshit.tools import PropertyQueryTool
+
+RECORDS = [
+    {"property_id": f"p{i}", "state": "NV" if i % 2 else "AZ", "county": "Clark" if i % 2 else "Maricopa",
+     "zip": f"89{i:03d}", "foreclosure_stage": "auction" if i % 3 == 0 else "pre-foreclosure",
+     "equity_pct": float(i)}
+    for i in range(100)
+]
+
+
+def test_partitioned_layout(tmp_path):
+    """Test that records are written hive-partitioned by state and county."""
+    root = write_partitioned(RECORDS, root=str(tmp_path / "properties"))
+    assert (root / "state=NV" / "county=Clark").is_dir()
+    assert (root / "state=AZ" / "county=Maricopa").is_dir()
+
+
+def test_query_page_filters_and_paginates(tmp_path):
+    """Test filtering, projection and pagination."""
+    root = str(write_partitioned(RECORDS, root=str(tmp_path / "properties")))
+    filters = [("state", "=", "NV"), ("foreclosure_stage", "=", "auction"), ("equity_pct", ">", 40)]
+    expected = [r["property_id"] for r in RECORDS
+                if r["state"] == "NV" and r["foreclosure_stage"] == "auction" and r["equity_pct"] > 40]
+
+    first, more = query_page(filters, columns=["property_id"], page=1, page_size=5, root=root)
+    second, more_after = query_page(filters, columns=["property_id"], page=2, page_size=5, root=root)
+    assert more and not more_after
+    assert sorted(r["property_id"] for r in first + second) == sorted(expected)
+    assert set(first[0]) == {"property_id"}
+
+
+def test_tool_renders_markdown(tmp_path):
+    """Test the tool end to end, including invalid input."""
+    root = str(write_partitioned(RECORDS, root=str(tmp_path / "properties")))
+    tool = PropertyQueryTool(dataset_root=root)
+    output = tool._run(state="NV", county="Clark",
+                       filters=[{"column": "equity_pct", "op": ">=", "value": 97}],
+                       columns=["property_id", "equity_pct"])
+    assert output.startswith("| property_id | equity_pct |")
+    assert "| p97 | 97.0 |" in output and "last page" in output
+    assert tool._run(columns=["nope"]).startswith("Invalid query")
+
+
+def test_zero_padded_county_codes_stay_strings(tmp_path):
+    """Test that FIPS-style county partitions are read back as strings and filter correctly."""
+    records = [{"property_id": "a", "state": "NV", "county": "003", "equity_pct": 10.0},
+               {"property_id": "b", "state": "NV", "county": "031", "equity_pct": 20.0}]
+    root = str(write_partitioned(records, root=str(tmp_path / "properties")))
+    rows, _ = query_page([("county", "=", "003")], root=root)
+    assert [(r["property_id"], r["county"]) for r in rows] == [("a", "003")]
+    output = PropertyQueryTool(dataset_root=root)._run(state="NV", county="031", columns=["property_id"])
+    assert "| b |" in output
+
+
+def test_string_filter_values_are_cast_to_column_type(tmp_path):
+    """Test that "40" filters a numeric column and a non-numeric value gets a clear message."""
+    root = str(write_partitioned(RECORDS, root=str(tmp_path / "properties")))
+    tool = PropertyQueryTool(dataset_root=root)
+    output = tool._run(state="NV", filters=[{"column": "equity_pct", "op": ">=", "value": "97"}],
+                       columns=["property_id"])
+    assert "| p97 |" in output and "| p99 |" in output and "| p95 |" not in output
+    assert tool._run(filters=[{"column": "equity_pct", "op": ">", "value": "lots"}]).startswith(
+        "Invalid query: Filter value 'lots' does not match column 'equity_pct'")
+
+
+def test_ingest_writes_partitions_for_the_query_tool(tmp_path):
+    """Test that ingest rewrites the partitions it touched, dropping ones left empty."""
+    from gangshit.aggregates import ingest_file
+    from gangshit.history import PropertyHistory
+
+    history = PropertyHistory(root=str(tmp_path / "history"))
+    root = str(tmp_path / "properties")
+    listings = tmp_path / "listings.csv"
+
+    def ingest(rows):
+        listings.write_text("property_id,state,county,equity_pct\n" + "".join(f"{r}\n" for r in rows))
+        ingest_file(str(listings), history=history, aggregates_path=str(tmp_path / "agg.json"), parquet_root=root)
+
+    ingest(["p1,NV,003,10", "p2,NV,003,20", "p3,NV,031,30"])
+    ingest(["p3,NV,003,35"])  # p3 moves; county 031 is left empty, p1/p2 must survive the rewrite
+    tool = PropertyQueryTool(dataset_root=root)
+    output = tool._run(state="NV", county="003", columns=["property_id", "equity_pct"])
+    assert all(f"| {pid} |" in output for pid in ("p1", "p2", "p3")) and "| 35.0 |" in output
+    assert not (Path(root) / "state=NV" / "county=031").exists()
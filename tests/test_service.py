@@ -0,0 +1,84 @@
+"""Test the long-running crew service with stub crews."""
+
+import asyncio
+import json
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gangshit.service import CrewService
+
+
+class StubCrew:
+    """Stands in for a warm crew; kickoff blocks until released."""
+
+    def __init__(self, release):
+        self.release = release
+        self.task_callback = None
+
+    def kickoff(self, inputs):
+        self.release.wait(5)
+        if inputs.get("topic") == "boom":
+            raise RuntimeError("kickoff failed")
+        self.task_callback(SimpleNamespace(name="research_task"))
+        return f"report on {inputs['topic']}"
+
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), data
+
+
+def test_jobs_run_on_warm_crews_and_stream_events():
+    """Test submit, event streaming, results, failures and queue bounds."""
+    release = threading.Event()
+    built = []
+
+    def factory():
+        built.append(1)
+        return SimpleNamespace(gangshit_crew=lambda: StubCrew(release))
+
+    async def scenario():
+        service = CrewService(crew_factory=factory, workers=1, queue_size=1)
+        server = await service.serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        status, data = await _request(port, "POST", "/jobs", {"inputs": {"topic": "NV foreclosures"}})
+        assert status == 202
+        job_id = json.loads(data)["job_id"]
+        await asyncio.sleep(0.05)  # worker picks the first job up
+
+        assert (await _request(port, "POST", "/jobs", []))[0] == 400
+        assert (await _request(port, "POST", "/jobs", {"inputs": {"topic": "boom"}}))[0] == 202
+        assert (await _request(port, "POST", "/jobs", {"inputs": {"topic": "overflow"}}))[0] == 503
+
+        stream = asyncio.create_task(_request(port, "GET", f"/jobs/{job_id}/events"))
+        await asyncio.sleep(0.05)
+        release.set()
+        _, events = await stream
+        names = [json.loads(line)["event"] for line in events.splitlines()]
+        assert names == ["queued", "started", "task_completed", "completed"]
+
+        _, data = await _request(port, "GET", f"/jobs/{job_id}")
+        assert json.loads(data)["result"] == "report on NV foreclosures"
+
+        await service.queue.join()
+        failed = [j for j in service.jobs.values() if j.status == "failed"]
+        assert failed and "kickoff failed" in failed[0].error
+        assert (await _request(port, "GET", "/jobs/nope"))[0] == 404
+
+        server.close()
+        await service.stop()
+
+    asyncio.run(scenario())
+    assert built == [1]